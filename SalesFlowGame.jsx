@@ -1,6 +1,7 @@
 // SalesFlowGame.jsx
-import React, { useState, useEffect, useRef, useCallback } from 'react';
+import React, { useState, useEffect, useRef, useCallback, useSyncExternalStore } from 'react';
 import { Play, RotateCcw } from 'lucide-react';
+import { AudioEngine, RhythmTracker } from './salesflow/frontend/modules.mjs';
 
 /** ---------- Tunables for pacing & display ---------- **/
 const DESIGN_WIDTH = 1280;     // 16:9 reference canvas
@@ -23,29 +24,83 @@ const TECHNIQUES = {
   CLOSE:   { color: '#FF9800', beat: 1.0, energy: 'decisive', icon: '🎯' }
 };
 
+// `colors` is each rhythm in order; playing it in order before the close
+// multiplies the bonus by ORDER_BONUS.
 const PROSPECT_RHYTHMS = {
-  ANALYTICAL: { pattern: [0.3, 0.7, 1.0], colors: ['NO_SELL','LOGIC','CLOSE'], tempo: 120 },
-  EMOTIONAL:  { pattern: [0.5, 0.8, 1.0], colors: ['SOFT','EMOTION','CLOSE'],  tempo: 100 },
-  EXECUTIVE:  { pattern: [0.3, 0.7, 1.0], colors: ['NO_SELL','LOGIC','CLOSE'], tempo: 140 },
-  SKEPTICAL:  { pattern: [0.3, 0.1, 0.5, 1.0], colors: ['NO_SELL','WALK','SOFT','CLOSE'], tempo: 90 },
-  FRIENDLY:   { pattern: [0.5, 0.8, 1.0], colors: ['SOFT','EMOTION','CLOSE'], tempo: 110 },
-  AGGRESSIVE: { pattern: [1.2, 0.7, 1.0], colors: ['HARD','LOGIC','CLOSE'], tempo: 130 }
+  ANALYTICAL: { colors: ['NO_SELL','LOGIC','CLOSE'], tempo: 120 },
+  EMOTIONAL:  { colors: ['SOFT','EMOTION','CLOSE'],  tempo: 100 },
+  EXECUTIVE:  { colors: ['NO_SELL','LOGIC','CLOSE'], tempo: 140 },
+  SKEPTICAL:  { colors: ['NO_SELL','WALK','SOFT','CLOSE'], tempo: 90 },
+  FRIENDLY:   { colors: ['SOFT','EMOTION','CLOSE'], tempo: 110 },
+  AGGRESSIVE: { colors: ['HARD','LOGIC','CLOSE'], tempo: 130 }
+};
+const ORDER_BONUS = 2;
+
+// Integer ids for the rhythm machines in rhythm.js.
+const TECH_ID = Object.fromEntries(Object.keys(TECHNIQUES).map((k, i) => [k, i]));
+const PROSPECT_ID = Object.fromEntries(Object.keys(PROSPECT_RHYTHMS).map((k, i) => [k, i]));
+const RHYTHM_STEPS = Object.values(PROSPECT_RHYTHMS).map(r => r.colors.map(t => TECH_ID[t]));
+
+/** ---------- Throttled HUD store ---------- **/
+// The game loop writes the authoritative numbers into gameRefs every frame;
+// React only sees copies published through this store, at most `hz` times a
+// second, or right away for urgent changes (lives, level, restart).
+const createThrottledStore = (initial, hz = 10) => {
+  let snapshot = { ...initial };
+  let timer = null;
+  let lastEmit = 0;
+  const listeners = new Set();
+  const emit = () => {
+    timer = null;
+    lastEmit = performance.now();
+    listeners.forEach(l => l());
+  };
+  const changed = (next) => Object.keys(next).some(k => next[k] !== snapshot[k]);
+  return {
+    getSnapshot: () => snapshot,
+    subscribe: (l) => { listeners.add(l); return () => listeners.delete(l); },
+    publish: (next, urgent = false) => {
+      if (!changed(next)) return;
+      snapshot = { ...next };
+      if (urgent) { clearTimeout(timer); emit(); return; }
+      if (!timer) timer = setTimeout(emit, Math.max(0, 1000 / hz - (performance.now() - lastEmit)));
+    }
+  };
+};
+
+/** ---------- Render-count instrumentation ---------- **/
+// Counts renders of a component and, when window.__salesFlowDebug is set
+// before mount, reports renders/second once a second to
+// window.__salesFlowRenders[label] (and console.debug), to check re-render
+// rates. Without the flag no timer runs and nothing is logged.
+const useRenderCount = (label) => {
+  const count = useRef(0);
+  count.current += 1;
+  useEffect(() => {
+    if (typeof window === 'undefined' || !window.__salesFlowDebug) return undefined;
+    const rates = window.__salesFlowRenders || (window.__salesFlowRenders = {});
+    let last = count.current;
+    const t = setInterval(() => {
+      rates[label] = count.current - last;
+      last = count.current;
+      console.debug(`[${label}] ${rates[label]} renders/s`);
+    }, 1000);
+    return () => clearInterval(t);
+  }, [label]);
+  return count.current;
 };
 
+const INITIAL_STATS = { score: 0, multiplier: 1, combo: 0, level: 1, lives: 3, flowState: 0, gameSpeed: 0.9 };
+
 const SalesFlowGame = () => {
   const containerRef = useRef(null);
   const canvasRef = useRef(null);
-  const audioContextRef = useRef(null);
+  const audioRef = useRef(null);
   const animationRef = useRef(null);
 
+  useRenderCount('SalesFlowGame');
+
   const [gameState, setGameState] = useState('menu');
-  const [score, setScore] = useState(0);
-  const [multiplier, setMultiplier] = useState(1);
-  const [combo, setCombo] = useState(0);
-  const [level, setLevel] = useState(1);
-  const [lives, setLives] = useState(3);
-  const [gameSpeed, setGameSpeed] = useState(0.9); // start a bit slower
-  const [flowState, setFlowState] = useState(0);
   const [isMobile, setIsMobile] = useState(false);
   const [sessionTime, setSessionTime] = useState(0);
 
@@ -69,11 +124,19 @@ const SalesFlowGame = () => {
     keys: {},
     time: 0,
     beatTime: 0,
-    techniqueSequence: [],
+    techniqueSequence: null,   // RhythmTracker, made by generateLevel()
     backgroundPulse: 0,
-    screenFlash: 0
+    screenFlash: 0,
+    touch: { left: false, right: false, jump: false },
+    // Authoritative per-frame numbers; React reads throttled copies via hudStore.
+    stats: { ...INITIAL_STATS }
   });
 
+  const hudStore = useRef(null);
+  if (!hudStore.current) hudStore.current = createThrottledStore(INITIAL_STATS, 10);
+  const { score, multiplier, combo, level, lives, flowState } =
+    useSyncExternalStore(hudStore.current.subscribe, hudStore.current.getSnapshot);
+
   /** ---------- Utility ---------- **/
   const triggerHaptic = (type = 'light') => {
     if (!hapticFeedback || !navigator.vibrate) return;
@@ -85,27 +148,17 @@ const SalesFlowGame = () => {
     navigator.vibrate(patterns[type] ?? 10);
   };
 
+  // Cached tone buffers on a fixed voice pool (see audio.js); a combo streak
+  // reuses the same few nodes instead of building a graph per cue.
   const createTone = (frequency, duration = 0.08, type = 'sine') => {
-    if (!audioContextRef.current) {
-      try { audioContextRef.current = new (window.AudioContext || window.webkitAudioContext)(); }
-      catch { return; }
-    }
-    try {
-      const ctx = audioContextRef.current;
-      const osc = ctx.createOscillator();
-      const gain = ctx.createGain();
-      osc.connect(gain); gain.connect(ctx.destination);
-      osc.type = type; osc.frequency.value = frequency;
-      gain.gain.setValueAtTime(0.08, ctx.currentTime);
-      gain.gain.exponentialRampToValueAtTime(0.006, ctx.currentTime + duration);
-      osc.start(); osc.stop(ctx.currentTime + duration);
-    } catch {}
+    if (!audioRef.current) audioRef.current = new AudioEngine({ voices: 8 });
+    audioRef.current.play(frequency, duration, type);
   };
 
   /** ---------- Level generation (unchanged logic, friendlier counts) ---------- **/
   const generateLevel = useCallback(() => {
     const game = gameRefs.current;
-    const difficulty = level;
+    const difficulty = game.stats.level;
     game.obstacles = [];
     game.collectibles = [];
     game.prospects = [];
@@ -143,8 +196,10 @@ const SalesFlowGame = () => {
       });
     }
 
-    game.time = 0; game.beatTime = 0; game.techniqueSequence = [];
-  }, [level]);
+    game.time = 0; game.beatTime = 0;
+    if (!game.techniqueSequence) game.techniqueSequence = new RhythmTracker(RHYTHM_STEPS, TECH_ID.CLOSE);
+    game.techniqueSequence.reset();
+  }, []);
 
   /** ---------- 16:9 Scaler ---------- **/
   useEffect(() => {
@@ -190,6 +245,7 @@ const SalesFlowGame = () => {
   }, []);
 
   const setPad = (dir, val) => {
+    gameRefs.current.touch[dir] = val;
     setTouchControls(prev => ({ ...prev, [dir]: val }));
     setColorPulse(prev => ({ ...prev, [dir]: val ? 1 : 0 }));
     if (dir === 'jump' && val) triggerHaptic('light');
@@ -219,27 +275,28 @@ const SalesFlowGame = () => {
     if (!canvas) return;
     const ctx = canvas.getContext('2d');
     const g = gameRefs.current;
-    const { player, camera } = g;
+    const { player, camera, stats, touch } = g;
+    let urgent = false;
 
-    g.time += 0.016 * gameSpeed;
-    g.beatTime += 0.016 * gameSpeed * 2;
+    g.time += 0.016 * stats.gameSpeed;
+    g.beatTime += 0.016 * stats.gameSpeed * 2;
 
     // Manageable speed profile
-    const targetSpeed = BASE_SPEED * (1 + flowState * FLOW_SPEED_INFLUENCE);
+    const targetSpeed = BASE_SPEED * (1 + stats.flowState * FLOW_SPEED_INFLUENCE);
     const currentSpeed = Math.min(targetSpeed, BASE_SPEED * MAX_SPEED_MULT);
 
     // Clear background
-    const bg = Math.floor(18 + flowState * 0.4);
+    const bg = Math.floor(18 + stats.flowState * 0.4);
     ctx.fillStyle = `rgb(${bg},${bg},${Math.floor(bg * 1.1)})`;
     ctx.fillRect(0, 0, DESIGN_WIDTH, DESIGN_HEIGHT);
 
     // Movement (keyboard or pad)
-    if (g.keys['ArrowLeft'] || g.keys['a'] || touchControls.left) player.vx = -4;
-    else if (g.keys['ArrowRight'] || g.keys['d'] || touchControls.right) player.vx = 4;
+    if (g.keys['ArrowLeft'] || g.keys['a'] || touch.left) player.vx = -4;
+    else if (g.keys['ArrowRight'] || g.keys['d'] || touch.right) player.vx = 4;
     else player.vx *= 0.85;
 
     // Jump from pad
-    if (touchControls.jump && (player.grounded || player.vy > -5)) {
+    if (touch.jump && (player.grounded || player.vy > -5)) {
       const rhythmBonus = Math.sin(g.beatTime * 4) * 0.25 + 1;
       player.vy = JUMP_FORCE * rhythmBonus;
     }
@@ -272,7 +329,7 @@ const SalesFlowGame = () => {
     player.trail.forEach(p => {
       if (p.life > 0.1) {
         ctx.globalAlpha = p.life * 0.5;
-        ctx.fillStyle = `hsl(${180 + flowState * 2},70%,60%)`;
+        ctx.fillStyle = `hsl(${180 + stats.flowState * 2},70%,60%)`;
         const s = p.life * 7;
         ctx.fillRect(p.x - s/2, p.y - s/2, s, s);
       }
@@ -291,9 +348,10 @@ const SalesFlowGame = () => {
         player.y + player.height > ob.y - pulse &&
         player.y < ob.y + ob.height + pulse
       ) {
-        setLives(v => v - 1);
-        setFlowState(v => Math.max(0, v - 10));
-        setMultiplier(1); setCombo(0);
+        stats.lives -= 1;
+        stats.flowState = Math.max(0, stats.flowState - 10);
+        stats.multiplier = 1; stats.combo = 0;
+        urgent = true;
         camera.shake = 16; g.screenFlash = 0.4;
         puff(player.x, player.y, '#FF4444', 'explosion');
         createTone(220, 0.25, 'sawtooth'); triggerHaptic('error');
@@ -322,15 +380,15 @@ const SalesFlowGame = () => {
 
       if (dist < 28) {
         c.collected = true;
-        g.techniqueSequence.push(c.technique);
+        g.techniqueSequence.push(TECH_ID[c.technique]);
         const beatAcc = 1 - Math.abs((g.beatTime % 1) - 0.5) * 2;
-        const points = Math.floor(8 * multiplier * (1 + beatAcc));
-        setScore(v => v + points);
-        setCombo(v => v + 1);
-        setFlowState(v => Math.min(100, v + 1 + beatAcc * 2));
-        if (beatAcc > 0.8) setMultiplier(v => Math.min(8, v + 0.15));
+        const points = Math.floor(8 * stats.multiplier * (1 + beatAcc));
+        stats.score += points;
+        stats.combo += 1;
+        stats.flowState = Math.min(100, stats.flowState + 1 + beatAcc * 2);
+        if (beatAcc > 0.8) stats.multiplier = Math.min(8, stats.multiplier + 0.15);
         puff(c.x, c.y, TECHNIQUES[c.technique].color);
-        createTone(440 + combo * 18, 0.08);
+        createTone(440 + stats.combo * 18, 0.08);
       }
 
       if (!c.collected) {
@@ -350,17 +408,15 @@ const SalesFlowGame = () => {
       const dist = Math.abs(player.x - p.x);
       if (dist < 220 && !p.satisfied) {
         p.approaching = true;
-        if (dist < 60 && g.techniqueSequence.length > 0) {
-          const match = g.techniqueSequence.some(t => p.rhythm.colors.includes(t));
-          if (match && g.techniqueSequence.includes('CLOSE')) {
-            p.satisfied = true;
-            const bonus = 90 * multiplier * g.techniqueSequence.length;
-            setScore(v => v + bonus);
-            setFlowState(v => Math.min(100, v + 10));
-            setMultiplier(v => Math.min(8, v + 1));
-            g.screenFlash = 0.25; puff(p.x, p.y, '#44FF44', 'explosion');
-            createTone(660, 0.4); g.techniqueSequence = [];
-          }
+        if (dist < 60 && g.techniqueSequence.ready()) {
+          p.satisfied = true;
+          const order = g.techniqueSequence.inOrder(PROSPECT_ID[p.type]) ? ORDER_BONUS : 1;
+          const bonus = 90 * stats.multiplier * g.techniqueSequence.length * order;
+          stats.score += bonus;
+          stats.flowState = Math.min(100, stats.flowState + 10);
+          stats.multiplier = Math.min(8, stats.multiplier + 1);
+          g.screenFlash = 0.25; puff(p.x, p.y, '#44FF44', 'explosion');
+          createTone(660, 0.4); g.techniqueSequence.reset();
         }
       }
 
@@ -375,9 +431,9 @@ const SalesFlowGame = () => {
 
     // Player
     ctx.save(); ctx.translate(-camera.x + shakeX, shakeY);
-    const hue = 180 + flowState * 1.8;
-    ctx.fillStyle = `hsl(${hue},70%,${50 + flowState * 0.3}%)`;
-    ctx.shadowBlur = 8 + flowState * 0.2;
+    const hue = 180 + stats.flowState * 1.8;
+    ctx.fillStyle = `hsl(${hue},70%,${50 + stats.flowState * 0.3}%)`;
+    ctx.shadowBlur = 8 + stats.flowState * 0.2;
     ctx.shadowColor = `hsl(${hue},100%,50%)`;
     ctx.fillRect(player.x, player.y, player.width, player.height);
     ctx.restore(); ctx.shadowBlur = 0;
@@ -393,16 +449,19 @@ const SalesFlowGame = () => {
     });
     ctx.globalAlpha = 1;
 
-    // Gentle flow decay + clamp speed
-    setFlowState(v => Math.max(0, v - 0.08));
-    setGameSpeed(() => Math.min(MAX_SPEED_MULT, 1 + flowState * FLOW_SPEED_INFLUENCE));
+    // Gentle flow decay + clamp speed (speed uses the pre-decay flow, as before)
+    stats.gameSpeed = Math.min(MAX_SPEED_MULT, 1 + stats.flowState * FLOW_SPEED_INFLUENCE);
+    stats.flowState = Math.max(0, stats.flowState - 0.08);
 
     // Level progress (distance tuned for slower speed)
-    if (player.x > 1800 + level * 900) {
-      setLevel(v => v + 1);
+    if (player.x > 1800 + stats.level * 900) {
+      stats.level += 1;
       generateLevel();
+      urgent = true;
     }
-  }, [gameState, gameSpeed, flowState, multiplier, combo, level, touchControls, generateLevel]);
+
+    hudStore.current.publish(stats, urgent);
+  }, [gameState, generateLevel]);
 
   useEffect(() => {
     const loop = () => { updateGame(); animationRef.current = requestAnimationFrame(loop); };
@@ -413,8 +472,8 @@ const SalesFlowGame = () => {
   /** ---------- Controls ---------- **/
   const startGame = () => {
     setGameState('playing');
-    setScore(0); setMultiplier(1); setCombo(0); setLevel(1); setLives(3);
-    setFlowState(0); setGameSpeed(0.9);
+    Object.assign(gameRefs.current.stats, INITIAL_STATS);
+    hudStore.current.publish(gameRefs.current.stats, true);
     gameRefs.current.player = { x: 100, y: 300, vx: 0, vy: 0, width: PLAYER_SIZE, height: PLAYER_SIZE, grounded: false, trail: [] };
     generateLevel();
   };
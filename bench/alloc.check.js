@@ -0,0 +1,152 @@
+// Allocation check: steady-state frames of the real core.js must not allocate.
+// Minor GCs are what shows up as mid-run jank, and they only happen when the
+// frame loop leaves garbage behind.
+//
+//   node bench/alloc.check.js [--seed 7] [--windows 40] [--frames 120] [--quality N]
+//
+// Plays a seeded course through core.frame() against mock layer contexts
+// several times with the same scripted input: first until the JIT has
+// optimized every path, then once more measuring young-generation growth
+// over --windows runs of --frames frames each (the young generation is made
+// large enough that no GC runs inside a window). The same loop without core.frame() gives the
+// harness's own share, which is subtracted. Windows that end a run or hand
+// off a telemetry batch, both of which allocate by design, are not counted.
+// Runs at every quality level (0 = adaptive, then each fixed level) unless
+// --quality picks one. Prints one JSON line per level and exits 1 if any
+// counted window allocated, or if none could be counted.
+//
+// Timestamps are whole milliseconds and performance.now() is a counter, so
+// the numbers are the core's own: a platform clock may box its result.
+const { execFileSync, spawnSync } = require('child_process');
+const path = require('path');
+
+const FLAGS = ['--expose-gc', '--min-semi-space-size=64', '--max-semi-space-size=64'];
+if (typeof global.gc !== 'function') {
+  const r = spawnSync(process.execPath, [...FLAGS, __filename, ...process.argv.slice(2)], { stdio: 'inherit' });
+  process.exit(r.status === null ? 1 : r.status);
+}
+
+const { MockContext, MockCanvas } = require('./mock-context.js');
+globalThis.OffscreenCanvas = MockCanvas;
+let clock = 0;
+Object.defineProperty(globalThis, 'performance', { value: { now: () => clock }, configurable: true });
+const FRONTEND = path.join(__dirname, '..', 'salesflow', 'frontend');
+for (const f of ['particles.js', 'render.js', 'replay.js', 'telemetry.js', 'profiler.js', 'rhythm.js', 'quality.js']) {
+  require(path.join(FRONTEND, f));
+}
+const Core = require(path.join(FRONTEND, 'core.js'));
+
+const arg = (name, fallback) => {
+  const i = process.argv.indexOf(`--${name}`);
+  return i < 0 ? fallback : Number(process.argv[i + 1]);
+};
+const SEED = arg('seed', 7), WINDOWS = arg('windows', 40), FRAMES = arg('frames', 120);
+const QUALITIES = process.argv.includes('--quality')
+  ? [arg('quality', 0)]
+  : Array.from({ length: QualityManager.LEVELS.length + 1 }, (_, i) => i);
+// Passes before the measured one. Cold paths (a pickup burst, a level-up)
+// run in the interpreter, which boxes every double it computes, until the
+// JIT has seen them often enough to optimize them.
+const WARM_PASSES = 3;
+
+const CHUNK_W = 1024, PX_PER_FRAME = 8;
+const chunks = Math.ceil(WINDOWS * FRAMES * PX_PER_FRAME / CHUNK_W) + Core.CHUNK_RING;
+const course = new Uint8Array(execFileSync(process.env.PYTHON || 'python3',
+  ['-m', 'salesflow', 'course', '--seed', String(SEED), '--chunks', String(chunks), '-o', '-'],
+  { cwd: path.join(__dirname, '..'), maxBuffer: 64 << 20 }));
+
+// Run boundaries and telemetry batches, counted so windows with them are left out.
+const seen = { runs: 0, batches: 0 };
+const layers = { bg: new MockContext(), world: new MockContext(), fx: new MockContext() };
+const core = Core.createGame(layers, {
+  stateChange(s) { if (s !== 'playing') seen.runs++; },
+  telemetry() { seen.batches++; }
+});
+
+// 16, 17, 17 ms: 60 fps in whole milliseconds. Scripted input as in
+// core.bench.js, without its allocations: strafe right in bursts and jump
+// at whatever obstacle is just ahead.
+let now = 0, frameNo = 0;
+function input() {
+  const g = core.game, p = g.player;
+  let bits = (frameNo >> 6) % 3 === 1 ? Core.RIGHT : 0;
+  for (let j = 0; j < g.ring.length; j++) {
+    const sl = g.ring[j];
+    for (let i = 0; i < sl.nObs; i++) {
+      const ahead = sl.ox[i] - (p.x + p.w);
+      if (ahead > -20 && ahead < 120 && sl.oy[i] < p.y + 65) bits |= Core.JUMP;
+    }
+  }
+  return bits;
+}
+function play(n, drive) {
+  for (let i = 0; i < n; i++) {
+    frameNo++;
+    now += frameNo % 3 ? 17 : 16;
+    clock = now;
+    const bits = input();
+    if (!drive) continue;
+    core.setInput(bits);
+    core.frame(now);
+    if (core.state !== 'playing') core.start();
+  }
+}
+
+const v8 = require('v8');
+function young() {
+  let used = 0;
+  for (const s of v8.getHeapSpaceStatistics()) {
+    if (s.space_name === 'new_space' || s.space_name === 'new_large_object_space') used += s.space_used_size;
+  }
+  return used;
+}
+function window(drive) {
+  global.gc();
+  const before = young();
+  play(FRAMES, drive);
+  return young() - before;
+}
+
+// The harness's own cost per window (input(), the loop, young() itself).
+core.loadCourse(SEED, course);
+core.start();
+let harness = Infinity;
+for (let w = 0; w < 8; w++) harness = Math.min(harness, window(false));
+
+function pass() {
+  core.loadCourse(SEED, course);
+  core.start();
+  frameNo = 0;
+  const counted = [];
+  let skipped = 0;
+  for (let w = 0; w < WINDOWS; w++) {
+    const runs = seen.runs, batches = seen.batches;
+    const grown = window(true) - harness;
+    if (seen.runs !== runs || seen.batches !== batches) skipped++;
+    else counted.push(Math.max(0, grown));
+  }
+  return { counted, skipped };
+}
+
+// Warm up at full quality, where bursts are biggest: the lowest levels emit
+// a particle or two per burst, too little for the JIT to get to the emit
+// loop within a few passes. Each level then gets one pass of its own.
+core.applyConfig({ quality: 1 });
+for (let i = 0; i < WARM_PASSES; i++) pass();
+let failed = false;
+for (const quality of QUALITIES) {
+  core.applyConfig({ quality });
+  pass();
+  const { counted, skipped } = pass();
+  const worst = counted.length ? Math.max(...counted) : null;
+  const ok = counted.length > 0 && worst === 0;
+  failed = failed || !ok;
+  console.log(JSON.stringify({
+    seed: SEED, quality, frames_per_window: FRAMES, windows: counted.length, skipped,
+    harness_bytes_per_window: harness,
+    worst_bytes_per_frame: worst === null ? null : +(worst / FRAMES).toFixed(1),
+    mean_bytes_per_frame: counted.length ? +(counted.reduce((a, b) => a + b, 0) / counted.length / FRAMES).toFixed(1) : null,
+    ok
+  }));
+}
+process.exit(failed ? 1 : 0);
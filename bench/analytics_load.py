@@ -0,0 +1,80 @@
+"""Trainer analytics at scale: ingest synthetic telemetry through
+``Store.append`` in game-sized batches, then time every analytics query.
+
+    python bench/analytics_load.py [--events 1000000] [--trainees 40] [--days 90]
+
+Prints one JSON line with ingest throughput and the slowest query.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from salesflow import analytics, constants as C, telemetry  # noqa: E402
+
+BATCH = 256
+RUN_EVENTS = 400
+
+
+def run_rows(rng, run, seed):
+    # One run: start, pickups / hits / closes / level-ups along x, end.
+    n = RUN_EVENTS - 2
+    kind = rng.choice([telemetry.PICKUP, telemetry.HIT, telemetry.CLOSE, telemetry.LEVEL],
+                      size=n, p=[0.85, 0.05, 0.06, 0.04])
+    x = np.sort(rng.uniform(100, 20000, n))
+    a = np.where(kind == telemetry.PICKUP, rng.integers(0, len(C.TECHNIQUES), n),
+                 rng.integers(0, len(C.PROSPECT_TYPES), n))
+    b = np.where(kind == telemetry.PICKUP, rng.random(n), rng.uniform(0, 500, n))
+    body = np.column_stack([np.full(n, run), x / 6, kind, a, b, x])
+    start = [run, 0, telemetry.START, seed, 0, 100]
+    end = [run, x[-1] / 6, telemetry.END, rng.integers(1, 20), rng.uniform(0, 20000), x[-1]]
+    return np.vstack([start, body, end])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--trainees", type=int, default=40)
+    parser.add_argument("--days", type=int, default=90)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    t_end = time.time()
+    runs = args.events // RUN_EVENTS
+    with tempfile.TemporaryDirectory() as tmp:
+        store = telemetry.Store(Path(tmp) / "bench.sqlite")
+        t0 = time.perf_counter()
+        for run in range(runs):
+            trainee = f"trainee-{run % args.trainees:03d}"
+            received = t_end - 86400 * args.days * (1 - run / runs)
+            rows = run_rows(rng, run, int(rng.integers(0, 50)))
+            for i in range(0, len(rows), BATCH):
+                store.append(f"s{run // 20}", rows[i:i + BATCH], trainee, received)
+        ingest = time.perf_counter() - t0
+
+        names = analytics.trainees(store)
+        first, last = analytics.days(store)
+        filters = [((), first, last), (tuple(names[:3]), first, last), ((), last, last)]
+        slowest = 0.0
+        for who, start, end in filters:
+            for query in (analytics.score_trend, analytics.technique_mix,
+                          analytics.accuracy_histogram, analytics.close_rates):
+                t0 = time.perf_counter()
+                query(store, list(who), start, end)
+                slowest = max(slowest, time.perf_counter() - t0)
+    print(json.dumps({
+        "events": runs * RUN_EVENTS,
+        "ingest_events_per_sec": round(runs * RUN_EVENTS / ingest),
+        "slowest_query_ms": round(slowest * 1000, 1),
+    }))
+
+
+if __name__ == "__main__":
+    main()
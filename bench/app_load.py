@@ -0,0 +1,342 @@
+"""Per-rerun cost of ``App.py`` and how the server scales with concurrent sessions.
+
+    python bench/app_load.py [--sessions 10 50 200] [--interactions 10] [--out report.json]
+    python bench/app_load.py --compare before.json [--out after.json]
+
+Two parts, each skippable:
+
+``apptest``
+    Drives the app through Streamlit's ``AppTest`` (no server, no browser):
+    a first run, then slider, toggle, seed and trainee changes.  Reports
+    script time per rerun, the serialized size of the element tree each
+    rerun produces, and Python memory held per session (``tracemalloc``
+    over a sample of live sessions).  ``AppTest`` reruns the whole script,
+    fragment or not.
+
+``clients``
+    Starts ``streamlit run App.py`` (or uses ``--url``) and connects
+    ``--sessions`` websocket clients at once, each speaking the browser's
+    protocol: an initial run, then ``--interactions`` slider moves sent as
+    fragment reruns, ``--think`` seconds apart.  Reports rerun latency
+    percentiles, bytes on the wire per rerun and server RSS per session.
+
+The report is one JSON document; ``--compare`` prints every metric next to
+the same metric of an earlier report.
+"""
+
+import argparse
+import asyncio
+import atexit
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / "App.py"
+# Keep sessions' replays, telemetry, leaderboard and par cache out of the
+# working tree.
+SCRATCH = tempfile.mkdtemp(prefix="app_load-")
+atexit.register(shutil.rmtree, SCRATCH, ignore_errors=True)
+os.environ.setdefault("SALESFLOW_REPLAYS", str(Path(SCRATCH) / "replays"))
+os.environ.setdefault("SALESFLOW_TELEMETRY", str(Path(SCRATCH) / "telemetry.sqlite"))
+os.environ.setdefault("SALESFLOW_LEADERBOARD", str(Path(SCRATCH) / "leaderboard.sqlite"))
+os.environ.setdefault("SALESFLOW_CACHE", str(Path(SCRATCH) / "cache"))
+sys.path.insert(0, str(ROOT))
+
+
+def _stats(values, scale=1.0, digits=1):
+    if not len(values):
+        return None
+    v = np.asarray(values, dtype=float) * scale
+    return {"mean": round(float(v.mean()), digits),
+            **{f"p{q}": round(float(np.percentile(v, q)), digits) for q in (50, 95, 99)}}
+
+
+# -- AppTest --------------------------------------------------------------
+
+def _tree_bytes(node):
+    proto = getattr(node, "proto", None)
+    size = proto.ByteSize() if proto is not None else 0
+    return size + sum(_tree_bytes(c) for c in getattr(node, "children", {}).values())
+
+
+def _interactions(at, i):
+    # One widget change per rerun, cycling through what a trainee touches.
+    step = i % 4
+    if step == 0:
+        at.slider[0].set_value(3.0 + 0.1 * (i % 10))
+    elif step == 1:
+        at.toggle[-1].set_value(not at.toggle[-1].value)
+    elif step == 2:
+        at.number_input[0].set_value(1 + i)
+    else:
+        at.text_input[0].input(f"trainee-{i}")
+    return at
+
+
+def bench_apptest(sessions, interactions, memory_sample):
+    from streamlit.testing.v1 import AppTest
+
+    first, rerun, tree = [], [], []
+    for _ in range(sessions):
+        at = AppTest.from_file(str(APP), default_timeout=60)
+        t0 = time.perf_counter()
+        at.run()
+        first.append(time.perf_counter() - t0)
+        if at.exception:
+            raise RuntimeError(f"App.py raised: {at.exception[0].message}")
+        tree.append(_tree_bytes(at._tree))
+        for i in range(interactions):
+            _interactions(at, i)
+            t0 = time.perf_counter()
+            at.run()
+            rerun.append(time.perf_counter() - t0)
+            tree.append(_tree_bytes(at._tree))
+
+    # Memory still held by live sessions after their first run.
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    live = [AppTest.from_file(str(APP), default_timeout=60) for _ in range(memory_sample)]
+    for at in live:
+        at.run()
+    held = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return {
+        "sessions": sessions,
+        "first_run_ms": _stats(first, 1e3),
+        "rerun_ms": _stats(rerun, 1e3),
+        "tree_kb": _stats(tree, 1 / 1024),
+        "memory_per_session_kb": round(held / max(1, len(live)) / 1024, 1),
+    }
+
+
+# -- websocket clients ----------------------------------------------------
+
+class Client:
+    """One browser-like session on ``/_stcore/stream``."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.page_hash = ""
+        self.slider = None          # (widget id, fragment id) of the first slider
+
+    async def rerun(self, states=(), fragment_id=""):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = self.page_hash
+        msg.rerun_script.fragment_id = fragment_id
+        for widget_id, value in states:
+            state = msg.rerun_script.widget_states.widgets.add(id=widget_id)
+            state.double_array_value.data[:] = [value]
+        t0 = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        received = 0
+        while True:
+            data = await self.ws.read_message()
+            if data is None:
+                raise ConnectionError("server closed the session")
+            received += len(data)
+            fwd = ForwardMsg()
+            fwd.ParseFromString(data)
+            kind = fwd.WhichOneof("type")
+            if kind == "new_session":
+                self.page_hash = fwd.new_session.page_script_hash
+            elif kind == "delta" and self.slider is None:
+                el = fwd.delta.new_element
+                if el.WhichOneof("type") == "slider":
+                    self.slider = (el.slider.id, fwd.delta.fragment_id)
+            elif kind == "script_finished":
+                return time.perf_counter() - t0, received
+
+
+async def _session(url, interactions, think, out):
+    from tornado.websocket import websocket_connect
+
+    ws = await websocket_connect(url, subprotocols=["streamlit"], max_message_size=64 << 20)
+    client = Client(ws)
+    try:
+        out["first"].append(await client.rerun())
+        if client.slider is None:
+            raise RuntimeError("no slider in the app's first run")
+        for i in range(interactions):
+            await asyncio.sleep(think)
+            widget_id, fragment_id = client.slider
+            out["rerun"].append(await client.rerun([(widget_id, 3.0 + 0.1 * (i % 10))],
+                                                    fragment_id))
+    finally:
+        ws.close()
+
+
+def _rss_kb(pid):
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+async def _load(url, n, interactions, think, pid):
+    await _session(url, 0, 0, {"first": [], "rerun": []})     # warm the server
+    rss0 = peak = _rss_kb(pid)
+    out = {"first": [], "rerun": []}
+    t0 = time.perf_counter()
+    load = asyncio.gather(*(_session(url, interactions, think, out) for _ in range(n)),
+                          return_exceptions=True)
+    while rss0 is not None and not load.done():
+        peak = max(peak, _rss_kb(pid) or 0)
+        await asyncio.wait([load], timeout=0.1)
+    results = await load
+    wall = time.perf_counter() - t0
+    errors = [r for r in results if isinstance(r, BaseException)]
+    first_s, first_b = zip(*out["first"]) if out["first"] else ((), ())
+    rerun_s, rerun_b = zip(*out["rerun"]) if out["rerun"] else ((), ())
+    return {
+        "sessions": n,
+        "errors": len(errors),
+        "first_run_ms": _stats(first_s, 1e3),
+        "rerun_ms": _stats(rerun_s, 1e3),
+        "first_run_kb": _stats(first_b, 1 / 1024),
+        "rerun_kb": _stats(rerun_b, 1 / 1024),
+        "reruns_per_sec": round((len(first_s) + len(rerun_s)) / wall, 1),
+        # Peak server RSS while the sessions were connected, over the idle server.
+        "server_rss_per_session_kb": round((peak - rss0) / n, 1) if rss0 is not None else None,
+    }
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(port):
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", str(APP), "--server.headless=true",
+         f"--server.port={port}", "--server.address=127.0.0.1", "--server.enableCORS=false",
+         "--server.enableXsrfProtection=false", "--server.fileWatcherType=none",
+         "--browser.gatherUsageStats=false"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("streamlit exited during startup")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return proc
+        except OSError:
+            time.sleep(0.25)
+    proc.kill()
+    raise RuntimeError("streamlit did not come up within 60 s")
+
+
+def _stop_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def bench_clients(levels, interactions, think, url, pid=None):
+    return [asyncio.run(_load(url, n, interactions, think, pid)) for n in levels]
+
+
+# -- report ---------------------------------------------------------------
+
+def _flatten(obj, prefix=""):
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            yield from _flatten(v, f"{prefix}.{k}" if prefix else k)
+    elif isinstance(obj, list):
+        for item in obj:
+            key = f"{prefix}[{item.get('sessions')}]" if isinstance(item, dict) else prefix
+            yield from _flatten(item, key)
+    elif isinstance(obj, (int, float)) and not isinstance(obj, bool):
+        yield prefix, obj
+
+
+def compare(before, after):
+    old = dict(_flatten({k: before.get(k) for k in ("apptest", "clients")}))
+    for key, new in _flatten({k: after.get(k) for k in ("apptest", "clients")}):
+        was = old.get(key)
+        change = f"{(new - was) / was:+.1%}" if was else ""
+        print(f"{key:<45} {'' if was is None else was:>12} {new:>12} {change:>9}")
+
+
+def _git_rev():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                       text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[10, 50, 200],
+                        help="concurrent client sessions, one load level each")
+    parser.add_argument("--interactions", type=int, default=10, help="reruns per session")
+    parser.add_argument("--think", type=float, default=0.5, help="seconds between a client's reruns")
+    parser.add_argument("--apptest-sessions", type=int, default=20)
+    parser.add_argument("--memory-sample", type=int, default=20,
+                        help="live AppTest sessions to measure memory over")
+    parser.add_argument("--url", help="websocket of a running app (default: start one)")
+    parser.add_argument("--skip-apptest", action="store_true")
+    parser.add_argument("--skip-clients", action="store_true")
+    parser.add_argument("-o", "--out", help="write the report here as well as to stdout")
+    parser.add_argument("--compare", help="an earlier report to print this one against")
+    args = parser.parse_args()
+
+    import streamlit
+
+    report = {
+        "git": _git_rev(),
+        "streamlit": streamlit.__version__,
+        "python": platform.python_version(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    if not args.skip_apptest:
+        report["apptest"] = bench_apptest(args.apptest_sessions, args.interactions,
+                                          args.memory_sample)
+    server = None
+    try:
+        if not args.skip_clients:
+            url = args.url
+            if url is None:
+                port = _free_port()
+                server = _start_server(port)
+                url = f"ws://127.0.0.1:{port}/_stcore/stream"
+            report["clients"] = bench_clients(args.sessions, args.interactions, args.think, url,
+                                              server.pid if server else None)
+
+        # The report is out before the server goes down, whatever that takes.
+        text = json.dumps(report, indent=2)
+        print(text)
+        if args.out:
+            Path(args.out).write_text(text + "\n")
+    finally:
+        if server:
+            _stop_server(server)
+    if args.compare:
+        compare(json.loads(Path(args.compare).read_text()), report)
+
+
+if __name__ == "__main__":
+    main()
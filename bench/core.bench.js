@@ -0,0 +1,136 @@
+// Whole-game benchmark: the real core.js (update + render) run headless
+// against mock 2D contexts for the three stage layers, over a seeded course
+// from levels 1 to LEVELS.
+//
+//   node --expose-gc bench/core.bench.js [--seed 7] [--levels 20] [--passes 5] [--quality 1]
+//
+// The course comes from `python -m salesflow course` ($PYTHON, default
+// python3). A scripted player strafes at random and jumps at the obstacle
+// ahead; when it runs out of lives the run restarts where it died, so every
+// pass covers every level. Prints one JSON line per level and a final
+// "total" line. Each frame is one update() and one render(); sim and render
+// time are reported separately; frames, heap_growth_kb, gc_events and
+// restarts are per pass, after one warmup pass. --quality N draws every
+// frame at that render quality level (1 = full ... 5 = lowest). Draw calls
+// and state changes are summed over the layers.
+const { execFileSync } = require('child_process');
+const path = require('path');
+const { PerformanceObserver } = require('perf_hooks');
+const { MockContext, MockCanvas } = require('./mock-context.js');
+
+globalThis.OffscreenCanvas = MockCanvas;
+const FRONTEND = path.join(__dirname, '..', 'salesflow', 'frontend');
+for (const f of ['particles.js', 'render.js', 'replay.js', 'telemetry.js', 'profiler.js', 'rhythm.js', 'quality.js']) {
+  require(path.join(FRONTEND, f));
+}
+const Core = require(path.join(FRONTEND, 'core.js'));
+
+const arg = (name, fallback) => {
+  const i = process.argv.indexOf(`--${name}`);
+  return i < 0 ? fallback : Number(process.argv[i + 1]);
+};
+const SEED = arg('seed', 7), LEVELS = arg('levels', 20), PASSES = arg('passes', 5);
+const QUALITY = arg('quality', 1);
+const levelEnd = (l) => 1800 + l * 900;           // core.js: level l ends past this x
+const levelOf = (x) => Math.max(1, Math.ceil((x - 1800) / 900));
+
+const CHUNK_W = 1024;
+const chunks = Math.ceil(levelEnd(LEVELS) / CHUNK_W) + Core.CHUNK_RING;
+const course = execFileSync(process.env.PYTHON || 'python3',
+  ['-m', 'salesflow', 'course', '--seed', String(SEED), '--chunks', String(chunks), '-o', '-'],
+  { cwd: path.join(__dirname, '..'), maxBuffer: 64 << 20 });
+
+let gcEvents = 0;
+new PerformanceObserver((list) => { gcEvents += list.getEntries().length; }).observe({ entryTypes: ['gc'] });
+const flush = () => new Promise((resolve) => setImmediate(resolve));
+
+const layers = { bg: new MockContext(), world: new MockContext(), fx: new MockContext() };
+const core = Core.createGame(layers, {});
+core.applyConfig({ quality: QUALITY });
+
+// Deterministic scripted input: an LCG picks the strafe, jumps clear whatever
+// obstacle is just ahead.
+let rng = 12345;
+const rnd = () => { rng = (rng * 1103515245 + 12345) % 2147483648; return rng / 2147483648; };
+let strafe = 0;
+function input() {
+  if (rnd() < .02) strafe = [0, Core.LEFT, Core.RIGHT][Math.floor(rnd() * 3)];
+  const p = core.game.player;
+  for (const sl of core.game.ring) {
+    for (let i = 0; i < sl.nObs; i++) {
+      const ahead = sl.ox[i] - (p.x + p.w);
+      if (ahead > -20 && ahead < 120 && sl.oy[i] < p.y + 65) return strafe | Core.JUMP;
+    }
+  }
+  return strafe;
+}
+
+// Start a run at x (the ring refills on the first update past it).
+function startAt(x) {
+  core.start();
+  const g = core.game;
+  g.player.x = g.prev.x = x;
+  g.camera.x = g.prev.camX = x - Core.DESIGN_WIDTH * .3;
+}
+
+const blank = (level) => ({ level, frames: 0, sim_ns: 0, render_ns: 0, draws: 0,
+                           state_changes: 0, restarts: 0, heap_growth: 0, gc_events: 0 });
+let stats;
+
+function step() {
+  core.setInput(input());
+  let t = process.hrtime.bigint();
+  core.update();
+  const sim = process.hrtime.bigint() - t;
+  if (core.state !== 'playing') return [sim, 0n];
+  t = process.hrtime.bigint();
+  core.render(1);
+  return [sim, process.hrtime.bigint() - t];
+}
+
+async function pass() {
+  rng = 12345; strafe = 0;
+  core.loadCourse(SEED, new Uint8Array(course));  // the core drops passed chunks
+  startAt(100);
+  for (let l = 1; l <= LEVELS; l++) {
+    const s = stats[l - 1];
+    if (global.gc) global.gc();
+    await flush();
+    const gc0 = gcEvents, heap0 = process.memoryUsage().heapUsed;
+    while (levelOf(core.game.player.x) === l) {
+      for (const k in layers) layers[k].reset();
+      const [sim, render] = step();
+      if (core.state !== 'playing') { s.restarts++; startAt(core.game.player.x); continue; }
+      s.frames++; s.sim_ns += Number(sim); s.render_ns += Number(render);
+      for (const k in layers) { s.draws += layers[k].draws; s.state_changes += layers[k].stateChanges; }
+    }
+    s.heap_growth += process.memoryUsage().heapUsed - heap0;
+    await flush();
+    s.gc_events += gcEvents - gc0;
+  }
+}
+
+const report = (s) => ({
+  level: s.level,
+  frames: Math.round(s.frames / PASSES),
+  sim_us_per_tick: +(s.sim_ns / s.frames / 1e3).toFixed(2),
+  render_us_per_frame: +(s.render_ns / s.frames / 1e3).toFixed(2),
+  draw_calls_per_frame: +(s.draws / s.frames).toFixed(1),
+  state_changes_per_frame: +(s.state_changes / s.frames).toFixed(1),
+  heap_growth_kb: Math.round(s.heap_growth / PASSES / 1024),
+  gc_events: +(s.gc_events / PASSES).toFixed(1),
+  restarts: +(s.restarts / PASSES).toFixed(1)
+});
+
+(async () => {
+  stats = Array.from({ length: LEVELS }, (_, i) => blank(i + 1));
+  await pass();                                   // warmup: JIT and sprite caches
+  stats = Array.from({ length: LEVELS }, (_, i) => blank(i + 1));
+  for (let i = 0; i < PASSES; i++) await pass();
+  const total = blank('total');
+  for (const s of stats) {
+    console.log(JSON.stringify(report(s)));
+    for (const k in total) if (k !== 'level') total[k] += s[k];
+  }
+  console.log(JSON.stringify({ seed: SEED, passes: PASSES, quality: QUALITY, ...report(total) }));
+})();
@@ -0,0 +1,76 @@
+"""A classroom finishing at once: many threads record a run and read their
+cohort's top K at the same moment, as Streamlit session threads would.
+
+    python bench/leaderboard_load.py [--sessions 200] [--runs 5] [--cohorts 4]
+
+Prints one JSON line: submit and top-K latency percentiles and how long the
+writer took to commit everything.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from salesflow import constants as C, leaderboard  # noqa: E402
+
+CONFIG = {name: default for name, (_lo, _hi, default, _step) in C.SLIDERS.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=5, help="runs finished per session")
+    parser.add_argument("--cohorts", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = leaderboard.Store(Path(tmp) / "bench.sqlite", ttl=1.0)
+        submit, top = [], []
+        barrier = threading.Barrier(args.sessions)
+
+        def session(i):
+            rng = np.random.default_rng(i)
+            barrier.wait()
+            for r in range(args.runs):
+                summary = {"score": float(rng.uniform(0, 20000)), "level": int(rng.integers(1, 20)),
+                           "combo": int(rng.integers(0, 80)), "seed": i % args.cohorts,
+                           "config": CONFIG}
+                t0 = time.perf_counter()
+                store.submit(f"{i:04d}-{r}", summary, f"trainee-{i:03d}")
+                t1 = time.perf_counter()
+                store.top(i % args.cohorts)
+                t2 = time.perf_counter()
+                submit.append(t1 - t0)
+                top.append(t2 - t1)
+
+        threads = [threading.Thread(target=session, args=(i,)) for i in range(args.sessions)]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        store.flush()
+        committed = time.perf_counter() - t0
+        rows, = store.conn.execute("SELECT count(*) FROM runs").fetchone()
+        store.close()
+
+    ms = lambda v, q: round(float(np.percentile(v, q)) * 1e3, 3)  # noqa: E731
+    print(json.dumps({
+        "sessions": args.sessions,
+        "runs": rows,
+        "submit_ms_p50": ms(submit, 50), "submit_ms_p99": ms(submit, 99),
+        "top_ms_p50": ms(top, 50), "top_ms_p99": ms(top, 99),
+        "all_committed_s": round(committed, 3),
+    }))
+
+
+if __name__ == "__main__":
+    main()
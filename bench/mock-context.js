@@ -0,0 +1,40 @@
+// Stand-in for CanvasRenderingContext2D that records how it is used instead
+// of drawing, so render paths can be timed under Node.
+class MockContext {
+  constructor() {
+    this.calls = 0;
+    this.draws = 0;
+    this.stateChanges = 0;
+    this._fillStyle = '#000';
+  }
+
+  get fillStyle() { return this._fillStyle; }
+  set fillStyle(v) { this._fillStyle = v; this.stateChanges++; }
+  // Numbers are counted, not stored: keeping a double on the mock would box
+  // it and show up as allocation charged to the code under test.
+  get globalAlpha() { return 1; }
+  set globalAlpha(v) { this.stateChanges++; }
+  set shadowBlur(v) { this.stateChanges++; }
+  set shadowColor(v) { this.stateChanges++; }
+
+  save() { this.calls++; }
+  restore() { this.calls++; }
+  translate() { this.calls++; this.stateChanges++; }
+  beginPath() { this.calls++; }
+  arc() { this.calls++; }
+  fill() { this.calls++; this.draws++; }
+  fillRect() { this.calls++; this.draws++; }
+  clearRect() { this.calls++; this.draws++; }
+  setTransform() { this.calls++; this.stateChanges++; }
+  drawImage() { this.calls++; this.draws++; }
+
+  reset() { this.calls = this.draws = this.stateChanges = 0; }
+}
+
+// Stand-in for OffscreenCanvas, enough for render.js to build its sprites.
+class MockCanvas {
+  constructor(width, height) { this.width = width; this.height = height; }
+  getContext() { return new MockContext(); }
+}
+
+module.exports = { MockContext, MockCanvas };
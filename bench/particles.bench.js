@@ -0,0 +1,89 @@
+// Particle system micro-benchmark: the old object-literal + splice() loop
+// against ParticlePool, at a steady population of 1k and 10k particles.
+//
+//   node --expose-gc bench/particles.bench.js
+//
+// Prints one JSON line per (implementation, population). heap_growth_kb and
+// gc_events include doubles boxed when passed to the context methods, which
+// both implementations pay.
+const { PerformanceObserver } = require('perf_hooks');
+const { ParticlePool } = require('../salesflow/frontend/particles.js');
+const { MockContext } = require('./mock-context.js');
+
+const LIFETIME = 50;   // frames: life starts at 1 and drops .02 per frame
+const WARMUP = 200;
+const FRAMES = 2000;
+const COLORS = ['#FF4444', '#44FF44', '#4CAF50', '#03A9F4', '#F44336', '#FF9800'];
+
+// The loop as it was in game.js before the pool.
+class LegacyParticles {
+  constructor() { this.list = []; }
+  emit(x, y, color, n) {
+    for (let i = 0; i < n; i++) {
+      this.list.push({
+        x: x + (Math.random() - .5) * 20, y: y + (Math.random() - .5) * 20,
+        vx: (Math.random() - .5) * 6, vy: (Math.random() - .5) * 6 - 2,
+        life: 1, color, size: Math.random() * 3 + 2
+      });
+    }
+  }
+  frame(ctx, ox, oy) {
+    const ps = this.list;
+    for (let i = ps.length - 1; i >= 0; i--) {
+      const p = ps[i];
+      p.x += p.vx; p.y += p.vy; p.vy += .18; p.life -= .02;
+      if (p.life <= 0) { ps.splice(i, 1); continue; }
+      ctx.save(); ctx.translate(ox, oy);
+      ctx.globalAlpha = p.life; ctx.fillStyle = p.color;
+      ctx.beginPath(); ctx.arc(p.x, p.y, p.size, 0, Math.PI * 2); ctx.fill();
+      ctx.restore();
+    }
+  }
+}
+
+class PooledParticles {
+  constructor(capacity) { this.pool = new ParticlePool(capacity); }
+  emit(x, y, color, n) { this.pool.emit(x, y, color, n); }
+  frame(ctx, ox, oy) { this.pool.update(); this.pool.draw(ctx, ox, oy); }
+}
+
+let gcEvents = 0;
+new PerformanceObserver((list) => { gcEvents += list.getEntries().length; }).observe({ entryTypes: ['gc'] });
+const flush = () => new Promise((resolve) => setImmediate(resolve));
+
+async function run(name, make, population) {
+  const sys = make(population);
+  const ctx = new MockContext();
+  const perFrame = Math.ceil(population / LIFETIME);
+  const step = (f) => {
+    sys.emit(640, 360, COLORS[f % COLORS.length], perFrame);
+    sys.frame(ctx, -100, 0);
+  };
+  for (let f = 0; f < WARMUP; f++) step(f);
+  if (global.gc) global.gc();
+  await flush();
+  ctx.reset();
+  const gc0 = gcEvents;
+  const heap0 = process.memoryUsage().heapUsed;
+  const t0 = process.hrtime.bigint();
+  for (let f = 0; f < FRAMES; f++) step(f);
+  const ns = Number(process.hrtime.bigint() - t0);
+  const heap1 = process.memoryUsage().heapUsed;
+  await flush();
+  return {
+    impl: name,
+    population,
+    us_per_frame: +(ns / FRAMES / 1e3).toFixed(2),
+    ctx_calls_per_frame: +(ctx.calls / FRAMES).toFixed(1),
+    state_changes_per_frame: +(ctx.stateChanges / FRAMES).toFixed(1),
+    heap_growth_kb: Math.round((heap1 - heap0) / 1024),
+    gc_events: gcEvents - gc0
+  };
+}
+
+(async () => {
+  for (const population of [1000, 10000]) {
+    console.log(JSON.stringify(await run('legacy', () => new LegacyParticles(), population)));
+    console.log(JSON.stringify(await run('pool', (n) => new PooledParticles(n + LIFETIME), population)));
+  }
+})();
@@ -0,0 +1,74 @@
+"""Replay verification throughput, as in the nightly audit.
+
+Synthesizes recorded runs with the headless engine (random-input players on
+their own courses), writes them as .sfr files, then times
+``replay.verify_files`` over them.
+
+    python bench/replay_verify.py [-n 2000] [--workers N] [--batch 256]
+
+Prints one JSON line; every synthesized replay must verify.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from salesflow import replay  # noqa: E402
+from salesflow.engine import Simulation, Tuning, random_policy  # noqa: E402
+
+
+def synthesize(n, frames, seed=0):
+    rng = np.random.default_rng(seed)
+    tuning = Tuning()
+    sim = Simulation(tuning, n, course=rng.integers(0, 2**31, n))
+    policy = random_policy(jump_rate=0.06)
+    inputs = np.zeros((n, frames), dtype=np.uint8)
+    for t in range(frames):
+        if not sim.alive.any():
+            break
+        inputs[:, t] = policy(sim, rng)
+        sim.step(inputs[:, t])
+    return [
+        replay.Replay(int(sim.course[i]), float(sim.score[i]), int(sim.level[i]),
+                      inputs[i, :sim.frames[i]], [(0, tuning)])
+        for i in np.flatnonzero(~sim.alive)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=1000, help="runs to synthesize; finished ones are kept")
+    parser.add_argument("--frames", type=int, default=60 * 120)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch", type=int, default=replay.BATCH)
+    args = parser.parse_args()
+
+    replays = synthesize(args.n, args.frames)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [str(replay.store(r.to_bytes(), tmp)) for r in replays]
+        size = sum(Path(p).stat().st_size for p in paths)
+        t0 = time.perf_counter()
+        verdicts = replay.verify_files(paths, workers=args.workers, batch=args.batch)
+        elapsed = time.perf_counter() - t0
+    ticks = sum(r.ticks for r in replays)
+    failed = sum(not v.ok for v in verdicts)
+    print(json.dumps({
+        "replays": len(replays),
+        "ticks": ticks,
+        "bytes_per_minute": round(size / (ticks / 3600), 1),
+        "seconds": round(elapsed, 2),
+        "replays_per_sec": round(len(replays) / elapsed, 1),
+        "failed": failed,
+    }))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
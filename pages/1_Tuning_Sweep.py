@@ -0,0 +1,79 @@
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from salesflow import sweep
+
+st.set_page_config(page_title="Training — Tuning Sweep", layout="wide")
+
+st.title("Tuning Sweep")
+st.caption(
+    "Headless runs over the five game sliders. Sweeps are cached on disk, "
+    "so re-opening the same grid is instant."
+)
+
+c1, c2, c3, c4 = st.columns(4)
+mode = c1.radio("Points", ["Grid", "Random sample"], horizontal=True)
+if mode == "Grid":
+    steps = c2.slider("Values per slider", 2, 6, 3)
+    n_points = steps ** len(sweep.PARAMS)
+else:
+    n_points = c2.slider("Sample size", 16, 2048, 256, 16)
+runs = c3.slider("Runs per point", 50, 500, 200, 50)
+seconds = c4.slider("Seconds per run", 30, 300, 120, 30)
+policy = st.selectbox("Simulated player", ["reactive", "random", "idle"])
+st.caption(f"{n_points} points × {runs} runs = {n_points * runs:,} simulated games")
+
+
+@st.cache_data(show_spinner="Simulating…")
+def load_sweep(mode, size, runs, frames, policy):
+    tunings = sweep.grid(size) if mode == "Grid" else sweep.random_sample(size, seed=0)
+    return sweep.run_sweep(tunings, runs=runs, frames=frames, policy=policy)
+
+
+# A sweep starts only from the button; later reruns keep showing the last one.
+args = (mode, steps if mode == "Grid" else n_points, runs, seconds * 60, policy)
+if st.button("Run sweep", type="primary"):
+    st.session_state["sweep_args"] = args
+if st.session_state.get("sweep_args"):
+    if st.session_state["sweep_args"] != args:
+        st.info("Settings changed: press **Run sweep** to simulate them. "
+                "Showing the last sweep.")
+    result = load_sweep(*st.session_state["sweep_args"])
+
+    metrics = {
+        "Mean score": "score_mean",
+        "Median score": "score_pct",
+        "Game-over rate": "game_over",
+        "Lives lost": "lives_lost",
+        "Level reached": "level",
+    }
+    m1, m2, m3 = st.columns(3)
+    label = m1.selectbox("Map", list(metrics))
+    x = m2.selectbox("X axis", sweep.PARAMS, index=0)
+    y = m3.selectbox("Y axis", sweep.PARAMS, index=1)
+
+    if x == y:
+        st.warning("Pick two different sliders.")
+    else:
+        xs, ys, values = sweep.marginal(result, metrics[label], x, y)
+        gx, gy = np.meshgrid(np.round(xs, 4), np.round(ys, 4))
+        cells = pd.DataFrame({x: gx.ravel(), y: gy.ravel(), label: values.ravel()})
+        heat = alt.Chart(cells).mark_rect().encode(
+            x=alt.X(f"{x}:O", title=x), y=alt.Y(f"{y}:O", title=y, sort="descending"),
+            color=alt.Color(f"{label}:Q", scale=alt.Scale(scheme="viridis")),
+            tooltip=[x, y, alt.Tooltip(f"{label}:Q", format=".3g")],
+        )
+        st.altair_chart(heat, use_container_width=True)
+
+    st.subheader("Score distribution")
+    table = pd.DataFrame(result.table())
+    pick = st.selectbox(
+        "Point", range(len(table)),
+        format_func=lambda i: ", ".join(f"{p}={table.loc[i, p]:.3g}" for p in sweep.PARAMS),
+    )
+    centers = (result.score_edges[:-1] + result.score_edges[1:]) / 2
+    st.bar_chart(pd.DataFrame({"score": np.round(centers), "runs": result.score_hist[pick]}),
+                 x="score", y="runs")
+    st.dataframe(table, use_container_width=True)
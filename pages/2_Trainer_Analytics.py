@@ -0,0 +1,100 @@
+import datetime
+
+import altair as alt
+import streamlit as st
+
+from salesflow import analytics, telemetry
+
+st.set_page_config(page_title="Training — Trainer Analytics", layout="wide")
+
+st.title("Trainer Analytics")
+st.caption(
+    "Per-trainee progress from recorded game sessions. Figures come from "
+    "aggregates kept up to date as telemetry arrives."
+)
+
+store = telemetry.store()
+version = store.version()
+
+
+# Cached per filter; `version` changes only when a telemetry batch lands, so
+# reruns between batches are served from the cache.
+@st.cache_data(max_entries=64, show_spinner=False)
+def load(version, trainees, start, end):
+    args = (store, list(trainees), start, end)
+    return {
+        "trend": analytics.score_trend(*args),
+        "mix": analytics.technique_mix(*args),
+        "accuracy": analytics.accuracy_histogram(*args),
+        "closes": analytics.close_rates(*args),
+    }
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def filters(version):
+    return analytics.trainees(store), analytics.days(store)
+
+
+names, (first_day, last_day) = filters(version)
+if first_day is None:
+    st.info("No finished runs recorded yet. Play a few in the main app.")
+    st.stop()
+
+c1, c2 = st.columns([2, 1])
+picked = c1.multiselect("Trainees", names, format_func=lambda n: n or "(unnamed)",
+                        placeholder="All trainees")
+span = c2.date_input(
+    "Days", (datetime.date.fromisoformat(first_day), datetime.date.fromisoformat(last_day)),
+)
+start, end = (span[0], span[-1]) if span else (None, None)
+data = load(version, tuple(picked), str(start) if start else None, str(end) if end else None)
+
+st.subheader("Score trend")
+trend = data["trend"]
+st.altair_chart(
+    alt.Chart(trend).mark_line(point=True).encode(
+        x=alt.X("day:T", title="Day"), y=alt.Y("score_mean:Q", title="Mean score"),
+        color=alt.Color("trainee:N", title="Trainee"),
+        tooltip=["trainee", "day", "runs", alt.Tooltip("score_mean:Q", format=".0f"),
+                 alt.Tooltip("score_max:Q", format=".0f"),
+                 alt.Tooltip("level_mean:Q", format=".1f")],
+    ),
+    use_container_width=True,
+)
+
+left, right = st.columns(2)
+with left:
+    st.subheader("Technique mix")
+    st.altair_chart(
+        alt.Chart(data["mix"]).mark_bar().encode(
+            x=alt.X("share:Q", title="Share of pickups", axis=alt.Axis(format="%")),
+            y=alt.Y("trainee:N", title=None),
+            color=alt.Color("technique:N", title="Technique"),
+            tooltip=["trainee", "technique", "pickups", alt.Tooltip("share:Q", format=".0%")],
+        ),
+        use_container_width=True,
+    )
+with right:
+    st.subheader("Beat accuracy")
+    acc = data["accuracy"].assign(accuracy=lambda d: (d["bin"] + 0.5) / telemetry.ACCURACY_BINS)
+    st.altair_chart(
+        alt.Chart(acc).mark_bar(opacity=0.7).encode(
+            x=alt.X("accuracy:Q", bin=alt.Bin(step=1 / telemetry.ACCURACY_BINS),
+                    title="Beat accuracy"),
+            y=alt.Y("pickups:Q", stack=None, title="Pickups"),
+            color=alt.Color("trainee:N", title="Trainee"),
+        ),
+        use_container_width=True,
+    )
+
+st.subheader("Close rate by prospect type")
+closes = data["closes"]
+st.altair_chart(
+    alt.Chart(closes).mark_bar().encode(
+        x=alt.X("type:N", title="Prospect type"),
+        y=alt.Y("close_rate:Q", title="Closed / met", axis=alt.Axis(format="%")),
+        tooltip=["type", "met", "closed", alt.Tooltip("close_rate:Q", format=".0%")],
+    ),
+    use_container_width=True,
+)
+st.dataframe(trend, use_container_width=True, hide_index=True)
@@ -0,0 +1,5 @@
+"""Headless tooling for the Sales Flow training game."""
+
+from .engine import Results, Simulation, Tuning, simulate
+
+__all__ = ["Results", "Simulation", "Tuning", "simulate"]
@@ -0,0 +1,219 @@
+"""Command line entry point: ``python -m salesflow <command> ...``."""
+
+import argparse
+import json
+import sys
+import time
+
+from . import constants as C
+from .engine import POLICIES, Tuning, simulate
+
+
+def add_tuning_args(parser):
+    for name, (lo, hi, default, _step) in C.SLIDERS.items():
+        parser.add_argument("--" + name.replace("_", "-"), type=float, default=default,
+                            help=f"slider value in [{lo}, {hi}] (default {default})")
+
+
+def tuning_from_args(args):
+    return Tuning(**{name: getattr(args, name) for name in C.SLIDERS})
+
+
+def cmd_simulate(args):
+    tuning = tuning_from_args(args)
+    t0 = time.perf_counter()
+    results = simulate(tuning, args.runs, max_frames=args.frames, policy=args.policy,
+                       seed=args.seed, course=args.course)
+    elapsed = time.perf_counter() - t0
+    summary = results.summary()
+    if args.json:
+        json.dump({"tuning": tuning.as_dict(), "runs": args.runs, "seconds": elapsed, **summary},
+                  sys.stdout, indent=2)
+        print()
+        return
+    print(f"{args.runs} runs, policy={args.policy}, {elapsed:.2f}s")
+    for name in ("score", "lives_lost", "level", "frames"):
+        s = summary[name]
+        print(f"  {name:<11} mean {s['mean']:>10.1f}   p10 {s['p10']:>10.1f}"
+              f"   p50 {s['p50']:>10.1f}   p90 {s['p90']:>10.1f}")
+    print(f"  game over   {summary['game_over_rate']:.1%}")
+
+
+def cmd_sweep(args):
+    from . import sweep
+
+    if args.sample:
+        tunings = sweep.random_sample(args.sample, seed=args.seed)
+    else:
+        tunings = sweep.grid(args.steps)
+    t0 = time.perf_counter()
+    result = sweep.run_sweep(tunings, runs=args.runs, frames=args.frames, policy=args.policy,
+                             seed=args.seed, workers=args.workers, cache=not args.no_cache)
+    elapsed = time.perf_counter() - t0
+    rows = result.table()
+    if args.json:
+        json.dump(rows, sys.stdout, indent=2)
+        print()
+        return
+    print(f"{len(rows)} points x {args.runs} runs, {elapsed:.1f}s")
+    rows.sort(key=lambda r: r["score_mean"], reverse=True)
+    header = [*sweep.PARAMS, "score_mean", "game_over"]
+    print("  ".join(f"{h:>14}" for h in header))
+    for row in rows[:args.top]:
+        print("  ".join(f"{row[h]:>14.4g}" for h in header))
+
+
+def cmd_par(args):
+    from . import par
+
+    tuning = tuning_from_args(args)
+    t0 = time.perf_counter()
+    result = par.par(args.seed, tuning, levels=args.levels, beam=args.beam,
+                     workers=args.workers, cache=not args.no_cache)
+    elapsed = time.perf_counter() - t0
+    if args.json:
+        json.dump({"seed": result.seed, "tuning": result.tuning, "reachable": result.reachable,
+                   "score": result.score, "lives_lost": result.lives_lost,
+                   "levels": result.levels}, sys.stdout, indent=2)
+        print()
+    else:
+        print(f"course {args.seed}, {len(result.levels)}/{args.levels} levels cleared, {elapsed:.1f}s")
+        for lv in result.levels:
+            print(f"  level {lv['level']:>2}  score {lv['score']:>10.1f}  lives lost {lv['lives_lost']}"
+                  f"  {lv['frames'] / 60:>5.1f}s")
+        print(f"  par {result.score:.1f}, {result.lives_lost} lives lost")
+        if args.score is not None:
+            print(f"  {args.score:.0f} is {result.percent(args.score, args.level):.0f}% of par")
+    if not result.reachable:
+        print("par is unreachable: the autoplayer could not clear every level", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_course(args):
+    from . import levels
+
+    data = levels.course(args.seed, args.first, args.chunks)
+    if args.out == "-":
+        sys.stdout.buffer.write(data)
+        return
+    with open(args.out, "wb") as out:
+        out.write(data)
+    print(f"{args.chunks} chunks, {len(data)} bytes -> {args.out}")
+
+
+def cmd_verify(args):
+    from . import replay
+
+    paths = replay.replay_files(args.paths or [replay.REPLAY_DIR])
+    t0 = time.perf_counter()
+    verdicts = replay.verify_files(paths, workers=args.workers, batch=args.batch)
+    elapsed = time.perf_counter() - t0
+    failed = [v for v in verdicts if not v.ok]
+    if args.json:
+        json.dump([v.__dict__ for v in verdicts], sys.stdout, indent=2)
+        print()
+    else:
+        print(f"{len(verdicts)} replays, {len(failed)} failed, {elapsed:.1f}s")
+        for v in failed:
+            print(f"  {v.path}: {v.reason} (reported {v.reported:.1f}, simulated {v.simulated:.1f})")
+    return 1 if failed else 0
+
+
+def cmd_telemetry(args):
+    from . import telemetry
+
+    store = telemetry.Store(args.db or telemetry.DB_PATH)
+    if args.rebuild:
+        t0 = time.perf_counter()
+        store.rebuild()
+        print(f"aggregates rebuilt in {time.perf_counter() - t0:.1f}s")
+    events, = store.conn.execute("SELECT count(*) FROM events").fetchone()
+    runs, finished = store.conn.execute("SELECT count(*), count(score) FROM runs").fetchone()
+    print(f"{store.path}: {events} events, {runs} runs ({finished} finished), "
+          f"version {store.version()}")
+
+
+def cmd_leaderboard(args):
+    from . import leaderboard
+
+    store = leaderboard.Store(args.db or leaderboard.DB_PATH)
+    for rank, e in enumerate(store.top(args.cohort, args.k), 1):
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(e["finished"]))
+        print(f"{rank:>3}  {e['score']:>10.0f}  level {e['level']:>2}  combo {e['combo']:>3}"
+              f"  {when}  {e['trainee'] or '(unnamed)'}")
+    store.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="salesflow", description=__doc__)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("simulate", help="run N headless games for one slider setting")
+    add_tuning_args(p)
+    p.add_argument("-n", "--runs", type=int, default=1000)
+    p.add_argument("--frames", type=int, default=60 * 180, help="frame cap per run (60 per second)")
+    p.add_argument("--policy", choices=sorted(POLICIES), default="reactive")
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--course", type=int, default=None,
+                   help="play this course seed in every run (default: a fresh course per run)")
+    p.add_argument("--json", action="store_true", help="print the summary as JSON")
+    p.set_defaults(func=cmd_simulate)
+
+    p = sub.add_parser("sweep", help="simulate a grid or random sample of slider settings")
+    p.add_argument("--steps", type=int, default=3, help="grid values per slider")
+    p.add_argument("--sample", type=int, default=0, help="random points instead of a grid")
+    p.add_argument("-n", "--runs", type=int, default=200, help="runs per point")
+    p.add_argument("--frames", type=int, default=60 * 120)
+    p.add_argument("--policy", choices=sorted(POLICIES), default="reactive")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    p.add_argument("--no-cache", action="store_true")
+    p.add_argument("--top", type=int, default=10, help="rows to print")
+    p.add_argument("--json", action="store_true", help="print every point as JSON")
+    p.set_defaults(func=cmd_sweep)
+
+    p = sub.add_parser("par", help="search for a course's par score with the autoplayer")
+    add_tuning_args(p)
+    p.add_argument("--seed", type=int, default=1, help="course seed")
+    p.add_argument("--levels", type=int, default=5, help="levels the autoplayer must clear")
+    p.add_argument("--beam", type=int, default=48, help="runs kept per search step")
+    p.add_argument("--score", type=float, default=None, help="also print this score as %% of par")
+    p.add_argument("--level", type=int, default=None, help="level that score reached")
+    p.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    p.add_argument("--no-cache", action="store_true")
+    p.add_argument("--json", action="store_true", help="print the par as JSON")
+    p.set_defaults(func=cmd_par)
+
+    p = sub.add_parser("course", help="write a window of a seeded course as packed chunks")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--first", type=int, default=0, help="first chunk index")
+    p.add_argument("--chunks", type=int, default=16)
+    p.add_argument("-o", "--out", default="-", help="output file (default: stdout)")
+    p.set_defaults(func=cmd_course)
+
+    p = sub.add_parser("verify", help="re-simulate recorded runs and check their scores")
+    p.add_argument("paths", nargs="*",
+                   help="replay files or directories of *.sfr (default: the replay store)")
+    p.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    p.add_argument("--batch", type=int, default=256, help="replays simulated together")
+    p.add_argument("--json", action="store_true", help="print every verdict as JSON")
+    p.set_defaults(func=cmd_verify)
+
+    p = sub.add_parser("telemetry", help="summarize the telemetry store or rebuild its aggregates")
+    p.add_argument("--db", default=None, help="database file (default: SALESFLOW_TELEMETRY)")
+    p.add_argument("--rebuild", action="store_true", help="recompute aggregates from raw events")
+    p.set_defaults(func=cmd_telemetry)
+
+    p = sub.add_parser("leaderboard", help="print a cohort's best runs")
+    p.add_argument("--cohort", type=int, default=1, help="course seed")
+    p.add_argument("-k", type=int, default=10, help="runs to show")
+    p.add_argument("--db", default=None, help="database file (default: SALESFLOW_LEADERBOARD)")
+    p.set_defaults(func=cmd_leaderboard)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
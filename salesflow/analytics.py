@@ -0,0 +1,82 @@
+"""Trainer-facing queries over the telemetry aggregates.
+
+Every function reads the materialized ``agg_*`` tables of a
+:class:`~salesflow.telemetry.Store` (never the raw events), filtered by
+trainee and an inclusive ``YYYY-MM-DD`` day range (either end may be
+``None``), and returns a DataFrame.  Results only change when
+:meth:`Store.version` does, so callers cache on ``(version, filters)``.
+"""
+
+import pandas as pd
+
+from . import constants as C
+
+
+def _where(trainees, start, end):
+    clauses, params = ["1"], []
+    if start is not None:
+        clauses.append("day >= ?")
+        params.append(str(start))
+    if end is not None:
+        clauses.append("day <= ?")
+        params.append(str(end))
+    if trainees:
+        clauses.append(f"trainee IN ({', '.join('?' * len(trainees))})")
+        params.extend(trainees)
+    return " AND ".join(clauses), params
+
+
+def _query(store, sql, params):
+    with store.lock:
+        return pd.read_sql_query(sql, store.conn, params=params)
+
+
+def trainees(store):
+    with store.lock:
+        rows = store.conn.execute("SELECT DISTINCT trainee FROM agg_daily ORDER BY 1").fetchall()
+    return [r[0] for r in rows]
+
+
+def days(store):
+    """First and last day with finished runs, or ``(None, None)``."""
+    with store.lock:
+        return store.conn.execute("SELECT min(day), max(day) FROM agg_daily").fetchone()
+
+
+def score_trend(store, trainees=(), start=None, end=None):
+    """Runs, mean and best score and mean level per trainee per day."""
+    where, params = _where(trainees, start, end)
+    return _query(store, f"""
+        SELECT trainee, day, runs, score_sum / runs AS score_mean, score_max,
+               1.0 * level_sum / runs AS level_mean
+        FROM agg_daily WHERE {where} ORDER BY trainee, day""", params)
+
+
+def technique_mix(store, trainees=(), start=None, end=None):
+    """Pickups per technique per trainee, with each trainee's share."""
+    where, params = _where(trainees, start, end)
+    df = _query(store, f"""
+        SELECT trainee, technique, sum(pickups) AS pickups
+        FROM agg_technique WHERE {where} GROUP BY trainee, technique""", params)
+    df["technique"] = [C.TECHNIQUES[t] for t in df["technique"]]
+    df["share"] = df["pickups"] / df.groupby("trainee")["pickups"].transform("sum")
+    return df
+
+
+def accuracy_histogram(store, trainees=(), start=None, end=None):
+    """Pickups per beat-accuracy bin (bin ``i`` covers ``[i, i + 1) / bins``) per trainee."""
+    where, params = _where(trainees, start, end)
+    return _query(store, f"""
+        SELECT trainee, bin, sum(pickups) AS pickups
+        FROM agg_accuracy WHERE {where} GROUP BY trainee, bin ORDER BY trainee, bin""", params)
+
+
+def close_rates(store, trainees=(), start=None, end=None):
+    """Prospects met and closed per ``PROSPECT_RHYTHMS`` type, over the selection."""
+    where, params = _where(trainees, start, end)
+    df = _query(store, f"""
+        SELECT type, sum(met) AS met, sum(closed) AS closed
+        FROM agg_prospect WHERE {where} GROUP BY type ORDER BY type""", params)
+    df["type"] = [C.PROSPECT_TYPES[t] for t in df["type"]]
+    df["close_rate"] = df["closed"] / df["met"].where(df["met"] > 0)
+    return df
@@ -0,0 +1,112 @@
+"""Streamlit component wrapping the game in ``frontend/``.
+
+The game document is a static file that Streamlit serves once per session; the
+iframe stays mounted across reruns and new slider values reach the running game
+as ``streamlit:render`` messages instead of a reload.
+
+The course rides along as packed chunks (see :mod:`salesflow.levels`).  Each
+render carries a window of ``LOOKAHEAD`` chunks; as the game's chunk ring
+nears its end the game sets its component value to
+``{"need": {"seed", "chunk"}}`` and the next rerun sends the window starting
+there.
+
+Finished runs come back the same way: the value's ``"replay"`` field holds the
+run's input log (base64), which is stored under ``replay.REPLAY_DIR`` for
+``python -m salesflow verify``, and ``"summary"`` its score, level, best combo,
+course seed and sliders.  The replay is re-simulated before the run goes to
+the leaderboard under its hash, with seed, score, level and sliders taken
+from it; a replay that fails, or a summary that disagrees with it, is refused.
+Both are keyed by content hash, so the value lingering across reruns stores
+nothing twice.
+
+Telemetry batches ride in the value's ``"telemetry"`` list, each with a
+sequence number, under the value's ``"stream"`` id.  Every mount of the iframe
+(say, after a visit to another page) picks a fresh stream and numbers its
+batches and runs from 1 again, so acknowledgements are kept per stream and the
+stream is the telemetry store's session.  New batches are appended to the
+store and the render args acknowledge the highest number seen on the stream so
+the game can drop them.
+"""
+
+import base64
+from pathlib import Path
+
+import numpy as np
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from . import leaderboard, levels, replay, telemetry
+
+FRONTEND = Path(__file__).parent / "frontend"
+LOOKAHEAD = 16
+
+_game = components.declare_component("sales_flow_game", path=str(FRONTEND))
+
+
+def sales_flow_game(config, course_seed=0, trainee="", key="sales_flow_game", height=760):
+    """Render the game (or update it in place) with ``config`` slider values.
+
+    Telemetry of runs started from here is credited to ``trainee``.
+    """
+    value = st.session_state.get(key) or {}
+    if value.get("replay"):
+        data = base64.b64decode(value["replay"])
+        run = replay.store(data).stem
+        if value.get("summary") and st.session_state.get(f"{key}_run") != run:
+            summary, reason = _verified_summary(data, value["summary"])
+            if summary:
+                leaderboard.store().submit(run, summary, trainee)
+            else:
+                st.warning(f"This run was not added to the leaderboard: {reason}.")
+            st.session_state[f"{key}_run"] = run
+    stream, ack = _store_telemetry(value, trainee, key)
+    need = value.get("need") or {}
+    first = int(need.get("chunk", 0)) if need.get("seed") == course_seed else 0
+    return _game(
+        config=config,
+        course_seed=course_seed,
+        course_first=first,
+        course_count=LOOKAHEAD,
+        course=levels.course(course_seed, first, LOOKAHEAD),
+        telemetry_stream=stream,
+        telemetry_ack=ack,
+        key=key,
+        height=height,
+        default=None,
+    )
+
+
+def _verified_summary(data, summary):
+    # The leaderboard entry as the replay has it, re-simulated: seed, score,
+    # level and sliders come from the replay, only the best combo (which it
+    # does not record) from the game.  None and why for a replay that does
+    # not verify or a summary that disagrees with it.
+    try:
+        run = replay.Replay.from_bytes(data)
+    except ValueError as exc:
+        return None, str(exc)
+    verdict = replay.verify([run])[0]
+    if not verdict.ok:
+        return None, f"its replay does not verify ({verdict.reason})"
+    if (int(summary.get("seed", -1)), float(summary.get("score", -1)),
+            int(summary.get("level", -1))) != (run.seed, run.score, run.level):
+        return None, "its summary does not match its replay"
+    return {"seed": run.seed, "score": verdict.simulated, "level": run.level,
+            "combo": int(summary.get("combo", 0)), "config": run.tunings[-1][1].as_dict()}, ""
+
+
+def _store_telemetry(value, trainee, key):
+    # Append batches of the value's stream not stored yet; return the stream
+    # and its highest stored seq.
+    stream = value.get("stream")
+    if not stream:
+        return None, 0
+    acks = st.session_state.setdefault(f"{key}_telemetry", {})
+    ack = acks.get(stream, 0)
+    new = [b for b in value.get("telemetry") or [] if b["seq"] > ack]
+    if new:
+        rows = np.concatenate([telemetry.decode(base64.b64decode(b["data"])) for b in new])
+        telemetry.store().append(stream, rows, trainee)
+        ack = acks[stream] = max(b["seq"] for b in new)
+    return stream, ack
@@ -0,0 +1,62 @@
+"""Game constants shared with the browser build in ``frontend/game.js``.
+
+Values here must stay in lock-step with the JavaScript constants, otherwise the
+headless engine stops reproducing what trainees see in the browser.
+"""
+
+DESIGN_WIDTH, DESIGN_HEIGHT = 1280, 720
+PLAYER_SIZE = 25
+GROUND_Y = 470
+MAX_FALL_SPEED = 13
+STRAFE_SPEED = 4
+STRAFE_DAMPING = 0.85
+KNOCKBACK_Y = 330
+START_LIVES = 3
+MAX_MULTIPLIER = 8
+FRAME_SEC = 1 / 60
+
+# Slider ranges shown in App.py: (min, max, default, step)
+SLIDERS = {
+    "base_speed": (2.0, 5.0, 3.2, 0.1),
+    "gravity": (0.4, 0.9, 0.55, 0.01),
+    "jump_force": (-16.0, -8.0, -11.0, 0.1),
+    "flow_influence": (0.0, 0.01, 0.004, 0.001),
+    "max_speed_mult": (1.2, 2.5, 1.6, 0.1),
+}
+
+# Technique ids are positions in this tuple (SOFT=0 ... CLOSE=6).
+TECHNIQUES = ("SOFT", "NO_SELL", "HARD", "WALK", "EMOTION", "LOGIC", "CLOSE")
+TECHNIQUE_COLORS = ("#4CAF50", "#03A9F4", "#F44336", "#9E9E9E", "#E91E63", "#9C27B0", "#FF9800")
+TECHNIQUE_BEATS = (0.5, 0.3, 1.2, 0.1, 0.8, 0.7, 1.0)
+CLOSE = TECHNIQUES.index("CLOSE")
+
+PROSPECT_TYPES = ("ANALYTICAL", "EMOTIONAL", "EXECUTIVE", "SKEPTICAL", "FRIENDLY", "AGGRESSIVE")
+PROSPECT_RHYTHMS = {
+    "ANALYTICAL": (("NO_SELL", "LOGIC", "CLOSE"), 120),
+    "EMOTIONAL": (("SOFT", "EMOTION", "CLOSE"), 100),
+    "EXECUTIVE": (("NO_SELL", "LOGIC", "CLOSE"), 140),
+    "SKEPTICAL": (("NO_SELL", "WALK", "SOFT", "CLOSE"), 90),
+    "FRIENDLY": (("SOFT", "EMOTION", "CLOSE"), 110),
+    "AGGRESSIVE": (("HARD", "LOGIC", "CLOSE"), 130),
+}
+# Techniques remembered toward a close (the bonus counts at most this many),
+# and the bonus factor when a prospect's rhythm was played in order.
+SEQ_MAX = 8
+ORDER_BONUS = 2
+
+
+# The course is streamed in fixed-width chunks held in a ring of CHUNK_RING
+# preallocated slots (see salesflow/levels.py).  The ring starts at the chunk
+# holding camera x - CHUNK_BEHIND, so a slot is recycled only once everything
+# in it is off screen.  Per-chunk caps size the slots.
+CHUNK_W = 1024
+CHUNK_RING = 4
+CHUNK_BEHIND = 256
+CHUNK_OBSTACLES = 32
+CHUNK_COLLECTIBLES = 48
+CHUNK_PROSPECTS = 4
+CAMERA_LEAD = DESIGN_WIDTH * 0.3
+
+
+def level_end_x(level):
+    return 1800 + level * 900
@@ -0,0 +1,464 @@
+"""Headless, vectorized port of the ``loop()`` game logic in ``frontend/game.js``.
+
+Each :class:`Simulation` steps ``n_runs`` independent games at once; every piece
+of per-run state is a NumPy array whose first axis is the run.  The order of
+operations inside :meth:`Simulation.step` follows ``loop()`` line by line so a
+tuning scored here plays the same in the browser.  Rendering-only state
+(trail, particles, camera shake, sounds) is left out.  The course streams in
+chunks from :mod:`salesflow.levels`, the same seeded generator that feeds the
+browser, into a per-run ring of chunk slots like the game's.
+"""
+
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+from . import constants as C
+from . import levels
+
+# Input bits for one tick.  JUMP is the jump pad held, or a jump key pressed
+# since the last tick; either fires while the player is grounded or already
+# slowing down.
+LEFT, RIGHT, JUMP = 1, 2, 4
+
+
+@dataclass(frozen=True)
+class Tuning:
+    """The five ``st.slider`` knobs from ``App.py``."""
+
+    base_speed: float = C.SLIDERS["base_speed"][2]
+    gravity: float = C.SLIDERS["gravity"][2]
+    jump_force: float = C.SLIDERS["jump_force"][2]
+    flow_influence: float = C.SLIDERS["flow_influence"][2]
+    max_speed_mult: float = C.SLIDERS["max_speed_mult"][2]
+
+    def as_dict(self):
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+@dataclass
+class Results:
+    score: np.ndarray
+    lives_lost: np.ndarray
+    level: np.ndarray
+    frames: np.ndarray
+
+    def summary(self):
+        out = {}
+        for name in ("score", "lives_lost", "level", "frames"):
+            v = getattr(self, name).astype(float)
+            out[name] = {
+                "mean": float(v.mean()),
+                "p10": float(np.percentile(v, 10)),
+                "p50": float(np.percentile(v, 50)),
+                "p90": float(np.percentile(v, 90)),
+            }
+        out["game_over_rate"] = float((self.lives_lost >= C.START_LIVES).mean())
+        return out
+
+
+def _rhythm_steps():
+    """Each prospect type's rhythm as technique ids in order, padded with -1."""
+    rhythms = [C.PROSPECT_RHYTHMS[name][0] for name in C.PROSPECT_TYPES]
+    steps = np.full((len(rhythms), max(map(len, rhythms)) + 1), -1, dtype=np.int64)
+    for p, rhythm in enumerate(rhythms):
+        steps[p, :len(rhythm)] = [C.TECHNIQUES.index(t) for t in rhythm]
+    return steps, np.array([len(r) for r in rhythms])
+
+
+RHYTHM_STEPS, RHYTHM_LEN = _rhythm_steps()
+BEATS = np.array(C.TECHNIQUE_BEATS)
+# Simulation arrays that are not per run.
+_SHARED = ("o_x", "o_y", "o_h", "o_phase")
+
+
+class Simulation:
+    """``n_runs`` games advanced in lock-step, one ``loop()`` frame per step.
+
+    ``course`` is the level seed every run plays (an int, or one per run).
+    By default each run gets its own course drawn from ``seed``.
+    """
+
+    def __init__(self, tuning, n_runs, seed=None, course=None):
+        self.tuning = tuning
+        self.n = n_runs
+        self.rng = np.random.default_rng(seed)
+        n = n_runs
+        if course is None:
+            course = self.rng.integers(0, 2**32, size=n)
+        self.course = np.broadcast_to(np.asarray(course, dtype=np.int64), (n,))
+
+        self.x = np.full(n, 100.0)
+        self.y = np.full(n, 300.0)
+        self.vx = np.zeros(n)
+        self.vy = np.zeros(n)
+        self.grounded = np.zeros(n, dtype=bool)
+
+        self.score = np.zeros(n)
+        self.multiplier = np.ones(n)
+        self.combo = np.zeros(n, dtype=np.int64)
+        self.level = np.ones(n, dtype=np.int64)
+        self.lives = np.full(n, C.START_LIVES, dtype=np.int64)
+        self.flow = np.zeros(n)
+        self.time = np.zeros(n)
+        self.beat = np.zeros(n)
+        self.frames = np.zeros(n, dtype=np.int64)
+        self.alive = np.ones(n, dtype=bool)
+
+        # rhythm.js's RhythmTracker: a ring of the last SEQ_MAX techniques with
+        # its CLOSE count, and per prospect type the rhythm steps played in order.
+        self.seq_ring = np.zeros((n, C.SEQ_MAX), dtype=np.int64)
+        self.seq_head = np.zeros(n, dtype=np.int64)
+        self.seq_len = np.zeros(n, dtype=np.int64)
+        self.seq_closes = np.zeros(n, dtype=np.int64)
+        self.rhythm = np.zeros((n, len(C.PROSPECT_TYPES)), dtype=np.int64)
+
+        # Collectibles and prospects live in a per-run ring of CHUNK_RING chunk
+        # slots, like the browser's; obstacles are the same on every course, so
+        # all runs share one x-sorted list that grows as the leader advances.
+        ring = C.CHUNK_RING
+        self.c_tech = np.zeros((n, ring * C.CHUNK_COLLECTIBLES), dtype=np.int64)
+        self.c_x = np.full((n, ring * C.CHUNK_COLLECTIBLES), np.inf)
+        self.c_y = np.zeros((n, ring * C.CHUNK_COLLECTIBLES))
+        self.c_mag = np.zeros((n, ring * C.CHUNK_COLLECTIBLES))
+        self.p_x = np.full((n, ring * C.CHUNK_PROSPECTS), np.inf)
+        self.p_type = np.zeros((n, ring * C.CHUNK_PROSPECTS), dtype=np.int64)
+        self.p_done = np.ones((n, ring * C.CHUNK_PROSPECTS), dtype=bool)
+        self.o_x = self.o_y = self.o_h = self.o_phase = np.zeros(0)
+        self._n_chunks = 0
+        self.ring_first = np.full(n, np.iinfo(np.int64).min // 2)
+        self._advance(np.ones(n, dtype=bool))
+
+    def take(self, rows):
+        """A new simulation holding copies of ``rows`` (in that order, repeats
+        allowed), for search that branches from a run's current state.
+
+        The streamed obstacle list is shared; it is only ever replaced, never
+        written to in place.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        sim = object.__new__(Simulation)
+        for name, value in vars(self).items():
+            if isinstance(value, np.ndarray) and name not in _SHARED:
+                value = value[rows]
+            setattr(sim, name, value)
+        sim.n = rows.size
+        return sim
+
+    # -- course streaming -------------------------------------------------
+
+    def _ring_start(self):
+        camera = self.x - C.CAMERA_LEAD
+        return np.floor((camera - C.CHUNK_BEHIND) / C.CHUNK_W).astype(np.int64)
+
+    def _advance(self, a):
+        """Recycle ring slots the camera has left behind into the chunks ahead."""
+        first = self._ring_start()
+        moved = np.flatnonzero(a & (first > self.ring_first))
+        if moved.size == 0:
+            return
+        last = int(first[moved].max()) + C.CHUNK_RING
+        if last > self._n_chunks:
+            obs = np.concatenate([levels.obstacles(k) for k in range(self._n_chunks, last)], axis=1)
+            x, y, _w, h, phase = obs.astype(float)
+            self.o_x = np.concatenate([self.o_x, x])
+            self.o_y = np.concatenate([self.o_y, y])
+            self.o_h = np.concatenate([self.o_h, h])
+            self.o_phase = np.concatenate([self.o_phase, phase])
+            self._n_chunks = last
+        old = self.ring_first[moved]
+        new = first[moved]
+        for j in range(C.CHUNK_RING):
+            k = new + j
+            need = k >= old + C.CHUNK_RING
+            self._load(moved[need], k[need])
+        self.ring_first[moved] = new
+
+    def _load(self, rows, ks):
+        """Fill the ring slot of chunk ``ks[i]`` for run ``rows[i]``."""
+        if rows.size == 0:
+            return
+        keys = np.stack([self.course[rows], ks], axis=1)
+        uniq, inverse, counts = np.unique(keys, axis=0, return_inverse=True, return_counts=True)
+        groups = np.split(rows[np.argsort(inverse.ravel(), kind="stable")], np.cumsum(counts)[:-1])
+        ccap, pcap = C.CHUNK_COLLECTIBLES, C.CHUNK_PROSPECTS
+        for (seed, k), sel in zip(uniq, groups):
+            slot = int(k) % C.CHUNK_RING
+            cs, ps = slice(slot * ccap, (slot + 1) * ccap), slice(slot * pcap, (slot + 1) * pcap)
+            # Empty slots hold x = inf (collectibles) or a done prospect.
+            self.c_x[sel, cs] = np.inf
+            self.c_mag[sel, cs] = 0
+            self.p_x[sel, ps] = np.inf
+            self.p_done[sel, ps] = True
+            if k < 0:
+                continue
+            ch = levels.chunk(int(seed), int(k))
+            m, p = ch.techniques.size, ch.prospect_types.size
+            cols = np.arange(slot * ccap, slot * ccap + m)
+            self.c_x[sel[:, None], cols] = ch.collectibles[0]
+            self.c_y[sel[:, None], cols] = ch.collectibles[1]
+            self.c_tech[sel[:, None], cols] = ch.techniques
+            cols = np.arange(slot * pcap, slot * pcap + p)
+            self.p_x[sel[:, None], cols] = ch.prospects[0]
+            self.p_type[sel[:, None], cols] = ch.prospect_types
+            self.p_done[sel[:, None], cols] = False
+
+    def _near_obstacles(self, lo, hi):
+        """``(run, obstacle)`` pairs with ``lo[run] < o_x < hi[run]``, by run then x."""
+        start = np.searchsorted(self.o_x, lo, side="right")
+        count = np.maximum(0, np.searchsorted(self.o_x, hi, side="left") - start)
+        r = np.repeat(np.arange(self.n), count)
+        c = np.arange(r.size) - np.repeat(np.cumsum(count) - count, count) + np.repeat(start, count)
+        return r, c
+
+    # -- one frame --------------------------------------------------------
+
+    def step(self, inputs):
+        """Advance every live run by one frame.  ``inputs`` holds LEFT/RIGHT/JUMP bits."""
+        t = self.tuning
+        a = self.alive
+        if not a.any():
+            return
+        inputs = np.asarray(inputs)
+        self.frames += a
+        self.time = np.where(a, self.time + 0.016, self.time)
+        self.beat = np.where(a, self.beat + 0.032, self.beat)
+
+        target = t.base_speed * (1 + self.flow * t.flow_influence)
+        speed = np.minimum(target, t.base_speed * t.max_speed_mult)
+
+        left = (inputs & LEFT) != 0
+        right = (inputs & RIGHT) != 0
+        vx = np.where(left, -C.STRAFE_SPEED, np.where(right, C.STRAFE_SPEED, self.vx * C.STRAFE_DAMPING))
+        self.vx = np.where(a, vx, self.vx)
+
+        jump = a & ((inputs & JUMP) != 0) & (self.grounded | (self.vy > -5))
+        rb = np.sin(self.beat * 4) * 0.25 + 1
+        self.vy = np.where(jump, t.jump_force * rb, self.vy)
+
+        vy = np.minimum(self.vy + t.gravity, C.MAX_FALL_SPEED)
+        self.vy = np.where(a, vy, self.vy)
+        self.x = np.where(a, self.x + (speed + self.vx), self.x)
+        self.y = np.where(a, self.y + self.vy, self.y)
+
+        ground = a & (self.y > C.GROUND_Y)
+        self.y[ground] = C.GROUND_Y
+        self.vy[ground] = 0
+        self.grounded = np.where(a, ground, self.grounded)
+
+        self._advance(a)
+        self._obstacles(a)
+        a = self.alive
+        self._collectibles(a)
+        self._prospects(a)
+
+        self.flow = np.where(a, np.maximum(0, self.flow - 0.08), self.flow)
+        up = np.flatnonzero(a & (self.x > C.level_end_x(self.level)))
+        if up.size:
+            # A new level only restarts the beat and the technique sequence;
+            # the course keeps streaming.
+            self.level[up] += 1
+            self.time[up] = 0
+            self.beat[up] = 0
+            self._reset_seq(up)
+
+    def _obstacles(self, a):
+        size = C.PLAYER_SIZE
+        # |pulse| <= 6, so a binary search on the x-sorted list narrows the
+        # search to the few obstacles the player can touch; the exact test
+        # runs on those.
+        r, c = self._near_obstacles(self.x - 26, self.x + size + 6)
+        keep = a[r]
+        r, c = r[keep], c[keep]
+        if r.size == 0:
+            return
+        pulse = np.sin(self.beat[r] * 3 + self.o_phase[c]) * 5 + 1
+        ox = self.o_x[c]
+        in_x = (self.x[r] + size > ox - pulse) & (self.x[r] < ox + 20 + pulse)
+        r, c, pulse = r[in_x], c[in_x], pulse[in_x]
+        top, bottom = self.o_y[c] - pulse, self.o_y[c] + self.o_h[c] + pulse
+        hit = (self.y[r] + size > top) & (self.y[r] < bottom)
+        if not hit.any():
+            return
+        # The first hit of each run is the one JS meets first walking its
+        # chunks in order, i.e. the first in the shared x-sorted list.
+        rank = c
+        rows = np.unique(r[hit])
+        first = np.full(self.n, self.o_x.size)
+        np.minimum.at(first, r[hit], rank[hit])
+        # After a hit the player is knocked back to KNOCKBACK_Y, and every later
+        # obstacle in the same frame is tested at that height.
+        ky = C.KNOCKBACK_Y
+        again = (rank > first[r]) & (ky + size > top) & (ky < bottom)
+        hits = 1 + np.bincount(r[again], minlength=self.n)[rows]
+        hits = np.minimum(hits, self.lives[rows])
+        self.lives[rows] -= hits
+        flow = self.flow[rows]
+        for k in range(int(hits.max())):
+            flow = np.where(hits > k, np.maximum(0, flow - 10), flow)
+        self.flow[rows] = flow
+        self.multiplier[rows] = 1
+        self.combo[rows] = 0
+        self.y[rows] = ky
+        self.vy[rows] = 0
+        self.alive[rows[self.lives[rows] <= 0]] = False
+
+    def _collectibles(self, a):
+        # Collected (or unused) slots hold x = inf, so they drop out of the
+        # dense |dx| < 90 prefilter for free.
+        dx = self.x[:, None] - self.c_x
+        r, c = np.nonzero(np.abs(dx) < 90)
+        keep = a[r]
+        r, c = r[keep], c[keep]
+        if r.size == 0:
+            return
+        dx = dx[r, c]
+        dy = self.y[r] - self.c_y[r, c]
+        dist = np.sqrt(dx * dx + dy * dy)
+        near = dist < 90
+        r, c, dx, dy, dist = r[near], c[near], dx[near], dy[near], dist[near]
+        if r.size == 0:
+            return
+        mag = np.minimum(1, self.c_mag[r, c] + 0.12)
+        self.c_mag[r, c] = mag
+        self.c_x[r, c] += dx * mag * 0.08
+        self.c_y[r, c] += dy * mag * 0.08
+        got = dist < 28
+        if not got.any():
+            return
+        gr, gc = r[got], c[got]
+        # JS walks the ring in chunk order from ring_first, so that is the
+        # order same-frame pickups reach the rhythm machines.
+        cap = C.CHUNK_COLLECTIBLES
+        order = np.lexsort(((gc // cap - self.ring_first[gr]) % C.CHUNK_RING * cap + gc % cap, gr))
+        gr, gc = gr[order], gc[order]
+        tech = self.c_tech[gr, gc]
+        self.c_x[gr, gc] = np.inf
+        counts = np.bincount(gr, minlength=self.n)
+        rows = np.flatnonzero(counts)
+        acc = 1 - np.abs(np.fmod(self.beat[rows], 1) - 0.5) * 2
+        bump = acc > 0.8
+        k = counts[rows]
+        mult, score, combo, flow = (self.multiplier[rows], self.score[rows],
+                                    self.combo[rows], self.flow[rows])
+        # Pickups in the same frame are applied one after another in JS, each
+        # seeing the multiplier raised by the previous one.
+        for j in range(int(k.max())):
+            on = k > j
+            pts = np.floor(8 * mult * (1 + acc))
+            score = np.where(on, score + pts, score)
+            combo = np.where(on, combo + 1, combo)
+            flow = np.where(on, np.minimum(100, flow + 1 + acc * 2), flow)
+            mult = np.where(on & bump, np.minimum(C.MAX_MULTIPLIER, mult + 0.15), mult)
+        self.multiplier[rows], self.score[rows] = mult, score
+        self.combo[rows], self.flow[rows] = combo, flow
+        rank = np.arange(gr.size) - np.repeat(np.cumsum(k) - k, k)
+        for j in range(int(k.max())):
+            on = rank == j
+            self._push(gr[on], tech[on])
+
+    def _push(self, rows, tech):
+        """``RhythmTracker.push``: one pickup each for distinct ``rows``."""
+        head = self.seq_head[rows]
+        full = self.seq_len[rows] == C.SEQ_MAX
+        self.seq_closes[rows] -= full & (self.seq_ring[rows, head] == C.CLOSE)
+        self.seq_len[rows] += ~full
+        self.seq_ring[rows, head] = tech
+        self.seq_head[rows] = (head + 1) % C.SEQ_MAX
+        self.seq_closes[rows] += tech == C.CLOSE
+        state = self.rhythm[rows]
+        self.rhythm[rows] = state + (RHYTHM_STEPS[np.arange(len(RHYTHM_LEN)), state] == tech[:, None])
+
+    def _reset_seq(self, rows):
+        self.seq_head[rows] = 0
+        self.seq_len[rows] = 0
+        self.seq_closes[rows] = 0
+        self.rhythm[rows] = 0
+
+    def _prospects(self, a):
+        dist = np.abs(self.x[:, None] - self.p_x)
+        close = a[:, None] & ~self.p_done & (dist < 60) & (self.seq_closes > 0)[:, None]
+        rows, cols = np.nonzero(close)
+        if rows.size == 0:
+            return
+        # Prospects are 500px apart, so at most one is within 60px of a run.
+        self.p_done[rows, cols] = True
+        ptype = self.p_type[rows, cols]
+        order = np.where(self.rhythm[rows, ptype] == RHYTHM_LEN[ptype], C.ORDER_BONUS, 1)
+        self.score[rows] += 90 * self.multiplier[rows] * self.seq_len[rows] * order
+        self.flow[rows] = np.minimum(100, self.flow[rows] + 10)
+        self.multiplier[rows] = np.minimum(C.MAX_MULTIPLIER, self.multiplier[rows] + 1)
+        self._reset_seq(rows)
+
+    # -- driving ----------------------------------------------------------
+
+    def run(self, policy, max_frames, rng=None):
+        """Step until every run is over or ``max_frames`` have elapsed."""
+        rng = rng if rng is not None else np.random.default_rng()
+        for _ in range(max_frames):
+            if not self.alive.any():
+                break
+            self.step(policy(self, rng))
+        return self.results()
+
+    def results(self):
+        return Results(
+            score=self.score.copy(),
+            lives_lost=C.START_LIVES - self.lives,
+            level=self.level.copy(),
+            frames=self.frames.copy(),
+        )
+
+
+# -- input policies -------------------------------------------------------
+
+def idle_policy(sim, rng):
+    return np.zeros(sim.n, dtype=np.uint8)
+
+
+def random_policy(jump_rate=0.04, strafe_rate=0.02):
+    """Mash jump at random; hold left/right in short random bursts."""
+    strafe = None
+
+    def policy(sim, rng):
+        nonlocal strafe
+        if strafe is None:
+            strafe = np.zeros(sim.n, dtype=np.uint8)
+        flip = rng.random(sim.n) < strafe_rate
+        strafe[flip] = rng.choice(np.array([0, LEFT, RIGHT], dtype=np.uint8), size=int(flip.sum()))
+        jump = np.where(rng.random(sim.n) < jump_rate, JUMP, 0).astype(np.uint8)
+        return strafe | jump
+
+    return policy
+
+
+def reactive_policy(lookahead=120.0):
+    """Jump whenever an obstacle sits in the player's path within ``lookahead`` px."""
+
+    def policy(sim, rng):
+        front = sim.x + C.PLAYER_SIZE
+        r, c = sim._near_obstacles(front - 20, front + lookahead)
+        low = sim.o_y[c] < sim.y[r] + C.PLAYER_SIZE + 40
+        threat = np.bincount(r[low], minlength=sim.n) > 0
+        return np.where(threat, JUMP, 0).astype(np.uint8)
+
+    return policy
+
+
+POLICIES = {
+    "idle": lambda: idle_policy,
+    "random": random_policy,
+    "reactive": reactive_policy,
+}
+
+
+def simulate(tuning, n_runs, max_frames=60 * 180, policy="reactive", seed=None, course=None):
+    """Run ``n_runs`` headless games and return their :class:`Results`.
+
+    Pass ``course`` to play one seeded course (as trainees do) instead of a
+    fresh course per run.
+    """
+    seq = np.random.SeedSequence(seed)
+    level_seed, input_seed = seq.spawn(2)
+    sim = Simulation(tuning, n_runs, seed=level_seed, course=course)
+    return sim.run(POLICIES[policy](), max_frames, rng=np.random.default_rng(input_seed))
@@ -0,0 +1,87 @@
+// Sound cues from cached buffers and a fixed voice pool. Each (wave, pitch,
+// duration) tone is synthesized once, envelope included, into an AudioBuffer;
+// play() then only starts a buffer source on one of `voices` gain nodes that
+// stay connected for the page's lifetime. When every voice is busy the one
+// closest to finishing is stolen, so a long combo streak never has more than
+// `voices` sounds (and nodes) alive at once.
+(function (root) {
+  const PEAK = .08, FLOOR = .006;
+  const MAX_BUFFERS = 96;
+
+  // Pitches are rounded to the nearest semitone so rising combo tones reuse a
+  // bounded set of buffers instead of synthesizing one per combo count.
+  function semitone(freq) {
+    return 440 * Math.pow(2, Math.round(12 * Math.log2(freq / 440)) / 12);
+  }
+
+  const WAVES = {
+    sine: ph => Math.sin(2 * Math.PI * ph),
+    sawtooth: ph => 2 * (ph - Math.floor(ph + .5)),
+    square: ph => (ph % 1 < .5 ? 1 : -1),
+    triangle: ph => 1 - 4 * Math.abs(Math.round(ph) - ph)
+  };
+
+  class AudioEngine {
+    constructor({ voices = 8 } = {}) {
+      this.size = voices;
+      this.ctx = null;
+      this.voices = [];
+      this.buffers = new Map();
+      this.dropped = 0;
+    }
+
+    // The context is created on the first cue, inside the click or key that
+    // started the game, so autoplay policies let it run.
+    init() {
+      if (this.ctx) return true;
+      const AC = root.AudioContext || root.webkitAudioContext;
+      if (!AC) return false;
+      try { this.ctx = new AC(); } catch { return false; }
+      for (let i = 0; i < this.size; i++) {
+        const gain = this.ctx.createGain();
+        gain.connect(this.ctx.destination);
+        this.voices.push({ gain, src: null, end: 0 });
+      }
+      return true;
+    }
+
+    buffer(freq, dur, type) {
+      const key = `${type}:${freq.toFixed(2)}:${dur}`;
+      let buf = this.buffers.get(key);
+      if (buf) return buf;
+      const rate = this.ctx.sampleRate, n = Math.max(1, Math.ceil(dur * rate));
+      buf = this.ctx.createBuffer(1, n, rate);
+      const data = buf.getChannelData(0), wave = WAVES[type] || WAVES.sine;
+      // Same curve as exponentialRampToValueAtTime(FLOOR) from PEAK over dur.
+      const decay = Math.log(FLOOR / PEAK) / n;
+      for (let i = 0; i < n; i++) data[i] = PEAK * Math.exp(decay * i) * wave(freq * i / rate);
+      if (this.buffers.size >= MAX_BUFFERS) this.buffers.delete(this.buffers.keys().next().value);
+      this.buffers.set(key, buf);
+      return buf;
+    }
+
+    play(freq = 420, dur = .08, type = 'sine') {
+      if (!this.init()) return;
+      const ctx = this.ctx;
+      if (ctx.state === 'suspended') ctx.resume();
+      const now = ctx.currentTime;
+      let voice = this.voices[0];
+      for (const v of this.voices) {
+        if (v.end <= now) { voice = v; break; }
+        if (v.end < voice.end) voice = v;
+      }
+      if (voice.end > now) {
+        this.dropped++;
+        try { voice.src.stop(); } catch {}
+      }
+      const src = ctx.createBufferSource();
+      src.buffer = this.buffer(semitone(freq), dur, type);
+      src.connect(voice.gain);
+      src.start(now);
+      voice.src = src; voice.end = now + dur;
+    }
+  }
+
+  root.AudioEngine = AudioEngine;
+  if (typeof module === 'object' && module.exports) module.exports = { AudioEngine };
+})(typeof self !== 'undefined' ? self : globalThis);
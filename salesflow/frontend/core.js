@@ -0,0 +1,617 @@
+// Sales Flow game core: simulation and canvas drawing, with no DOM access, so
+// it runs the same on the main thread and inside worker.js. The page shell
+// (game.js) owns input, HUD, menus and audio and talks to the core through
+// setInput()/queueJump() and the `events` callbacks.
+(function (root) {
+  const DESIGN_WIDTH = 1280, DESIGN_HEIGHT = 720;
+  const PLAYER_SIZE = 25;
+
+  const TECHNIQUES = {
+    SOFT:    { color: '#4CAF50', icon:'🤝', beat: 0.5 },
+    NO_SELL: { color: '#03A9F4', icon:'💬', beat: 0.3 },
+    HARD:    { color: '#F44336', icon:'⚡',  beat: 1.2 },
+    WALK:    { color: '#9E9E9E', icon:'🚶', beat: 0.1 },
+    EMOTION: { color: '#E91E63', icon:'❤️', beat: 0.8 },
+    LOGIC:   { color: '#9C27B0', icon:'🧠', beat: 0.7 },
+    CLOSE:   { color: '#FF9800', icon:'🎯', beat: 1.0 }
+  };
+
+  const PROSPECT_RHYTHMS = {
+    ANALYTICAL: { colors: ['NO_SELL','LOGIC','CLOSE'], tempo: 120 },
+    EMOTIONAL:  { colors: ['SOFT','EMOTION','CLOSE'],  tempo: 100 },
+    EXECUTIVE:  { colors: ['NO_SELL','LOGIC','CLOSE'], tempo: 140 },
+    SKEPTICAL:  { colors: ['NO_SELL','WALK','SOFT','CLOSE'], tempo: 90 },
+    FRIENDLY:   { colors: ['SOFT','EMOTION','CLOSE'], tempo: 110 },
+    AGGRESSIVE: { colors: ['HARD','LOGIC','CLOSE'], tempo: 130 }
+  };
+
+  // Input bits per tick, the same as salesflow/engine.py.
+  const LEFT = 1, RIGHT = 2, JUMP = 4;
+
+  const DEFAULT_CONFIG = {
+    gravity: 0.55, jump_force: -11, base_speed: 3.2,
+    max_speed_mult: 1.6, flow_influence: 0.004,
+    hud_stats: 0, render_fps: 0, worker: 0, profile: 0,
+    quality: 0,      // 0: adaptive, n: fixed at QualityManager.LEVELS[n-1]
+    render_scale: 1  // backing-store pixels per CSS pixel of the stage
+  };
+
+  const TECH_KEYS = Object.keys(TECHNIQUES);
+  const CLOSE = TECH_KEYS.indexOf('CLOSE');
+  const PROSPECT_KEYS = Object.keys(PROSPECT_RHYTHMS);
+  // Each prospect type's rhythm as technique ids, in order (see rhythm.js).
+  const RHYTHM_STEPS = PROSPECT_KEYS.map(k => PROSPECT_RHYTHMS[k].colors.map(t => TECH_KEYS.indexOf(t)));
+  // A close after the prospect's rhythm was played in order scores this many times over.
+  const ORDER_BONUS = 2;
+
+  // The course streams from Python (salesflow/levels.py) as fixed-width
+  // chunks in packed little-endian blocks. Parsing makes typed-array views
+  // into the received buffer; no per-entity objects are built.
+  const CHUNK_W = 1024, CHUNK_RING = 4, CHUNK_BEHIND = 256;
+  const CHUNK_OBSTACLES = 32, CHUNK_COLLECTIBLES = 48, CHUNK_PROSPECTS = 4;
+
+  function parseCourse(bytes) {
+    // Copy once: the views need a 4-byte aligned buffer of their own.
+    const buf = (bytes instanceof ArrayBuffer ? new Uint8Array(bytes) : bytes).slice().buffer;
+    const chunks = [];
+    let off = 0;
+    while (off < buf.byteLength) {
+      const [k, level, nObs, nCol, nPro] = new Uint32Array(buf, off, 6); off += 24;
+      const f32 = n => { const v = new Float32Array(buf, off, n); off += 4*n; return v; };
+      const u8 = n => { const v = new Uint8Array(buf, off, n); off += n; return v; };
+      const c = { k, level, nObs, nCol, nPro };
+      c.ox = f32(nObs); c.oy = f32(nObs); c.ow = f32(nObs); c.oh = f32(nObs); c.ophase = f32(nObs);
+      c.cx = f32(nCol); c.cy = f32(nCol); c.cphase = f32(nCol);
+      c.px = f32(nPro); c.py = f32(nPro);
+      c.ctech = u8(nCol); c.ptype = u8(nPro);
+      off += (4 - off % 4) % 4;
+      chunks.push(c);
+    }
+    return chunks;
+  }
+
+  // A ring slot holds one chunk in preallocated arrays sized for the
+  // per-chunk caps; slots are refilled in place as the camera moves on.
+  function makeSlot() {
+    return {
+      k: null, ready: false,
+      nObs: 0, ox: new Float32Array(CHUNK_OBSTACLES), oy: new Float32Array(CHUNK_OBSTACLES),
+      ow: new Float32Array(CHUNK_OBSTACLES), oh: new Float32Array(CHUNK_OBSTACLES),
+      ophase: new Float32Array(CHUNK_OBSTACLES),
+      nCol: 0, cx: new Float64Array(CHUNK_COLLECTIBLES), cy: new Float64Array(CHUNK_COLLECTIBLES),
+      mag: new Float64Array(CHUNK_COLLECTIBLES), got: new Uint8Array(CHUNK_COLLECTIBLES),
+      tech: new Uint8Array(CHUNK_COLLECTIBLES), cphase: new Float32Array(CHUNK_COLLECTIBLES),
+      nPro: 0, px: new Float32Array(CHUNK_PROSPECTS), py: new Float32Array(CHUNK_PROSPECTS),
+      ptype: new Uint8Array(CHUNK_PROSPECTS), satisfied: new Uint8Array(CHUNK_PROSPECTS),
+      approaching: new Uint8Array(CHUNK_PROSPECTS)
+    };
+  }
+
+  function fillSlot(slot, c) {
+    slot.ready = true;
+    slot.nObs = c.nObs;
+    slot.ox.set(c.ox); slot.oy.set(c.oy); slot.ow.set(c.ow); slot.oh.set(c.oh); slot.ophase.set(c.ophase);
+    slot.nCol = c.nCol;
+    slot.cx.set(c.cx); slot.cy.set(c.cy); slot.cphase.set(c.cphase); slot.tech.set(c.ctech);
+    slot.mag.fill(0); slot.got.fill(0);
+    slot.nPro = c.nPro;
+    slot.px.set(c.px); slot.py.set(c.py); slot.ptype.set(c.ptype);
+    slot.satisfied.fill(0); slot.approaching.fill(0);
+  }
+
+  function clearSlot(slot, k) {
+    slot.k = k; slot.ready = k < 0;
+    slot.nObs = slot.nCol = slot.nPro = 0;
+  }
+
+  // The margin the update/draw loops look beyond the screen edges; covers
+  // pulse, magnet radius and shake.
+  const WINDOW_MARGIN = 160;
+
+  // The simulation advances in fixed 1/60 s ticks from an accumulator,
+  // independent of the display rate. A slow frame runs several ticks before
+  // drawing once (capped at MAX_TICKS, then the backlog is dropped), and
+  // render() interpolates the player and camera between the last two ticks.
+  // cfg.render_fps > 0 additionally caps how often we draw.
+  const TICK_MS = 1000 / 60, MAX_TICKS = 5;
+
+  // The frame loop allocates nothing once running (bench/alloc.check.js):
+  // colors come from these tables, the trail is a ring of typed arrays and
+  // the loops are plain index loops. Flow (0..100) is quantized to whole
+  // units for the trail hue; the background shade already moves in whole steps.
+  const BG_FILL = [], TRAIL_FILL = [];
+  for (let f = 0; f <= 100; f++) {
+    const bg = Math.floor(18 + f * 0.4);
+    BG_FILL[bg] = `rgb(${bg},${bg},${Math.floor(bg*1.1)})`;
+    TRAIL_FILL[f] = `hsl(${180 + f*2},70%,60%)`;
+  }
+  const TRAIL_MAX = QualityManager.LEVELS[0].trail;
+  // Largest particle burst puff() is asked for.
+  const MAX_BURST = 14;
+
+  // The 2D contexts of the stacked stage canvases (index.html): an opaque
+  // background, the world and the effects on top.
+  function layerContexts(canvases) {
+    return {
+      bg: canvases.bg.getContext('2d', { alpha: false }),
+      world: canvases.world.getContext('2d'),
+      fx: canvases.fx.getContext('2d')
+    };
+  }
+
+  // `target` is {bg, world, fx} from layerContexts(), or one context that
+  // takes all three layers and is then redrawn in full every frame.
+  function createGame(target, events = {}) {
+    // Fixed arity: a rest parameter would build an array on every call.
+    const emit = (name, a, b, c) => { const f = events[name]; if (f) f(a, b, c); };
+    const cfg = Object.assign({}, DEFAULT_CONFIG);
+    const layers = target.world ? target : { bg: target, world: target, fx: target };
+    const layered = layers.bg !== layers.world;
+    const ctx = layers.world, fx = layers.fx;
+
+    // Sprites, built once, with glow (sprites[1]) and flat (sprites[0]) for
+    // lower quality levels. Collectible radius 8+pulse spans 6..12 px and is
+    // drawn at the nearest whole radius; the player glow follows flow in steps of 5.
+    const COLLECTIBLE_RADII = [6, 7, 8, 9, 10, 11, 12];
+    const FLOW_STEP = 5;
+    function buildSprites(glow) {
+      const tech = TECH_KEYS.map(k =>
+        COLLECTIBLE_RADII.map(r => Sprites.glowCircle(TECHNIQUES[k].color, r, 14 * glow)));
+      const player = [];
+      for (let f = 0; f <= 100; f += FLOW_STEP) {
+        const hue = 180 + f*1.8;
+        player.push(Sprites.glowRect(`hsl(${hue},70%,${50 + f*.3}%)`, `hsl(${hue},100%,50%)`,
+                                     (8 + f*.2) * glow, PLAYER_SIZE, PLAYER_SIZE));
+      }
+      return { tech, player, satisfied: Sprites.glowRect('#44FF44', '#44FF44', 18 * glow, 30, 30) };
+    }
+    const sprites = [buildSprites(0), buildSprites(1)];
+
+    // Render quality: adaptive unless cfg.quality pins a level. `q` holds the
+    // settings in effect (trail length, particle share, glow, backing-store scale).
+    // `burst[n]` is the particle count of an n-particle burst at this level,
+    // worked out here so puff() does no float math.
+    const quality = new QualityManager();
+    let q = quality.settings;
+    const burst = new Int32Array(MAX_BURST + 1);
+    function setQuality(settings) {
+      q = settings;
+      for (let n = 0; n <= MAX_BURST; n++) burst[n] = Math.max(1, Math.round(n * q.particles));
+      setScale();
+    }
+
+    // Backing stores are cfg.render_scale times the quality level's scale of
+    // the design size. The stage is laid out in CSS pixels, so only the
+    // backing stores change. Resizing clears a canvas and resets its state,
+    // hence the transform here and the background repaint.
+    let scale = 0, bgShade = -1, fxDrawn = false;
+    function setScale() {
+      scale = cfg.render_scale * q.scale;
+      const w = Math.round(DESIGN_WIDTH * scale), h = Math.round(DESIGN_HEIGHT * scale);
+      for (const c of new Set([layers.bg, layers.world, layers.fx])) {
+        if (c.canvas && (c.canvas.width !== w || c.canvas.height !== h)) {
+          c.canvas.width = w; c.canvas.height = h;
+        }
+        c.setTransform(scale, 0, 0, scale, 0, 0);
+      }
+      bgShade = -1; fxDrawn = true;
+    }
+    setQuality(q);
+
+    let state = 'menu';
+    // Run state, in one object so the per-tick number updates happen in
+    // place (a reassigned closure variable holding a double allocates). It
+    // doubles as the HUD snapshot handed to events.hud.
+    const stats = { score:0, multiplier:1, combo:0, maxCombo:0, level:1, lives:3, flow:0, sessionSec:0 };
+    let inputBits = 0;
+    // Every run's inputs, for server-side score verification.
+    const recorder = new ReplayRecorder();
+    // Gameplay events for the telemetry store, sent in batches.
+    const telemetry = new TelemetryBuffer(256);
+    const KIND = TelemetryBuffer.KIND;
+    // Per-phase frame timing, only while cfg.profile is on.
+    const PH = FrameProfiler.PHASE;
+    let prof = null, profSent = -Infinity;
+    function log(kind, a, b, x) {
+      telemetry.push(kind, a, b, x);
+      if (telemetry.full()) emit('telemetry', telemetry.flush());
+    }
+
+    // Received chunks of the current course seed, by index. A run keeps the
+    // course it started with, so a seed change in Python only affects the
+    // next run. Chunks behind the ring are dropped as the run moves on.
+    let course = { seed: null, chunks: new Map() };
+    let runCourse = course;
+
+    const ring = Array.from({ length: CHUNK_RING }, makeSlot);
+    const slotOf = k => ring[((k % CHUNK_RING) + CHUNK_RING) % CHUNK_RING];
+
+    const game = {
+      player: { x:100, y:300, vx:0, vy:0, w:PLAYER_SIZE, h:PLAYER_SIZE, grounded:false },
+      // The player's last positions, newest at head-1; n of them are drawn.
+      trail: { x: new Float64Array(TRAIL_MAX), y: new Float64Array(TRAIL_MAX),
+               life: new Float64Array(TRAIL_MAX), head: 0, n: 0 },
+      camera: { x:0, shake:0 },
+      ring, ringFirst:0, particles:new ParticlePool(1024),
+      jumpQueued:false, time:0, beatTime:0, seq:new RhythmTracker(RHYTHM_STEPS, CLOSE),
+      prev: { x:100, y:300, camX:0 }
+    };
+
+    function setState(s) { state = s; emit('stateChange', s); }
+
+    // Everything goes to emit() as int32 (`| 0`), which is never boxed: the
+    // origin in whole pixels, as the burst spreads it over 20 px anyway.
+    // `n` is at most MAX_BURST.
+    function puff(x,y,color, n) {
+      game.particles.emit(Math.round(x) | 0, Math.round(y) | 0, color, burst[n]);
+    }
+
+    // Add chunks of course `seed`; a new seed starts a new course. A chunk
+    // that arrives after its slot came up is filled in then.
+    function loadCourse(seed, bytes) {
+      if (seed !== course.seed) course = { seed, chunks: new Map() };
+      for (const c of parseCourse(bytes)) {
+        course.chunks.set(c.k, c);
+        if (course === runCourse) {
+          const slot = slotOf(c.k);
+          if (slot.k === c.k && !slot.ready) fillSlot(slot, c);
+        }
+      }
+    }
+
+    // Keep the ring on chunks first .. first+CHUNK_RING-1, where `first`
+    // holds camera x - CHUNK_BEHIND, refilling each slot the camera leaves.
+    // Emits 'chunk' with the new `first` so the shell can fetch ahead.
+    function advanceRing(camX, reset) {
+      const first = Math.floor((camX - CHUNK_BEHIND) / CHUNK_W);
+      if (!reset && first <= game.ringFirst) return;
+      for (let k = first; k < first + CHUNK_RING; k++) {
+        const slot = slotOf(k);
+        if (!reset && slot.k === k) continue;
+        clearSlot(slot, k);
+        const c = runCourse.chunks.get(k);
+        if (c) fillSlot(slot, c);
+      }
+      // The opening chunks stay for the next start; the rest go once passed.
+      // Everything before the old ring is gone already, unless it is a reset.
+      const from = reset ? CHUNK_RING : Math.max(CHUNK_RING, game.ringFirst);
+      for (let k = from; k < first; k++) runCourse.chunks.delete(k);
+      game.ringFirst = first;
+      emit('chunk', first, runCourse.seed);
+    }
+
+    function start() {
+      stats.score=0; stats.multiplier=1; stats.combo=0; stats.maxCombo=0; stats.level=1; stats.lives=3; stats.flow=0; stats.sessionSec=0;
+      game.player = { x:100, y:300, vx:0, vy:0, w:PLAYER_SIZE, h:PLAYER_SIZE, grounded:false };
+      game.trail.n = 0;
+      game.prev.x = 100; game.prev.y = 300; game.prev.camX = game.camera.x = 100 - DESIGN_WIDTH * .3;
+      game.jumpQueued = false;
+      clock.last = -1; clock.acc = 0;
+      runCourse = course;
+      recorder.start(runCourse.seed, cfg);
+      telemetry.run++; telemetry.tick = 0;
+      log(KIND.START, runCourse.seed, 0, game.player.x);
+      game.time=0; game.beatTime=0; game.seq.reset();
+      advanceRing(game.camera.x, true);
+      setState('playing');
+    }
+
+    function endGame() {
+      setState('gameOver');
+      log(KIND.END, stats.level, stats.score, game.player.x);
+      const batch = telemetry.flush();
+      if (batch) emit('telemetry', batch);
+      emit('gameOver', { score: stats.score, level: stats.level, combo: stats.maxCombo, seed: runCourse.seed,
+                         config: Object.assign({}, cfg), replay: recorder.bytes(stats.score, stats.level),
+                         profile: prof && profile() });
+    }
+
+    // Frame timing, as fields for the same reason as `stats`. last < 0: no
+    // frame yet.
+    const clock = { last: -1, acc: 0, rendered: -Infinity };
+
+    // Call once per animation frame with a millisecond timestamp.
+    function frame(now) {
+      if (telemetry.due(now)) emit('telemetry', telemetry.flush());
+      if (state!=='playing') { clock.last = -1; quality.clear(); return; }
+      if (clock.last < 0) clock.last = now;
+      const t0 = performance.now();
+      clock.acc += Math.min(now - clock.last, 250); clock.last = now;
+
+      if (prof) prof.begin();
+      let ticks = 0;
+      while (clock.acc >= TICK_MS && ticks < MAX_TICKS) {
+        update(); clock.acc -= TICK_MS; ticks++;
+        if (state!=='playing') return;
+      }
+      if (ticks === MAX_TICKS) clock.acc = 0;
+
+      if (!(cfg.render_fps > 0 && now - clock.rendered < 1000 / cfg.render_fps - 1)) {
+        clock.rendered = now;
+        render();
+      }
+      if (!cfg.quality && quality.sample(now, performance.now() - t0)) setQuality(quality.settings);
+      if (prof) {
+        prof.end();
+        if (now - profSent >= 500) { profSent = now; emit('profile', profile()); }
+      }
+    }
+
+    function update() {
+      const g = game, p = g.player, cam = g.camera;
+      g.prev.x = p.x; g.prev.y = p.y; g.prev.camX = cam.x;
+      g.time += 0.016; g.beatTime += 0.032;
+      recorder.tick((inputBits & (LEFT|RIGHT|JUMP)) | (g.jumpQueued ? JUMP : 0));
+      telemetry.tick++;
+
+      const targetSpeed = cfg.base_speed * (1 + stats.flow * cfg.flow_influence);
+      const currentSpeed = Math.min(targetSpeed, cfg.base_speed * cfg.max_speed_mult);
+
+      // input → vx
+      if (inputBits & LEFT) p.vx = -4;
+      else if (inputBits & RIGHT) p.vx = 4;
+      else p.vx *= .85;
+
+      if (((inputBits & JUMP) || g.jumpQueued) && (p.grounded || p.vy > -5)) {
+        const rb = Math.sin(g.beatTime*4)*.25 + 1;
+        p.vy = cfg.jump_force * rb;
+        if (g.jumpQueued) emit('sound', 420, .08);
+      }
+      g.jumpQueued = false;
+
+      // physics
+      p.vy += cfg.gravity; p.vy = Math.min(p.vy, 13);
+      p.x += currentSpeed + p.vx; p.y += p.vy;
+
+      // camera
+      cam.x = p.x - DESIGN_WIDTH * .3; cam.shake *= .9;
+      advanceRing(cam.x, false);
+
+      // ground
+      if (p.y > 470) { p.y=470; p.vy=0; p.grounded=true; } else p.grounded=false;
+      if (prof) prof.lap(PH.PHYSICS);
+
+      // trail
+      const tr = g.trail;
+      tr.x[tr.head] = p.x; tr.y[tr.head] = p.y; tr.life[tr.head] = 1;
+      tr.head = (tr.head + 1) % TRAIL_MAX; tr.n = Math.min(tr.n + 1, q.trail);
+      for (let i = 0; i < TRAIL_MAX; i++) tr.life[i] *= .94;
+      if (prof) prof.lap(PH.TRAIL);
+
+      const winLo = cam.x - WINDOW_MARGIN, winHi = cam.x + DESIGN_WIDTH + WINDOW_MARGIN;
+
+      // Slots are walked in chunk order, so obstacles are met in x order.
+      for (let j = 0; j < CHUNK_RING; j++) {
+        const sl = slotOf(g.ringFirst + j);
+        for (let i = 0; i < sl.nObs; i++) {
+          const ox = sl.ox[i], oy = sl.oy[i];
+          if (ox < winLo) continue;
+          if (ox > winHi) break;
+          const pulse = Math.sin(g.beatTime*3 + sl.ophase[i])*5 + 1;
+          if (
+            p.x + p.w > ox - pulse &&
+            p.x < ox + sl.ow[i] + pulse &&
+            p.y + p.h > oy - pulse &&
+            p.y < oy + sl.oh[i] + pulse
+          ) {
+            stats.lives -= 1; stats.flow = Math.max(0, stats.flow-10); stats.multiplier=1; stats.combo=0;
+            cam.shake = 16; puff(p.x, p.y, '#FF4444', 14); emit('sound', 220,.25,'sawtooth');
+            p.y = 330; p.vy = 0;
+            log(KIND.HIT, stats.lives, stats.flow, p.x);
+            if (stats.lives <= 0) return endGame();
+          }
+        }
+      }
+      if (prof) prof.lap(PH.OBSTACLES);
+
+      // collectibles
+      for (let j = 0; j < CHUNK_RING; j++) {
+        const sl = slotOf(g.ringFirst + j);
+        for (let i = 0; i < sl.nCol; i++) {
+          if (sl.got[i] || sl.cx[i] < winLo || sl.cx[i] > winHi) continue;
+          const dx = p.x-sl.cx[i], dy=p.y-sl.cy[i];
+          const dist = Math.sqrt(dx*dx + dy*dy);
+          if (dist<90) {
+            const mag = sl.mag[i] = Math.min(1, sl.mag[i]+.12);
+            sl.cx[i] += dx*mag*.08; sl.cy[i] += dy*mag*.08;
+          }
+          if (dist<28) {
+            const t = sl.tech[i];
+            sl.got[i] = 1; g.seq.push(t);
+            const acc = 1 - Math.abs((g.beatTime%1)-.5)*2;
+            const pts = Math.floor(8*stats.multiplier*(1+acc));
+            stats.score += pts; stats.combo += 1; stats.maxCombo = Math.max(stats.maxCombo, stats.combo); stats.flow = Math.min(100, stats.flow + 1 + acc*2);
+            if (acc>.8) stats.multiplier = Math.min(8, stats.multiplier + .15);
+            log(KIND.PICKUP, t, acc, p.x);
+            puff(sl.cx[i],sl.cy[i],TECHNIQUES[TECH_KEYS[t]].color,10); emit('sound', 440 + stats.combo*18, .08);
+          }
+        }
+      }
+      if (prof) prof.lap(PH.COLLECTIBLES);
+
+      // prospects
+      for (let j = 0; j < CHUNK_RING; j++) {
+        const sl = slotOf(g.ringFirst + j);
+        for (let i = 0; i < sl.nPro; i++) {
+          const dist = Math.abs(p.x - sl.px[i]);
+          if (dist < 220 && !sl.satisfied[i]) {
+            sl.approaching[i] = 1;
+            if (dist < 60 && g.seq.ready()) {
+              sl.satisfied[i] = 1;
+              const order = g.seq.inOrder(sl.ptype[i]) ? ORDER_BONUS : 1;
+              const bonus = 90 * stats.multiplier * g.seq.length * order;
+              stats.score += bonus; stats.flow = Math.min(100, stats.flow+10); stats.multiplier = Math.min(8, stats.multiplier+1);
+              log(KIND.CLOSE, sl.ptype[i], bonus, p.x);
+              puff(sl.px[i], sl.py[i], '#44FF44', 14); emit('sound', 660, .4); g.seq.reset();
+            }
+          }
+        }
+      }
+      if (prof) prof.lap(PH.PROSPECTS);
+
+      g.particles.update();
+      if (prof) prof.lap(PH.PARTICLES);
+
+      stats.sessionSec += 1/60;
+      stats.flow = Math.max(0, stats.flow - .08);
+
+      // progress: the course keeps streaming; a level restarts the beat and
+      // the technique sequence.
+      if (p.x > 1800 + stats.level*900) {
+        stats.level += 1;
+        log(KIND.LEVEL, stats.level, stats.score, p.x);
+        g.time=0; g.beatTime=0; g.seq.reset();
+      }
+      if (prof) prof.lap(PH.PHYSICS);
+    }
+
+    // Draws `at` of the way from the previous tick to the last, by default
+    // where the frame clock is. The frame passes nothing: a double argument
+    // is boxed, and so is one merged with an untyped parameter, hence +at.
+    function render(at) {
+      const alpha = at === undefined ? clock.acc / TICK_MS : +at;
+      const g = game, p = g.player, cam = g.camera;
+      const px = g.prev.x + (p.x - g.prev.x) * alpha;
+      const py = g.prev.y + (p.y - g.prev.y) * alpha;
+      const camX = g.prev.camX + (cam.x - g.prev.camX) * alpha;
+      // Shake under half a pixel is not drawn. Two incommensurate sines of
+      // the clock jitter like random offsets without calling Math.random.
+      const shake = cam.shake < .5 ? 0 : cam.shake;
+      const sx = shake && Math.sin(g.time * 311) * .5 * shake;
+      const sy = shake && Math.sin(g.time * 421) * .5 * shake;
+      const S = sprites[q.glow];
+
+      // Background layer: a flat shade that moves with flow in whole steps,
+      // so on its own canvas it is repainted only when the step changes.
+      const bg = Math.floor(18 + stats.flow * 0.4);
+      if (bg !== bgShade || !layered) {
+        bgShade = bg;
+        layers.bg.fillStyle = BG_FILL[bg];
+        layers.bg.fillRect(0,0,DESIGN_WIDTH,DESIGN_HEIGHT);
+      }
+      if (prof) prof.lap(PH.BACKGROUND);
+
+      // World layer: one camera transform for everything in it, and each
+      // group below sets its fill style once.
+      if (layered) ctx.clearRect(0,0,DESIGN_WIDTH,DESIGN_HEIGHT);
+      ctx.save(); ctx.translate(-camX+sx, sy);
+
+      // trail, oldest first
+      const tr = g.trail;
+      ctx.fillStyle = TRAIL_FILL[Math.round(stats.flow)];
+      for (let k = tr.n; k > 0; k--) {
+        const i = (tr.head - k + TRAIL_MAX) % TRAIL_MAX, life = tr.life[i];
+        if (life>.1) {
+          ctx.globalAlpha = life*.5;
+          const s = life*7; ctx.fillRect(tr.x[i]-s/2, tr.y[i]-s/2, s, s);
+        }
+      }
+      ctx.globalAlpha=1;
+      if (prof) prof.lap(PH.TRAIL);
+
+      const winLo = camX - WINDOW_MARGIN, winHi = camX + DESIGN_WIDTH + WINDOW_MARGIN;
+
+      // obstacles
+      ctx.fillStyle = 'rgba(255,100,100,.55)';
+      for (let j = 0; j < CHUNK_RING; j++) {
+        const sl = slotOf(g.ringFirst + j);
+        for (let i = 0; i < sl.nObs; i++) {
+          const ox = sl.ox[i];
+          if (ox < winLo) continue;
+          if (ox > winHi) break;
+          const pulse = Math.sin(g.beatTime*3 + sl.ophase[i])*5 + 1;
+          ctx.fillRect(ox-pulse, sl.oy[i]-pulse, sl.ow[i]+pulse*2, sl.oh[i]+pulse*2);
+        }
+      }
+      if (prof) prof.lap(PH.OBSTACLES);
+
+      // collectibles: every visible one shares the same glow alpha this frame
+      ctx.globalAlpha = Math.sin(g.beatTime*2)*.3 + .7;
+      for (let j = 0; j < CHUNK_RING; j++) {
+        const sl = slotOf(g.ringFirst + j);
+        for (let i = 0; i < sl.nCol; i++) {
+          if (sl.got[i] || sl.cx[i] < winLo || sl.cx[i] > winHi) continue;
+          const pulse = Math.sin(g.beatTime*4 + sl.cphase[i])*3 + 1;
+          Sprites.blit(ctx, S.tech[sl.tech[i]][Math.round(pulse) + 2], sl.cx[i], sl.cy[i]);
+        }
+      }
+      ctx.globalAlpha = 1;
+      if (prof) prof.lap(PH.COLLECTIBLES);
+
+      // prospects
+      for (let j = 0; j < CHUNK_RING; j++) {
+        const sl = slotOf(g.ringFirst + j);
+        for (let i = 0; i < sl.nPro; i++) {
+          const x = sl.px[i], y = sl.py[i];
+          if (x < winLo || x > winHi) continue;
+          if (sl.satisfied[i]) { Sprites.blit(ctx, S.satisfied, x-15, y-15); continue; }
+          if (sl.approaching[i]) {
+            // Same pixels as rgba(255,200,100,a) without building a color string.
+            ctx.globalAlpha = Math.sin((g.beatTime * PROSPECT_RHYTHMS[PROSPECT_KEYS[sl.ptype[i]]].tempo)/30)*.3 + .7;
+            ctx.fillStyle = 'rgb(255,200,100)';
+          } else ctx.fillStyle = '#888';
+          ctx.fillRect(x-15, y-15, 30, 30);
+          ctx.globalAlpha = 1;
+        }
+      }
+
+      if (prof) prof.lap(PH.PROSPECTS);
+
+      // player
+      Sprites.blit(ctx, S.player[Math.round(stats.flow / FLOW_STEP)], px, py);
+      if (prof) prof.lap(PH.PLAYER);
+
+      ctx.restore();
+
+      // Effects layer: particles. Most frames have none, and a layer that
+      // was empty last frame needs no clearing either.
+      if (layered && (fxDrawn || g.particles.count)) fx.clearRect(0,0,DESIGN_WIDTH,DESIGN_HEIGHT);
+      fxDrawn = g.particles.count > 0;
+      // The camera goes on the context: passing the offset as doubles to
+      // draw() would box them.
+      if (fxDrawn) {
+        fx.save(); fx.translate(-camX+sx, sy);
+        g.particles.draw(fx, 0, 0);
+        fx.restore();
+      }
+      if (prof) prof.lap(PH.PARTICLES);
+
+      emit('hud', stats);
+      if (prof) prof.lap(PH.HUD);
+    }
+
+    // Live config: only known numeric keys are taken, the run keeps going.
+    function applyConfig(c) {
+      if (!c) return;
+      for (const k in cfg) if (typeof c[k] === 'number') cfg[k] = c[k];
+      if (state === 'playing') recorder.tune(cfg);
+      if (!cfg.profile) prof = null;
+      else if (!prof) prof = new FrameProfiler();
+      const levels = QualityManager.LEVELS;
+      const pinned = cfg.quality ? levels[Math.min(cfg.quality, levels.length) - 1] : quality.settings;
+      if (pinned !== q || cfg.render_scale * pinned.scale !== scale) setQuality(pinned);
+    }
+
+    // The profiler's data plus the quality level drawn at (1 = full).
+    function profile() {
+      const out = prof.toJSON();
+      out.quality = QualityManager.LEVELS.indexOf(q) + 1;
+      return out;
+    }
+
+    return {
+      cfg, game, applyConfig, loadCourse, start, frame, update, render,
+      get hasCourse() { return course.chunks.has(0); },
+      setInput(bits) { inputBits = bits; },
+      queueJump() { if (state === 'playing') game.jumpQueued = true; },
+      get state() { return state; }
+    };
+  }
+
+  const SalesFlowCore = {
+    createGame, layerContexts, parseCourse, TECHNIQUES, PROSPECT_RHYTHMS, DEFAULT_CONFIG,
+    DESIGN_WIDTH, DESIGN_HEIGHT, CHUNK_RING, LEFT, RIGHT, JUMP
+  };
+  root.SalesFlowCore = SalesFlowCore;
+  if (typeof module === 'object' && module.exports) module.exports = SalesFlowCore;
+})(typeof self !== 'undefined' ? self : globalThis);
@@ -0,0 +1,313 @@
+(() => {
+  const { DESIGN_WIDTH, DESIGN_HEIGHT, CHUNK_RING, LEFT, RIGHT, JUMP } = SalesFlowCore;
+  // Slider values; replaced live by applyConfig() when Python re-renders.
+  const cfg = Object.assign({}, SalesFlowCore.DEFAULT_CONFIG);
+
+  const wrap = document.querySelector('.wrap');
+  const stage = document.getElementById('stage');
+  const canvases = {
+    bg: document.getElementById('bg'),
+    world: document.getElementById('game'),
+    fx: document.getElementById('fx')
+  };
+
+  const hud = document.getElementById('hud');
+  const hudStatsEl = document.getElementById('hudstats');
+  const hudModel = new Hud({
+    score: document.getElementById('score'),
+    mult: document.getElementById('mult'),
+    combo: document.getElementById('combo'),
+    flow: document.getElementById('flowbar'),
+    meta: document.getElementById('meta'),
+    lives: document.getElementById('lives'),
+    stats: hudStatsEl
+  });
+
+  const menu = document.getElementById('menu');
+  const gameover = document.getElementById('gameover');
+  const finalEl = document.getElementById('final');
+  const startBtn = document.getElementById('start');
+  const retryBtn = document.getElementById('retry');
+
+  const pad = document.getElementById('pad');
+  const btnLeft = document.getElementById('btn-left');
+  const btnRight = document.getElementById('btn-right');
+  const btnJump = document.getElementById('btn-jump');
+
+  let state = 'menu';
+
+  function resize() {
+    const w = wrap.clientWidth;
+    const h = wrap.clientHeight;
+    const scale = Math.min(w / DESIGN_WIDTH, h / DESIGN_HEIGHT);
+    stage.style.transform = `translate(-50%, -50%) scale(${scale})`;
+  }
+  window.addEventListener('resize', resize); resize();
+
+  function setState(s) {
+    state = s;
+    if (s === 'menu') {
+      hud.style.display = 'none';
+      pad.style.display = 'none';
+      btnJump.style.display = 'none';
+      menu.style.display = '';
+      gameover.style.display = 'none';
+    } else if (s === 'playing') {
+      hud.style.display = '';
+      pad.style.display = '';
+      btnJump.style.display = '';
+      menu.style.display = 'none';
+      gameover.style.display = 'none';
+    } else if (s === 'gameOver') {
+      hud.style.display = 'none';
+      pad.style.display = 'none';
+      btnJump.style.display = 'none';
+      menu.style.display = 'none';
+      gameover.style.display = '';
+    }
+  }
+
+  const audio = new AudioEngine({ voices: 8 });
+  const tone = (freq, dur, type) => audio.play(freq, dur, type);
+
+  const hudState = { score:0, multiplier:1, combo:0, flow:0, level:1, lives:3, sessionSec:0 };
+  function drawHUD(s) { hudModel.update(s, performance.now()); }
+
+  function showFinal({ score, level, combo }) {
+    finalEl.innerHTML = `
+      <div style="font-size:20px;font-weight:800">${score.toLocaleString()}</div>
+      <div style="color:#cbd5e1">Level: ${level} • Max Combo: ${combo}</div>
+    `;
+  }
+
+  // The game itself runs either here (core + requestAnimationFrame) or, when
+  // cfg.worker is set and the browser can transfer the canvases, in worker.js.
+  // The choice is made on the first start and kept for the page's lifetime:
+  // a transferred canvas cannot come back to the main thread.
+  let core = null, worker = null;
+  const events = {
+    stateChange: setState, sound: tone, gameOver: onGameOver, hud: drawHUD,
+    chunk: needChunks, telemetry: sendTelemetry, profile: showProfile
+  };
+
+  // The component value Python sees. Fields are merged so a chunk request
+  // does not drop a replay the rerun has not picked up yet.
+  const value = {};
+  function submit(patch) {
+    Object.assign(value, patch);
+    Streamlit.setComponentValue(value);
+  }
+
+  function base64(bytes) {
+    let s = '';
+    for (let i = 0; i < bytes.length; i += 0x8000) s += String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000));
+    return btoa(s);
+  }
+
+  // Telemetry batches stay in the value until Python acknowledges them
+  // (args.telemetry_ack), so a batch sent while a rerun is in flight is not
+  // lost; one rerun per batch, never per event. The oldest batches go first
+  // if Python stops acknowledging. Batch and run numbers restart with every
+  // mount of the iframe, so each mount sends under its own random stream id
+  // and only takes acknowledgements for that stream.
+  const MAX_PENDING = 8;
+  let telemetrySeq = 0;
+  value.stream = Array.from(crypto.getRandomValues(new Uint8Array(16)),
+                            b => b.toString(16).padStart(2, '0')).join('');
+  value.telemetry = [];
+  function sendTelemetry(bytes) {
+    value.telemetry.push({ seq: ++telemetrySeq, data: base64(bytes) });
+    if (value.telemetry.length > MAX_PENDING) value.telemetry.shift();
+    submit({});
+  }
+
+  // Every finished run goes to Python as a replay for score verification and
+  // a summary for the leaderboard, with the frame profile when the profiler is on.
+  function onGameOver(v) {
+    showFinal(v);
+    const patch = {
+      replay: base64(v.replay),
+      summary: { score: v.score, level: v.level, combo: v.combo, seed: v.seed, config: v.config }
+    };
+    if (v.profile) { showProfile(v.profile); patch.profile = v.profile; }
+    submit(patch);
+  }
+
+  // Profiler overlay: p50/p95/p99 per phase, refreshed with each profile the
+  // core sends; "Send to Streamlit" offers the full data as a download there.
+  const profileEl = document.getElementById('profile');
+  const profileTable = document.getElementById('profile-table');
+  let lastProfile = null;
+  function showProfile(p) {
+    lastProfile = p;
+    const ms = v => v.toFixed(2).padStart(7);
+    let text = `${'phase'.padEnd(13)}    p50    p95    p99  (ms, ${p.window} frames, quality ${p.quality})`;
+    for (const name in p.phases) {
+      const { p50, p95, p99 } = p.phases[name];
+      text += `\n${name.padEnd(13)}${ms(p50)}${ms(p95)}${ms(p99)}`;
+    }
+    profileTable.textContent = text;
+  }
+  document.getElementById('profile-export').addEventListener('click', () => {
+    if (lastProfile) submit({ profile: lastProfile });
+  });
+
+  // Course chunks arrive with each render from Python, a window at a time.
+  // The shell mirrors which chunks the runner holds for the current seed and
+  // asks for the next window while the ring still has LOOKAHEAD_MIN chunks of
+  // margin. Data received before the runner exists is replayed into it.
+  const LOOKAHEAD_MIN = 4;
+  let courseSeed = null, courseHave = new Set(), courseData = [], lastAsk = null;
+
+  function addCourse(seed, first, count, bytes) {
+    if (seed !== courseSeed) { courseSeed = seed; courseHave = new Set(); courseData = []; }
+    for (let k = first; k < first + count; k++) courseHave.add(k);
+    if (worker) worker.postMessage({ t: 'l', seed, bytes });
+    else if (core) core.loadCourse(seed, bytes);
+    else courseData.push(bytes);
+    startBtn.disabled = retryBtn.disabled = !courseHave.has(0);
+  }
+
+  // The ring moved to `first`; the core has dropped the chunks behind it
+  // apart from the opening ones.
+  function needChunks(first, seed) {
+    if (seed !== courseSeed) return;
+    for (const k of courseHave) if (k >= CHUNK_RING && k < first) courseHave.delete(k);
+    const ask = `${seed}:${first}`;
+    if (courseHave.has(first + CHUNK_RING + LOOKAHEAD_MIN) || lastAsk === ask) return;
+    lastAsk = ask;
+    submit({ need: { seed, chunk: Math.max(0, first) } });
+  }
+
+  function workerSupported() {
+    return typeof Worker !== 'undefined' && typeof OffscreenCanvas !== 'undefined' &&
+           typeof canvases.world.transferControlToOffscreen === 'function';
+  }
+
+  function startWorker() {
+    const w = new Worker('worker.js');
+    const offscreen = {};
+    for (const k in canvases) offscreen[k] = canvases[k].transferControlToOffscreen();
+    w.onmessage = ({ data: m }) => {
+      switch (m.t) {
+        case 'h': {
+          const v = m.v;
+          hudState.score = v[0]; hudState.multiplier = v[1]; hudState.combo = v[2]; hudState.flow = v[3];
+          hudState.level = v[4]; hudState.lives = v[5]; hudState.sessionSec = v[6];
+          drawHUD(hudState);
+          break;
+        }
+        case 'a': tone(m.f, m.d, m.w); break;
+        case 'st': setState(m.s); break;
+        case 'o': onGameOver(m.v); break;
+        case 'ch': needChunks(m.first, m.seed); break;
+        case 'tm': sendTelemetry(m.bytes); break;
+        case 'pf': showProfile(m.v); break;
+      }
+    };
+    w.postMessage({ t: 'init', canvases: offscreen, cfg }, Object.values(offscreen));
+    for (const bytes of courseData) w.postMessage({ t: 'l', seed: courseSeed, bytes });
+    courseData = [];
+    return w;
+  }
+
+  function loop(now) {
+    requestAnimationFrame(loop);
+    core.frame(now);
+  }
+
+  function ensureRunner() {
+    if (core || worker) return;
+    if (cfg.worker && workerSupported()) {
+      worker = startWorker();
+      return;
+    }
+    core = SalesFlowCore.createGame(SalesFlowCore.layerContexts(canvases), events);
+    core.applyConfig(cfg);
+    for (const bytes of courseData) core.loadCourse(courseSeed, bytes);
+    courseData = [];
+    requestAnimationFrame(loop);
+  }
+
+  function startGame() {
+    if (!courseHave.has(0)) return;
+    ensureRunner();
+    // The last run's summary is for the page's game-over view; drop it so
+    // that view does not linger through this run.
+    if (value.summary) { delete value.summary; submit({}); }
+    if (worker) { worker.postMessage({ t: 's' }); sendInput(true); }
+    else core.start();
+  }
+
+  // Input: held keys and pad buttons fold into LEFT/RIGHT/JUMP bits, sent on change.
+  const keys = {};
+  let padState = { left:false, right:false, jump:false };
+  let inputBits = 0;
+  function sendInput(force) {
+    let b = 0;
+    if (keys['ArrowLeft'] || keys['a'] || keys['A'] || padState.left) b |= LEFT;
+    if (keys['ArrowRight'] || keys['d'] || keys['D'] || padState.right) b |= RIGHT;
+    if (padState.jump) b |= JUMP;
+    if (b === inputBits && !force) return;
+    inputBits = b;
+    if (worker) worker.postMessage({ t: 'i', b });
+    else if (core) core.setInput(b);
+  }
+
+  // Keyboard
+  window.addEventListener('keydown', (e) => {
+    keys[e.key] = true; sendInput();
+    if (state!=='playing') return;
+    // Applied on the next simulation tick, so a jump lands on the same step
+    // whatever the display refresh rate.
+    if (e.key===' ' || e.key==='ArrowUp' || e.key.toLowerCase()==='w') {
+      if (worker) worker.postMessage({ t: 'j' });
+      else core.queueJump();
+    }
+  });
+  window.addEventListener('keyup', (e) => { keys[e.key] = false; sendInput(); });
+
+  // Touch pad
+  const touchHold = (el, on, off) => {
+    let down = false;
+    const start = (ev) => { ev.preventDefault(); down = true; on(); sendInput(); };
+    const end = (ev) => { ev.preventDefault(); down = false; off(); sendInput(); };
+    el.addEventListener('touchstart', start, {passive:false});
+    el.addEventListener('touchend', end, {passive:false});
+    el.addEventListener('mousedown', start);
+    el.addEventListener('mouseup', end);
+    el.addEventListener('mouseleave', () => { if (down) { off(); sendInput(); } });
+  };
+  touchHold(btnLeft, ()=>padState.left=true, ()=>padState.left=false);
+  touchHold(btnRight, ()=>padState.right=true, ()=>padState.right=false);
+  touchHold(btnJump, ()=>padState.jump=true, ()=>padState.jump=false);
+
+  // Lives seed
+  drawHUD(hudState);
+
+  // Buttons: enabled once the opening chunk of the course has arrived.
+  startBtn.disabled = retryBtn.disabled = true;
+  startBtn.addEventListener('click', () => startGame());
+  retryBtn.addEventListener('click', () => startGame());
+
+  // Live config from Python: only known numeric keys are taken, the run keeps going.
+  function applyConfig(c) {
+    if (!c) return;
+    for (const k in cfg) if (typeof c[k] === 'number') cfg[k] = c[k];
+    hudStatsEl.style.display = cfg.hud_stats ? '' : 'none';
+    profileEl.style.display = cfg.profile ? '' : 'none';
+    if (worker) worker.postMessage({ t: 'c', cfg });
+    else if (core) core.applyConfig(cfg);
+  }
+  Streamlit.onRender(args => {
+    applyConfig(args.config);
+    if (args.telemetry_stream === value.stream && typeof args.telemetry_ack === 'number')
+      value.telemetry = value.telemetry.filter(b => b.seq > args.telemetry_ack);
+    if (args.course) addCourse(args.course_seed, args.course_first, args.course_count, args.course);
+  });
+  Streamlit.ready();
+  Streamlit.setFrameHeight(document.documentElement.scrollHeight);
+
+  // Kick initial state
+  setState('menu');
+})();
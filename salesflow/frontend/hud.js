@@ -0,0 +1,59 @@
+// HUD model that writes to the DOM only when a displayed value changes.
+// Score, multiplier, combo and lives are written on change; the flow bar and
+// the level/minutes line are low priority and written at most lowPriorityHz
+// times per second. `writesPerSecond` counts DOM writes over the last second.
+(function (root) {
+  class Hud {
+    constructor(els, { lowPriorityHz = 10, maxLives = 3 } = {}) {
+      this.els = els;
+      this.lowPriorityMs = 1000 / lowPriorityHz;
+      this.lastLowPriority = -Infinity;
+      this.shown = {};
+      this.writes = 0;
+      this.writesPerSecond = 0;
+      this.windowStart = 0;
+      // Life dots are created once and toggled, never rebuilt.
+      this.dots = [];
+      for (let i = 0; i < maxLives; i++) {
+        const dot = document.createElement('div');
+        dot.style.cssText = 'width:8px;height:8px;background:#ef4444;border-radius:4px';
+        els.lives.appendChild(dot);
+        this.dots.push(dot);
+      }
+    }
+
+    // Returns true when `value` differs from what is on screen for `key`.
+    changed(key, value) {
+      if (this.shown[key] === value) return false;
+      this.shown[key] = value;
+      this.writes++;
+      return true;
+    }
+
+    update(s, now) {
+      const { els } = this;
+      if (this.changed('score', s.score)) els.score.textContent = s.score.toLocaleString();
+      if (this.changed('mult', s.multiplier)) els.mult.textContent = s.multiplier.toFixed(1);
+      if (this.changed('combo', s.combo)) els.combo.textContent = s.combo;
+      if (this.changed('lives', s.lives)) {
+        this.dots.forEach((dot, i) => { dot.style.display = i < s.lives ? '' : 'none'; });
+      }
+      if (now - this.lastLowPriority >= this.lowPriorityMs) {
+        this.lastLowPriority = now;
+        const pct = Math.round(Math.max(0, Math.min(100, s.flow)));
+        if (this.changed('flow', pct)) els.flow.style.width = pct + '%';
+        const meta = 'L' + s.level + ' • ' + Math.floor(s.sessionSec / 60) + 'm';
+        if (this.changed('meta', meta)) els.meta.textContent = meta;
+      }
+      if (now - this.windowStart >= 1000) {
+        this.writesPerSecond = this.writes;
+        this.writes = 0;
+        this.windowStart = now;
+        if (els.stats) els.stats.textContent = this.writesPerSecond + ' DOM writes/s';
+      }
+    }
+  }
+
+  root.Hud = Hud;
+  if (typeof module === 'object' && module.exports) module.exports = { Hud };
+})(typeof self !== 'undefined' ? self : globalThis);
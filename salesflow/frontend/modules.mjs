@@ -0,0 +1,9 @@
+// ES module entry for SalesFlowGame.jsx and other native-ESM consumers
+// (bundler dev servers, <script type="module">). The frontend files are
+// classic scripts that export through the global object, as the Streamlit
+// component and the worker load them; imported here for that side effect,
+// their classes are re-exported by name.
+import './audio.js';
+import './rhythm.js';
+
+export const { AudioEngine, RhythmTracker } = globalThis;
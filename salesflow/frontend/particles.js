@@ -0,0 +1,89 @@
+// Fixed-capacity particle pool stored as struct-of-arrays typed buffers.
+// Dead particles are recycled by swapping the last live one into their slot,
+// emits past capacity are dropped, and draw() sets the camera transform once.
+// Bursts take their spread from a table of random numbers filled once, so
+// emitting allocates nothing.
+(function (root) {
+  // NOISE_SPAN is not a multiple of 5, so successive bursts walk the table
+  // at shifting offsets instead of repeating.
+  const NOISE = 4101, NOISE_SPAN = NOISE - 4;
+
+  class ParticlePool {
+    constructor(capacity = 1024) {
+      this.capacity = capacity;
+      this.count = 0;
+      this.x = new Float32Array(capacity);
+      this.y = new Float32Array(capacity);
+      this.vx = new Float32Array(capacity);
+      this.vy = new Float32Array(capacity);
+      this.life = new Float32Array(capacity);
+      this.size = new Float32Array(capacity);
+      this.color = new Uint8Array(capacity);
+      this.palette = [];
+      this.paletteIndex = new Map();
+      this.noise = new Float32Array(NOISE);
+      for (let i = 0; i < NOISE; i++) this.noise[i] = Math.random();
+      this.k = 0;
+    }
+
+    colorId(color) {
+      let id = this.paletteIndex.get(color);
+      if (id === undefined) {
+        id = this.palette.length;
+        this.palette.push(color);
+        this.paletteIndex.set(color, id);
+      }
+      return id;
+    }
+
+    emit(x, y, color, n = 10) {
+      const c = this.colorId(color);
+      const end = Math.min(this.capacity, this.count + n), r = this.noise;
+      let k = this.k;
+      for (let i = this.count; i < end; i++) {
+        this.x[i] = x + (r[k] - .5) * 20;
+        this.y[i] = y + (r[k+1] - .5) * 20;
+        this.vx[i] = (r[k+2] - .5) * 6;
+        this.vy[i] = (r[k+3] - .5) * 6 - 2;
+        this.life[i] = 1;
+        this.size[i] = r[k+4] * 3 + 2;
+        this.color[i] = c;
+        k = (k + 5) % NOISE_SPAN;
+      }
+      this.k = k;
+      this.count = end;
+    }
+
+    update() {
+      // Walk backwards so the particle swapped into a dead slot has already
+      // been integrated this frame.
+      for (let i = this.count - 1; i >= 0; i--) {
+        this.x[i] += this.vx[i]; this.y[i] += this.vy[i];
+        this.vy[i] += .18; this.life[i] -= .02;
+        if (this.life[i] > 0) continue;
+        const last = --this.count;
+        this.x[i] = this.x[last]; this.y[i] = this.y[last];
+        this.vx[i] = this.vx[last]; this.vy[i] = this.vy[last];
+        this.life[i] = this.life[last]; this.size[i] = this.size[last];
+        this.color[i] = this.color[last];
+      }
+    }
+
+    draw(ctx, ox, oy) {
+      if (!this.count) return;
+      ctx.save(); ctx.translate(ox, oy);
+      let current = -1;
+      for (let i = 0; i < this.count; i++) {
+        if (this.color[i] !== current) { current = this.color[i]; ctx.fillStyle = this.palette[current]; }
+        ctx.globalAlpha = this.life[i];
+        ctx.beginPath(); ctx.arc(this.x[i], this.y[i], this.size[i], 0, Math.PI * 2); ctx.fill();
+      }
+      ctx.restore();
+    }
+
+    clear() { this.count = 0; }
+  }
+
+  root.ParticlePool = ParticlePool;
+  if (typeof module === 'object' && module.exports) module.exports = { ParticlePool };
+})(typeof self !== 'undefined' ? self : globalThis);
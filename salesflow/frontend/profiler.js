@@ -0,0 +1,86 @@
+// Per-phase frame profiler. The core calls begin() at the top of a frame,
+// lap(phase) as each phase of update()/render() finishes (the time since the
+// previous lap is charged to that phase, so every millisecond of the frame
+// lands somewhere) and end() once the frame is done. Each frame's per-phase
+// totals go into a rolling window of the last WINDOW frames, for p50/p95/p99,
+// and into cumulative log-spaced histograms for export.
+//
+// The core only holds a FrameProfiler while cfg.profile is on; with it off
+// every hook is a single null check.
+(function (root) {
+  const PHASES = ['background', 'physics', 'trail', 'obstacles', 'collectibles',
+                  'prospects', 'player', 'particles', 'hud'];
+  const PHASE = {};
+  PHASES.forEach((name, i) => { PHASE[name.toUpperCase()] = i; });
+  const FRAME = PHASES.length;              // row for whole-frame time
+  const ROWS = PHASES.length + 1;
+  const WINDOW = 600;                       // frames; 10 s at 60 fps
+  const BINS_PER_OCTAVE = 4, OCTAVES = 18;  // 1 µs .. 262 ms
+  const BINS = BINS_PER_OCTAVE * OCTAVES;
+
+  function bin(ms) {
+    if (ms <= .001) return 0;
+    return Math.min(BINS - 1, Math.floor(Math.log2(ms * 1000) * BINS_PER_OCTAVE));
+  }
+
+  class FrameProfiler {
+    constructor(clock = () => performance.now()) {
+      this.clock = clock;
+      this.acc = new Float64Array(ROWS);
+      this.window = new Float32Array(ROWS * WINDOW);
+      this.hist = new Uint32Array(ROWS * BINS);
+      this.scratch = new Float32Array(WINDOW);
+      this.head = 0; this.count = 0; this.frames = 0;
+      this.t0 = 0; this.last = 0;
+    }
+
+    begin() {
+      this.t0 = this.last = this.clock();
+      this.acc.fill(0);
+    }
+
+    lap(phase) {
+      const t = this.clock();
+      this.acc[phase] += t - this.last;
+      this.last = t;
+    }
+
+    end() {
+      this.acc[FRAME] = this.clock() - this.t0;
+      for (let r = 0; r < ROWS; r++) {
+        this.window[r * WINDOW + this.head] = this.acc[r];
+        this.hist[r * BINS + bin(this.acc[r])]++;
+      }
+      this.head = (this.head + 1) % WINDOW;
+      this.count = Math.min(this.count + 1, WINDOW);
+      this.frames++;
+    }
+
+    // [p50, p95, p99] in ms of row `r` over the rolling window.
+    percentiles(r) {
+      const n = this.count, s = this.scratch.subarray(0, n);
+      s.set(this.window.subarray(r * WINDOW, r * WINDOW + n));
+      s.sort();
+      const at = q => (n ? s[Math.min(n - 1, Math.floor(q * n))] : 0);
+      return [at(.5), at(.95), at(.99)];
+    }
+
+    // Everything the overlay shows and Streamlit downloads, as plain JSON.
+    toJSON() {
+      const rows = PHASES.concat('frame');
+      const edges = [0];
+      for (let b = 1; b <= BINS; b++) edges.push(Math.pow(2, b / BINS_PER_OCTAVE) / 1000);
+      const phases = {};
+      rows.forEach((name, r) => {
+        const [p50, p95, p99] = this.percentiles(r);
+        phases[name] = { p50, p95, p99, histogram: Array.from(this.hist.subarray(r * BINS, (r + 1) * BINS)) };
+      });
+      return { frames: this.frames, window: this.count, bin_edges_ms: edges, phases };
+    }
+  }
+
+  FrameProfiler.PHASE = PHASE;
+  FrameProfiler.PHASES = PHASES;
+  root.FrameProfiler = FrameProfiler;
+  if (typeof module === 'object' && module.exports) module.exports = { FrameProfiler };
+})(typeof self !== 'undefined' ? self : globalThis);
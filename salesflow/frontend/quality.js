@@ -0,0 +1,80 @@
+// Adaptive render quality. The core reports each animation frame's timestamp
+// and how long its own update/render work took; QualityManager keeps rolling
+// means of both over WINDOW frames and moves between LEVELS (0 = full
+// quality). It steps down as soon as frames run over budget and steps up only
+// after `hold` frames of clear headroom. A step down soon after a step up
+// doubles that hold (up to MAX_HOLD), so a device on the edge settles on one
+// level instead of flip-flopping. Only drawing changes; the simulation is the
+// same at every level.
+(function (root) {
+  // trail: points kept; particles: share of each burst emitted;
+  // glow: pre-blurred sprites (1) or flat ones (0); scale: backing store.
+  const LEVELS = [
+    { trail: 18, particles: 1,   glow: 1, scale: 1   },
+    { trail: 12, particles: .6,  glow: 1, scale: 1   },
+    { trail: 8,  particles: .4,  glow: 0, scale: .85 },
+    { trail: 4,  particles: .25, glow: 0, scale: .7  },
+    { trail: 0,  particles: .1,  glow: 0, scale: .5  }
+  ];
+  const BUDGET_MS = 1000 / 60;
+  const WINDOW = 30;                 // frames per decision
+  const HOLD = 180, MAX_HOLD = 1440; // frames of headroom before a step up
+  const PAUSE_MS = 100;              // a longer gap (tab hidden, GC pause) restarts the window
+
+  class QualityManager {
+    constructor(budget = BUDGET_MS) {
+      this.budget = budget;
+      this.level = 0;
+      this.hold = HOLD;
+      this.frames = 0; this.upAt = -Infinity;
+      this.intervals = new Float32Array(WINDOW);
+      this.work = new Float32Array(WINDOW);
+      this.clear();
+    }
+
+    get settings() { return LEVELS[this.level]; }
+
+    clear() {
+      this.n = 0; this.head = 0; this.sumI = 0; this.sumW = 0; this.calm = 0;
+      this.last = null;
+    }
+
+    // One animation frame at `now` that took `work` ms of core time.
+    // Returns true when the level changed.
+    sample(now, work) {
+      if (this.last === null) { this.last = now; return false; }
+      const dt = now - this.last;
+      if (dt > PAUSE_MS) { this.clear(); this.last = now; return false; }
+      this.last = now;
+      this.frames++;
+      if (this.n === WINDOW) { this.sumI -= this.intervals[this.head]; this.sumW -= this.work[this.head]; }
+      else this.n++;
+      this.intervals[this.head] = dt; this.work[this.head] = work;
+      this.sumI += dt; this.sumW += work;
+      this.head = (this.head + 1) % WINDOW;
+      if (this.n < WINDOW) return false;
+
+      const interval = this.sumI / WINDOW, busy = this.sumW / WINDOW;
+      if (interval > this.budget * 1.2 || busy > this.budget * .75) {
+        if (this.level === LEVELS.length - 1) return false;
+        this.level++;
+        this.hold = this.frames - this.upAt < MAX_HOLD ? Math.min(this.hold * 2, MAX_HOLD) : HOLD;
+        this.clear();
+        return true;
+      }
+      if (interval < this.budget * 1.05 && busy < this.budget * .4) {
+        if (++this.calm < this.hold || this.level === 0) return false;
+        this.level--;
+        this.upAt = this.frames;
+        this.clear();
+        return true;
+      }
+      this.calm = 0;
+      return false;
+    }
+  }
+
+  QualityManager.LEVELS = LEVELS;
+  root.QualityManager = QualityManager;
+  if (typeof module === 'object' && module.exports) module.exports = { QualityManager };
+})(typeof self !== 'undefined' ? self : globalThis);
@@ -0,0 +1,38 @@
+// Pre-rasterized glow sprites. shadowBlur is the most expensive thing a 2D
+// canvas does, so each glowing shape is blurred once into a small offscreen
+// canvas and then blitted with drawImage every frame.
+(function (root) {
+  function makeCanvas(w, h) {
+    if (typeof OffscreenCanvas !== 'undefined') return new OffscreenCanvas(w, h);
+    const c = document.createElement('canvas');
+    c.width = w; c.height = h;
+    return c;
+  }
+
+  // A sprite is drawn with its shape's anchor at (x - ox, y - oy).
+  function glowCircle(color, r, blur) {
+    const pad = Math.ceil(blur) + 2, size = 2 * (r + pad);
+    const canvas = makeCanvas(size, size);
+    const ctx = canvas.getContext('2d');
+    ctx.shadowBlur = blur; ctx.shadowColor = color; ctx.fillStyle = color;
+    ctx.beginPath(); ctx.arc(size / 2, size / 2, r, 0, Math.PI * 2); ctx.fill();
+    return { canvas, ox: size / 2, oy: size / 2 };
+  }
+
+  function glowRect(fill, glow, blur, w, h) {
+    const pad = Math.ceil(blur) + 2;
+    const canvas = makeCanvas(w + 2 * pad, h + 2 * pad);
+    const ctx = canvas.getContext('2d');
+    ctx.shadowBlur = blur; ctx.shadowColor = glow; ctx.fillStyle = fill;
+    ctx.fillRect(pad, pad, w, h);
+    return { canvas, ox: pad, oy: pad };
+  }
+
+  function blit(ctx, sprite, x, y) {
+    ctx.drawImage(sprite.canvas, x - sprite.ox, y - sprite.oy);
+  }
+
+  const Sprites = { makeCanvas, glowCircle, glowRect, blit };
+  root.Sprites = Sprites;
+  if (typeof module === 'object' && module.exports) module.exports = Sprites;
+})(typeof self !== 'undefined' ? self : globalThis);
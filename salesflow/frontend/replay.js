@@ -0,0 +1,74 @@
+// Input recording for replay verification. Each run logs the input bits of
+// every simulation tick, run-length encoded, with the course seed and the
+// slider values in effect; salesflow/replay.py re-simulates the log and must
+// arrive at the score the game reported. See that module for the byte layout.
+(function (root) {
+  const TUNING_KEYS = ['base_speed', 'gravity', 'jump_force', 'flow_influence', 'max_speed_mult'];
+  const VERSION = 3, HEADER = 32, SEGMENT = 48;
+  const RUN_BITS = 3, MAX_RUN = 256 >> RUN_BITS;
+
+  class ReplayRecorder {
+    constructor() {
+      this.log = new Uint8Array(4096);
+      this.len = 0;
+      this.ticks = 0;
+      this.seed = 0;
+      this.segments = [];
+    }
+
+    start(seed, cfg) {
+      this.seed = seed;
+      this.len = 0; this.ticks = 0; this.segments.length = 0;
+      this.tune(cfg);
+    }
+
+    // Slider values that apply from the next tick on; unchanged values are
+    // not recorded again.
+    tune(cfg) {
+      const last = this.segments[this.segments.length - 1];
+      const values = TUNING_KEYS.map(k => cfg[k]);
+      if (last && values.every((v, i) => v === last.values[i])) return;
+      if (last && last.tick === this.ticks) last.values = values;
+      else this.segments.push({ tick: this.ticks, values });
+    }
+
+    // One byte per run of equal ticks: bits low, run length - 1 high.
+    tick(bits) {
+      this.ticks++;
+      const n = this.len;
+      if (n > 0 && (this.log[n-1] & 7) === bits && (this.log[n-1] >> RUN_BITS) < MAX_RUN - 1) {
+        this.log[n-1] += 1 << RUN_BITS;
+        return;
+      }
+      if (n === this.log.length) {
+        const grown = new Uint8Array(n * 2);
+        grown.set(this.log);
+        this.log = grown;
+      }
+      this.log[this.len++] = bits;
+    }
+
+    // The finished run as one little-endian blob.
+    bytes(score, level) {
+      const segBytes = this.segments.length * SEGMENT;
+      const out = new Uint8Array(HEADER + segBytes + this.len);
+      const dv = new DataView(out.buffer);
+      out.set([83, 70, 82, VERSION]);   // "SFR" + version
+      dv.setUint32(4, this.seed >>> 0, true);
+      dv.setUint32(8, this.ticks, true);
+      dv.setUint32(12, level, true);
+      dv.setUint32(16, this.segments.length, true);
+      dv.setFloat64(HEADER - 8, score, true);
+      this.segments.forEach((s, i) => {
+        const off = HEADER + i * SEGMENT;
+        dv.setUint32(off, s.tick, true);
+        s.values.forEach((v, j) => dv.setFloat64(off + 8 + j * 8, v, true));
+      });
+      out.set(this.log.subarray(0, this.len), HEADER + segBytes);
+      return out;
+    }
+  }
+
+  root.ReplayRecorder = ReplayRecorder;
+  if (typeof module === 'object' && module.exports) module.exports = { ReplayRecorder };
+})(typeof self !== 'undefined' ? self : globalThis);
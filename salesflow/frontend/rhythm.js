@@ -0,0 +1,49 @@
+// Prospect rhythms as incremental matchers. Each rhythm is an ordered list of
+// technique ids ending in CLOSE, compiled into a state machine whose state is
+// how many of its steps the pickups since the last reset have played in order
+// (other techniques in between are skipped over). Every pickup advances all
+// machines once; the techniques themselves go into a ring of the last
+// `capacity`, with a running count of CLOSEs in it. A prospect check is then
+// O(1) however long the player goes without closing, and nothing allocates.
+(function (root) {
+  const SEQ_MAX = 8;
+
+  class RhythmTracker {
+    // rhythms[type]: that prospect type's technique ids in order.
+    constructor(rhythms, close, capacity = SEQ_MAX) {
+      this.steps = rhythms.map(r => Uint8Array.from(r));
+      this.close = close;
+      this.state = new Uint8Array(rhythms.length);
+      this.ring = new Uint8Array(capacity);
+      this.capacity = capacity;
+      this.reset();
+    }
+
+    reset() {
+      this.head = 0; this.length = 0; this.closes = 0;
+      this.state.fill(0);
+    }
+
+    push(t) {
+      if (this.length < this.capacity) this.length++;
+      else if (this.ring[this.head] === this.close) this.closes--;
+      this.ring[this.head] = t;
+      this.head = (this.head + 1) % this.capacity;
+      if (t === this.close) this.closes++;
+      for (let p = 0; p < this.steps.length; p++) {
+        const s = this.steps[p], k = this.state[p];
+        if (k < s.length && s[k] === t) this.state[p] = k + 1;
+      }
+    }
+
+    // A prospect can be closed while a CLOSE is among the recent techniques.
+    ready() { return this.closes > 0; }
+
+    // Were all of prospect type p's techniques played in its order?
+    inOrder(p) { return this.state[p] === this.steps[p].length; }
+  }
+
+  RhythmTracker.SEQ_MAX = SEQ_MAX;
+  root.RhythmTracker = RhythmTracker;
+  if (typeof module === 'object' && module.exports) module.exports = { RhythmTracker };
+})(typeof self !== 'undefined' ? self : globalThis);
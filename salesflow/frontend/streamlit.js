@@ -0,0 +1,14 @@
+// Minimal Streamlit component bridge (the postMessage protocol that
+// streamlit-component-lib wraps), so the game needs no build step.
+const Streamlit = (() => {
+  const send = (type, data) =>
+    window.parent.postMessage(Object.assign({ isStreamlitMessage: true, type }, data), '*');
+  return {
+    ready: () => send('streamlit:componentReady', { apiVersion: 1 }),
+    setFrameHeight: (height) => send('streamlit:setFrameHeight', { height }),
+    setComponentValue: (value) => send('streamlit:setComponentValue', { value, dataType: 'json' }),
+    onRender: (fn) => window.addEventListener('message', (e) => {
+      if (e.data && e.data.type === 'streamlit:render') fn(e.data.args || {});
+    })
+  };
+})();
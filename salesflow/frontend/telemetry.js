@@ -0,0 +1,50 @@
+// Gameplay telemetry: pickups, hits, closes, level changes and run
+// boundaries, written into one preallocated Float64Array of fixed-width rows
+// (run, tick, kind, a, b, x) so logging an event never allocates. The buffer
+// is handed off as a packed batch when it fills or FLUSH_MS after its first
+// event; salesflow/telemetry.py appends batches to the local store.
+(function (root) {
+  const KIND = { PICKUP: 0, HIT: 1, CLOSE: 2, LEVEL: 3, START: 4, END: 5 };
+  const ROW = 6, FLUSH_MS = 5000;
+
+  class TelemetryBuffer {
+    constructor(capacity = 256) {
+      this.rows = new Float64Array(capacity * ROW);
+      this.capacity = capacity;
+      this.n = 0;
+      this.since = null;
+      this.run = 0;
+      this.tick = 0;
+    }
+
+    // Row fields: pickup (technique, beat accuracy), hit (lives left, flow),
+    // close (prospect type, bonus), level (new level, score),
+    // start (course seed, 0), end (level, score).
+    push(kind, a, b, x) {
+      const o = this.n * ROW, r = this.rows;
+      r[o] = this.run; r[o+1] = this.tick; r[o+2] = kind; r[o+3] = a; r[o+4] = b; r[o+5] = x;
+      this.n++;
+    }
+
+    full() { return this.n === this.capacity; }
+
+    // Time-based flush check, once per animation frame.
+    due(now) {
+      if (this.n === 0) return false;
+      if (this.since === null) this.since = now;
+      return now - this.since >= FLUSH_MS;
+    }
+
+    // The pending rows as little-endian bytes, or null; empties the buffer.
+    flush() {
+      if (this.n === 0) return null;
+      const out = new Uint8Array(this.rows.buffer.slice(0, this.n * ROW * 8));
+      this.n = 0; this.since = null;
+      return out;
+    }
+  }
+
+  TelemetryBuffer.KIND = KIND;
+  root.TelemetryBuffer = TelemetryBuffer;
+  if (typeof module === 'object' && module.exports) module.exports = { TelemetryBuffer };
+})(typeof self !== 'undefined' ? self : globalThis);
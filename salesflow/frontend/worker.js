@@ -0,0 +1,57 @@
+// Worker mode: game.js transfers the stage's layer canvases here and the
+// whole frame loop (simulation and drawing) runs off the main thread, away
+// from Streamlit's websocket and DOM work.
+//
+// Messages are small arrays-of-numbers objects tagged by `t`:
+//   main → worker  {t:'init', canvases:{bg, world, fx}, cfg}
+//                  {t:'c', cfg}             {t:'s'} start
+//                  {t:'i', b} input bits    {t:'j'} queued jump
+//                  {t:'l', seed, bytes} packed course chunks
+//   worker → main  {t:'st', s} state        {t:'h', v:[score, mult, combo, flow, level, lives, sec]}
+//                  {t:'a', f, d, w} sound   {t:'o', v:{score, level, combo, seed, config, replay, profile}}
+//                                           game over
+//                  {t:'ch', first, seed} chunk ring moved to `first`
+//                  {t:'tm', bytes} telemetry batch (buffer transferred)
+//                  {t:'pf', v} frame profile (cfg.profile, twice a second)
+importScripts('particles.js', 'render.js', 'replay.js', 'telemetry.js', 'profiler.js', 'rhythm.js', 'quality.js', 'core.js');
+
+const raf = self.requestAnimationFrame
+  ? cb => self.requestAnimationFrame(cb)
+  : cb => setTimeout(() => cb(performance.now()), 1000 / 60);
+
+let core = null;
+const hud = [0, 1, 0, 0, 1, 3, 0];
+
+const events = {
+  stateChange: s => postMessage({ t: 'st', s }),
+  sound: (f, d, w) => postMessage({ t: 'a', f, d, w }),
+  gameOver: v => postMessage({ t: 'o', v }),
+  chunk: (first, seed) => postMessage({ t: 'ch', first, seed }),
+  telemetry: bytes => postMessage({ t: 'tm', bytes }, [bytes.buffer]),
+  profile: v => postMessage({ t: 'pf', v }),
+  hud: s => {
+    hud[0] = s.score; hud[1] = s.multiplier; hud[2] = s.combo; hud[3] = s.flow;
+    hud[4] = s.level; hud[5] = s.lives; hud[6] = s.sessionSec;
+    postMessage({ t: 'h', v: hud });
+  }
+};
+
+function loop(now) {
+  raf(loop);
+  core.frame(now);
+}
+
+onmessage = ({ data: m }) => {
+  switch (m.t) {
+    case 'i': core.setInput(m.b); break;
+    case 'j': core.queueJump(); break;
+    case 'c': core.applyConfig(m.cfg); break;
+    case 'l': core.loadCourse(m.seed, m.bytes); break;
+    case 's': core.start(); break;
+    case 'init':
+      core = SalesFlowCore.createGame(SalesFlowCore.layerContexts(m.canvases), events);
+      core.applyConfig(m.cfg);
+      raf(loop);
+      break;
+  }
+};
@@ -0,0 +1,140 @@
+"""Cohort leaderboard of finished runs, in SQLite.
+
+At game over the component value carries a run summary (score, level, best
+combo, course seed, slider values) next to the run's replay.  A cohort is a
+course seed: everyone on it plays the same course.  Entries are keyed by the
+replay's content hash, so a summary that lingers in the value across reruns
+is recorded once and every entry can be checked with ``python -m salesflow
+verify``.
+
+Sessions never wait on the database to record a run: :meth:`Store.submit`
+queues the entry and one writer thread commits whatever has queued up in a
+single transaction, in WAL mode with ``synchronous=NORMAL``.  A classroom
+finishing at once costs a handful of commits instead of hundreds of
+sessions contending for the write lock.  :meth:`Store.top` serves each
+cohort's top K from an index on ``(cohort, score)`` through a cache of
+``ttl`` seconds; when an entry expires one session re-reads it, on a reader
+connection WAL never blocks, while the others keep getting the old one.
+"""
+
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from . import constants as C
+
+DB_PATH = Path(os.environ.get("SALESFLOW_LEADERBOARD", "leaderboard.sqlite"))
+TTL = 5.0
+ENTRY = ("trainee", "score", "level", "combo", "finished")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run      TEXT    PRIMARY KEY,
+    cohort   INTEGER NOT NULL,
+    trainee  TEXT    NOT NULL,
+    score    REAL    NOT NULL,
+    level    INTEGER NOT NULL,
+    combo    INTEGER NOT NULL,
+    config   TEXT    NOT NULL,
+    finished REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_top ON runs (cohort, score DESC);
+"""
+
+
+class Store:
+    """The leaderboard database; safe to share across session threads."""
+
+    def __init__(self, path=DB_PATH, ttl=TTL):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.queue = queue.Queue()
+        self.errors = 0
+        self._reader = sqlite3.connect(self.path, check_same_thread=False)
+        self._refresh = threading.Lock()
+        self._cache = {}
+        self._writer = threading.Thread(target=self._write, name="leaderboard-writer", daemon=True)
+        self._writer.start()
+
+    def submit(self, run, summary, trainee=""):
+        """Queue one finished run; returns at once.  ``summary`` is the game's
+        ``{score, level, combo, seed, config}``; ``run`` its replay hash.
+        """
+        sliders = summary.get("config") or {}
+        config = {k: float(sliders[k]) for k in C.SLIDERS if k in sliders}
+        self.queue.put((run, int(summary["seed"]), trainee, float(summary["score"]),
+                        int(summary["level"]), int(summary["combo"]), json.dumps(config),
+                        time.time()))
+
+    def _write(self):
+        while True:
+            batch = [self.queue.get()]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [row for row in batch if row is not None]
+            try:
+                with self.conn:
+                    self.conn.executemany(
+                        "INSERT OR IGNORE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            except sqlite3.Error:
+                self.errors += len(rows)
+            for _ in batch:
+                self.queue.task_done()
+            if len(rows) < len(batch):
+                return
+
+    def flush(self):
+        """Wait until every submitted run is committed."""
+        self.queue.join()
+
+    def top(self, cohort, k=10):
+        """The ``k`` best runs of ``cohort`` as dicts of ``ENTRY`` fields,
+        possibly up to ``ttl`` seconds old."""
+        cohort, k, now = int(cohort), int(k), time.monotonic()
+        hit = self._cache.get((cohort, k))
+        if hit and hit[0] > now:
+            return hit[1]
+        if not self._refresh.acquire(blocking=hit is None):
+            return hit[1]
+        try:
+            hit = self._cache.get((cohort, k))
+            if hit and hit[0] > time.monotonic():
+                return hit[1]
+            rows = self._reader.execute(
+                f"SELECT {', '.join(ENTRY)} FROM runs WHERE cohort = ? ORDER BY score DESC LIMIT ?",
+                (cohort, k)).fetchall()
+            entries = [dict(zip(ENTRY, row)) for row in rows]
+            self._cache[cohort, k] = (time.monotonic() + self.ttl, entries)
+            return entries
+        finally:
+            self._refresh.release()
+
+    def close(self):
+        if self._writer.is_alive():
+            self.queue.put(None)
+            self._writer.join()
+        self.conn.close()
+        self._reader.close()
+
+
+@lru_cache(maxsize=None)
+def store(path=DB_PATH):
+    """The process-wide :class:`Store` for ``path``; pending runs are
+    committed at interpreter exit."""
+    s = Store(path)
+    atexit.register(s.close)
+    return s
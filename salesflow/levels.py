@@ -0,0 +1,173 @@
+"""Seeded course generation shared by the browser game and the headless engine.
+
+The course is one endless strip cut into chunks ``C.CHUNK_W`` pixels wide;
+chunk ``k`` covers ``k * CHUNK_W <= x < (k + 1) * CHUNK_W``.  A chunk is fully
+determined by the course seed and ``k``: every trainee on the same seed, every
+replay and every simulated run sees the same chunk.  Geometry follows the
+formulas the game always used, extended past any one level; the seed and the
+level the chunk starts in pick the technique on each collectible and the type
+of each prospect.  Levels no longer rebuild anything, they only change the
+parameters the next chunks are rolled with.
+
+Each chunk holds at most ``C.CHUNK_OBSTACLES`` / ``CHUNK_COLLECTIBLES`` /
+``CHUNK_PROSPECTS`` entities (the rightmost extras of a rare cluster are
+dropped), so the game can keep a fixed ring of ``C.CHUNK_RING`` preallocated
+chunk slots and recycle them behind the camera.
+
+Chunks travel to the browser as packed little-endian arrays (see :func:`pack`),
+which ``core.js`` copies into its ring slots.  One chunk block is::
+
+    uint32[6]   chunk index, level, n_obstacles, n_collectibles, n_prospects, 0
+    float32[]   obstacle x, y, w, h, phase        (n_obstacles each, sorted by x)
+    float32[]   collectible x, y, phase           (n_collectibles each, sorted by x)
+    float32[]   prospect x, y                     (n_prospects each)
+    uint8[]     collectible technique ids, prospect type ids
+    padding     to a multiple of 4 bytes
+
+and a course window is chunk blocks back to back.
+"""
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from . import constants as C
+
+OBSTACLE_W = 20
+PROSPECT_Y = 300
+PROSPECT_SPACING = 500
+PROSPECT_REACH = 60   # a prospect closes within this many px of the player
+
+_BEATS = np.array(C.TECHNIQUE_BEATS)
+
+
+def level_at(x):
+    """The level a player is on at ``x``: level ``L`` runs up to ``C.level_end_x(L)``."""
+    return max(1, math.ceil((x - C.level_end_x(0)) / (C.level_end_x(1) - C.level_end_x(0))))
+
+
+def _span(k, start, lo_step, hi_step):
+    # Formula entities sit at start + i * step with step in [lo_step, hi_step];
+    # return every i that can land in chunk k.
+    lo, hi = k * C.CHUNK_W, (k + 1) * C.CHUNK_W
+    first = max(0, math.floor((lo - start) / hi_step))
+    last = max(0, math.ceil((hi - start) / lo_step))
+    return np.arange(first, last + 1, dtype=float), lo, hi
+
+
+def _select(x, lo, hi, cap):
+    # Indices of the entities inside [lo, hi), by x, keeping at most `cap`.
+    inside = np.flatnonzero((x >= lo) & (x < hi))
+    return inside[np.argsort(x[inside], kind="stable")][:cap]
+
+
+@lru_cache(maxsize=1024)
+def obstacles(k):
+    """``(5, n)`` float32 x, y, w, h, phase of chunk ``k``; the same on every course."""
+    i, lo, hi = _span(k, 500, 100, 180)
+    x = (500 + i * (140 + np.sin(i * 0.3) * 40)).astype(np.float32)
+    keep = _select(x, lo, hi, C.CHUNK_OBSTACLES)
+    i = i[keep]
+    out = np.stack([
+        x[keep],
+        360 + np.sin(i * 0.4) * 100,
+        np.full(i.size, OBSTACLE_W),
+        50 + np.sin(i * 0.5) * 30,
+        i * 0.2,
+    ]).astype(np.float32)
+    out.flags.writeable = False
+    return out
+
+
+@dataclass(frozen=True)
+class Chunk:
+    seed: int
+    index: int
+    level: int
+    obstacles: np.ndarray       # (5, n) float32: x, y, w, h, phase
+    collectibles: np.ndarray    # (3, n) float32: x, y, phase
+    techniques: np.ndarray      # (n,) uint8, index into C.TECHNIQUES
+    prospects: np.ndarray       # (2, n) float32: x, y
+    prospect_types: np.ndarray  # (n,) uint8, index into C.PROSPECT_TYPES
+
+    def to_bytes(self):
+        header = np.array([self.index, self.level, self.obstacles.shape[1], self.techniques.size,
+                           self.prospect_types.size, 0], dtype="<u4")
+        parts = [header, self.obstacles, self.collectibles, self.prospects,
+                 self.techniques, self.prospect_types]
+        blob = b"".join(np.ascontiguousarray(p, dtype=p.dtype.newbyteorder("<")).tobytes()
+                        for p in parts)
+        return blob + bytes(-len(blob) % 4)
+
+
+@lru_cache(maxsize=8192)
+def chunk(seed, k):
+    """Chunk ``k`` of course ``seed``; cached, and its arrays are read-only."""
+    level = level_at(k * C.CHUNK_W)
+    rng = np.random.default_rng([seed, level, k])
+
+    i, lo, hi = _span(k, 400, 60, 120)
+    cx = (400 + i * (90 + np.sin(i * 0.6) * 30)).astype(np.float32)
+    keep = _select(cx, lo, hi, C.CHUNK_COLLECTIBLES)
+    i = i[keep]
+    tech = rng.integers(0, len(C.TECHNIQUES), size=i.size).astype(np.uint8)
+    cy = 220 + np.sin(i * 0.8 + _BEATS[tech]) * 140
+    collectibles = np.stack([cx[keep], cy, i * 0.3]).astype(np.float32)
+
+    i, lo, hi = _span(k, 900, PROSPECT_SPACING, PROSPECT_SPACING)
+    px = (900 + i * PROSPECT_SPACING).astype(np.float32)
+    keep = _select(px, lo, hi, C.CHUNK_PROSPECTS)
+    prospects = np.stack([px[keep], np.full(keep.size, PROSPECT_Y)]).astype(np.float32)
+    types = rng.integers(0, len(C.PROSPECT_TYPES), size=keep.size).astype(np.uint8)
+
+    out = Chunk(seed, k, level, obstacles(k), collectibles, tech, prospects, types)
+    for v in (collectibles, tech, prospects, types):
+        v.flags.writeable = False
+    return out
+
+
+def prospects_reached(seed, x):
+    """Prospects of course ``seed`` a player at ``x`` has come within closing
+    range of, counted per type (index into ``C.PROSPECT_TYPES``).
+    """
+    reach = x + PROSPECT_REACH
+    counts = np.zeros(len(C.PROSPECT_TYPES), dtype=np.int64)
+    for k in range(max(0, math.floor(reach / C.CHUNK_W)) + 1):
+        c = chunk(seed, k)
+        counts += np.bincount(c.prospect_types[c.prospects[0] <= reach],
+                              minlength=counts.size)
+    return counts
+
+
+def pack(chunks):
+    """Concatenated chunk blocks, ready to hand to the component as bytes."""
+    return b"".join(c.to_bytes() for c in chunks)
+
+
+def course(seed, first=0, count=16):
+    """Packed chunks ``first`` .. ``first + count - 1`` of course ``seed``."""
+    return pack(chunk(seed, k) for k in range(first, first + count))
+
+
+def unpack(data, seed=None):
+    """Inverse of :func:`pack`: a list of :class:`Chunk`."""
+    chunks, off = [], 0
+    while off < len(data):
+        index, level, n_obs, n_col, n_pro, _ = np.frombuffer(data, "<u4", 6, off)
+        off += 24
+
+        def take(dtype, count):
+            nonlocal off
+            v = np.frombuffer(data, dtype, count, off)
+            off += v.nbytes
+            return v
+
+        obs = take("<f4", 5 * n_obs).reshape(5, n_obs)
+        collectibles = take("<f4", 3 * n_col).reshape(3, n_col)
+        prospects = take("<f4", 2 * n_pro).reshape(2, n_pro)
+        tech, types = take("u1", n_col), take("u1", n_pro)
+        off += -off % 4
+        chunks.append(Chunk(seed, int(index), int(level), obs, collectibles, tech, prospects, types))
+    return chunks
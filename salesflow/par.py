@@ -0,0 +1,270 @@
+"""Par scores: what a skilled player makes of one course and slider setting.
+
+An autoplayer searches the input space with :class:`~salesflow.engine.Simulation`
+instead of sampling it like :mod:`salesflow.sweep`.  Every ``interval`` ticks
+each run in a beam of ``beam`` runs branches into one child per action
+(:data:`ACTIONS`, each combination of strafe and jump).  All children step
+together as one vectorized simulation.  The best children by score, spare
+lives and progress carry on, after dropping children whose state duplicates
+another's.  A run freezes when it clears ``levels`` levels (or loses its last
+life), and the search ends when every run in the beam is frozen.
+
+The best run's inputs are replayed to split its score and lost lives by
+level: that is the par.  Searches on several decision grids (:data:`INTERVALS`)
+run across a process pool and the best one wins.  Results are memoized on disk
+next to the sweeps, per course seed, tuning and search setting.
+"""
+
+import atexit
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+
+from . import constants as C
+from .engine import JUMP, LEFT, RIGHT, Simulation, Tuning
+from .sweep import CACHE_DIR, ENGINE_VERSION
+
+# Held strafe for the whole interval; JUMP only on its first tick, a tap.
+ACTIONS = np.array([0, JUMP, LEFT, LEFT | JUMP, RIGHT, RIGHT | JUMP], dtype=np.uint8)
+INTERVALS = (4, 6, 8)
+BEAM = 48
+LEVELS = 5
+# What a spare life and a pixel of progress are worth to the search, in points.
+LIFE_VALUE = 600.0
+PX_VALUE = 0.05
+
+
+@dataclass
+class Par:
+    seed: int
+    tuning: dict
+    levels: list = field(default_factory=list)   # per cleared level: score, lives_lost, frames
+    target: int = LEVELS                         # levels the search tried to clear
+    inputs: list = field(default_factory=list)   # per-tick input bits of the par run
+
+    @property
+    def reachable(self):
+        """Whether the autoplayer cleared every target level."""
+        return len(self.levels) >= self.target
+
+    @property
+    def score(self):
+        return sum(lv["score"] for lv in self.levels)
+
+    @property
+    def lives_lost(self):
+        return sum(lv["lives_lost"] for lv in self.levels)
+
+    def score_through(self, level):
+        """Par score at the end of ``level`` (capped at the levels searched)."""
+        return sum(lv["score"] for lv in self.levels[:max(1, level)])
+
+    def percent(self, score, level=None):
+        """``score`` as a percentage of par, for a run that reached ``level``
+        (default: all searched levels)."""
+        par = self.score_through(level or self.target)
+        return 100.0 * score / par if par > 0 else 0.0
+
+    def to_json(self):
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, text):
+        return cls(**json.loads(text))
+
+
+def _value(sim):
+    # Out of lives ranks below every run still in the game.
+    value = sim.score + LIFE_VALUE * sim.lives + PX_VALUE * sim.x
+    return np.where(sim.lives > 0, value, value - 1e9)
+
+
+def _freeze(sim, levels):
+    # A frozen run no longer steps; one that cleared the target is kept as is.
+    sim.alive &= sim.level <= levels
+
+
+def _distinct(sim, rows):
+    """``rows`` minus any whose state matches an earlier one's."""
+    key = np.stack([sim.x[rows], sim.y[rows], sim.vx[rows], sim.vy[rows],
+                    sim.score[rows], sim.lives[rows]], axis=1)
+    _, first = np.unique(np.round(key, 3), axis=0, return_index=True)
+    return rows[np.sort(first)]
+
+
+def _search(job):
+    seed, tuning, levels, beam, interval, max_frames = job
+    sim = Simulation(tuning, 1, course=seed)
+    parents, actions = [], []
+    n_act = ACTIONS.size
+    for _ in range(0, max_frames, interval):
+        if not sim.alive.any():
+            break
+        rows = np.repeat(np.arange(sim.n), n_act)
+        act = np.tile(ACTIONS, sim.n)
+        sim = sim.take(rows)
+        for t in range(interval):
+            sim.step(act if t == 0 else act & (LEFT | RIGHT))
+            _freeze(sim, levels)
+        keep = _distinct(sim, np.argsort(-_value(sim), kind="stable"))[:beam]
+        parents.append(rows[keep])
+        actions.append(act[keep])
+        sim = sim.take(keep)
+    # Walk the best run's lineage back to its per-tick inputs.
+    best = int(np.argmax(_value(sim)))
+    picked = []
+    for par_rows, act in zip(reversed(parents), reversed(actions)):
+        picked.append(int(act[best]))
+        best = int(par_rows[best])
+    inputs = []
+    for a in reversed(picked):
+        inputs += [a] + [a & (LEFT | RIGHT)] * (interval - 1)
+    return _replay(seed, tuning, levels, inputs)
+
+
+def _replay(seed, tuning, levels, inputs):
+    """Play ``inputs`` on one run and cut the :class:`Par` record by level."""
+    sim = Simulation(tuning, 1, course=seed)
+    out, score, lives, start, played = [], 0.0, C.START_LIVES, 0, 0
+    for tick, bits in enumerate(inputs):
+        if not sim.alive[0]:
+            break
+        played = tick + 1
+        level = int(sim.level[0])
+        sim.step(np.array([bits], dtype=np.uint8))
+        _freeze(sim, levels)
+        if sim.level[0] > level:
+            out.append({"level": level, "score": float(sim.score[0]) - score,
+                        "lives_lost": lives - int(sim.lives[0]), "frames": tick + 1 - start})
+            score, lives, start = float(sim.score[0]), int(sim.lives[0]), tick + 1
+    return Par(int(seed), tuning.as_dict(), out, levels, inputs[:played])
+
+
+def _better(a, b):
+    key = lambda p: (len(p.levels), p.score - LIFE_VALUE * p.lives_lost)
+    return a if key(a) >= key(b) else b
+
+
+def _cache_key(seed, tuning, levels, beam, intervals, max_frames):
+    blob = json.dumps([ENGINE_VERSION, int(seed), {k: round(v, 6) for k, v in tuning.as_dict().items()},
+                       levels, beam, list(intervals), max_frames])
+    return hashlib.sha1(blob.encode()).hexdigest()[:16]
+
+
+def _path(seed, tuning, *search):
+    return CACHE_DIR / f"par-{_cache_key(seed, tuning, *search)}.json"
+
+
+def par_many(cases, levels=LEVELS, beam=BEAM, intervals=INTERVALS, max_frames=60 * 300,
+             workers=None, cache=True, progress=None):
+    """:class:`Par` for each ``(course seed, Tuning)`` in ``cases``, in order.
+
+    Every search (one per case and interval) is a job for the process pool;
+    ``progress`` is called with the fraction done after each.
+    """
+    cases = [(int(seed), tuning) for seed, tuning in cases]
+    paths = [_path(s, t, levels, beam, intervals, max_frames) for s, t in cases]
+    results = [Par.from_json(p.read_text()) if cache and p.exists() else None for p in paths]
+    todo = [i for i, r in enumerate(results) if r is None]
+    owners = [i for i in todo for _ in intervals]
+    jobs = [(*cases[i], levels, beam, interval, max_frames) for i in todo for interval in intervals]
+    if jobs:
+        # One worker searches in this process: no pool to start, and it can
+        # run inside another pool's worker.
+        pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count()) if workers != 1 else None
+        try:
+            found_all = pool.map(_search, jobs) if pool else map(_search, jobs)
+            for n, (i, found) in enumerate(zip(owners, found_all), 1):
+                results[i] = found if results[i] is None else _better(results[i], found)
+                if progress:
+                    progress(n / len(jobs))
+        finally:
+            if pool:
+                pool.shutdown()
+        if cache:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            for i in todo:
+                paths[i].write_text(results[i].to_json())
+    return results
+
+
+def par(seed, tuning=None, **kwargs):
+    """:class:`Par` of one course seed and tuning; see :func:`par_many`."""
+    return par_many([(seed, tuning or Tuning())], **kwargs)[0]
+
+
+def unreachable(tunings, seeds, **kwargs):
+    """Tunings whose par is unreachable on any of ``seeds``: the ones to reject."""
+    cases = [(s, t) for t in tunings for s in seeds]
+    found = par_many(cases, **kwargs)
+    return [t for i, t in enumerate(tunings)
+            if not all(p.reachable for p in found[i * len(seeds):(i + 1) * len(seeds)])]
+
+
+# Searches queued by prefetch() and not collected yet, oldest first, with
+# who asked for each.  Past MAX_PENDING the oldest are cancelled and dropped.
+MAX_PENDING = 16
+_background = None
+_pending = {}
+_lock = threading.Lock()
+
+
+def _stop_background():
+    # Queued searches would otherwise hold up interpreter exit until they ran;
+    # only those already handed to the worker are waited for.
+    if _background is not None:
+        _background.shutdown(wait=False, cancel_futures=True)
+
+
+def prefetch(seed, tuning, owner=None, **kwargs):
+    """The :class:`Par` of ``seed`` and ``tuning`` if it is known, else ``None``.
+
+    For servers: an unknown par is queued on one background process shared
+    by every caller and searched there with one worker, so calling this on
+    every rerun costs a dict lookup or a cached file read.  A new search
+    cancels the ones ``owner`` (a session id; by default the course seed)
+    queued before that have not started, so dragging a slider queues one
+    search, not one per value.  Keyword arguments are the search settings
+    of :func:`par_many`.
+    """
+    global _background
+    search = (kwargs.get("levels", LEVELS), kwargs.get("beam", BEAM),
+              tuple(kwargs.get("intervals", INTERVALS)), kwargs.get("max_frames", 60 * 300))
+    key = (int(seed), tuning, *search)
+    owner = int(seed) if owner is None else owner
+    with _lock:
+        future, _ = _pending.get(key, (None, None))
+        if future is not None:
+            if not future.done():
+                return None
+            del _pending[key]
+            if not future.cancelled() and future.exception() is None:
+                return future.result()
+        path = _path(*key)
+        if path.exists():
+            return Par.from_json(path.read_text())
+        if future is not None:
+            return None
+        for old, (f, who) in list(_pending.items()):
+            if who == owner and f.cancel():
+                del _pending[old]
+        while len(_pending) >= MAX_PENDING:
+            _pending.pop(next(iter(_pending)))[0].cancel()
+        if _background is None:
+            # Spawned, not forked: a forked worker would inherit the exit
+            # hooks below and run them against this process's pool.
+            _background = ProcessPoolExecutor(max_workers=1,
+                                              mp_context=multiprocessing.get_context("spawn"))
+            atexit.register(_stop_background)
+            # concurrent.futures joins its pools from a threading exit hook,
+            # which runs before atexit's; cancel the queue ahead of that join.
+            threading._register_atexit(_stop_background)
+        _pending[key] = (_background.submit(par, int(seed), tuning, **{**kwargs, "workers": 1}),
+                         owner)
+        return None
@@ -0,0 +1,200 @@
+"""Recorded runs and their headless verification.
+
+The browser records every run it plays: the input bits of each simulation
+tick, the course seed and the slider values, with the score it reported at
+game over.  Re-simulating the inputs with :class:`~salesflow.engine.Simulation`
+must reproduce that score exactly, so a replay that does not is a tampered
+(or broken) leaderboard entry.
+
+A replay is one little-endian blob, written by ``core.js``::
+
+    char[4]     b"SFR" + format version, bumped with the scoring rules so
+                runs played under older rules are rejected, not failed
+    uint32      course seed, ticks, level reached, tuning segments, 0
+    float64     reported score
+    segments    uint32 first tick, uint32 0, float64[5] slider values
+                (PARAMS order); a live slider change mid-run starts a new one
+    uint8[]     input log, one byte per run of identical ticks:
+                LEFT/RIGHT/JUMP bits in the low 3, run length - 1 in the high 5
+
+Verification batches many replays into one vectorized simulation (rows carry
+their own course and tuning) and spreads batches over a process pool, like
+:mod:`salesflow.sweep`.
+"""
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from . import constants as C
+from .engine import Simulation, Tuning
+
+PARAMS = tuple(C.SLIDERS)
+MAGIC = b"SFR\x03"
+HEADER = np.dtype([("magic", "S4"), ("seed", "<u4"), ("ticks", "<u4"), ("level", "<u4"),
+                   ("segments", "<u4"), ("pad", "<u4"), ("score", "<f8")])
+SEGMENT = np.dtype([("tick", "<u4"), ("pad", "<u4"), ("tuning", "<f8", len(PARAMS))])
+RUN_BITS = 3
+MAX_RUN = 256 >> RUN_BITS
+BATCH = 256
+REPLAY_DIR = Path(os.environ.get("SALESFLOW_REPLAYS", "replays"))
+
+
+def encode_inputs(bits):
+    """Run-length encode per-tick input bits into the log format above."""
+    bits = np.asarray(bits, dtype=np.uint8)
+    if bits.size == 0:
+        return b""
+    starts = np.flatnonzero(np.r_[True, bits[1:] != bits[:-1]])
+    lengths = np.diff(np.r_[starts, bits.size])
+    # Runs longer than MAX_RUN ticks split into full bytes plus a remainder.
+    pieces = -(-lengths // MAX_RUN)
+    runs = np.full(pieces.sum(), MAX_RUN)
+    runs[np.cumsum(pieces) - 1] = lengths - (pieces - 1) * MAX_RUN
+    return (np.repeat(bits[starts], pieces) | ((runs - 1) << RUN_BITS)).astype(np.uint8).tobytes()
+
+
+def decode_inputs(log):
+    """Per-tick input bits of an encoded log."""
+    log = np.frombuffer(log, dtype=np.uint8)
+    return np.repeat(log & ((1 << RUN_BITS) - 1), (log >> RUN_BITS).astype(np.int64) + 1)
+
+
+@dataclass
+class Replay:
+    seed: int
+    score: float
+    level: int
+    inputs: np.ndarray     # (ticks,) uint8 input bits
+    tunings: list          # [(first tick, Tuning)], first at tick 0
+
+    @property
+    def ticks(self):
+        return self.inputs.size
+
+    def to_bytes(self):
+        head = np.zeros(1, HEADER)
+        head[0] = (MAGIC, self.seed, self.ticks, self.level, len(self.tunings), 0, self.score)
+        segs = np.zeros(len(self.tunings), SEGMENT)
+        for row, (tick, tuning) in zip(segs, self.tunings):
+            row["tick"] = tick
+            row["tuning"] = [getattr(tuning, name) for name in PARAMS]
+        return head.tobytes() + segs.tobytes() + encode_inputs(self.inputs)
+
+    @classmethod
+    def from_bytes(cls, data):
+        head = np.frombuffer(data, HEADER, 1)[0]
+        if head["magic"] != MAGIC:
+            raise ValueError("not a Sales Flow replay (or an unsupported version)")
+        segs = np.frombuffer(data, SEGMENT, int(head["segments"]), HEADER.itemsize)
+        inputs = decode_inputs(data[HEADER.itemsize + segs.nbytes:])
+        if inputs.size != head["ticks"]:
+            raise ValueError(f"input log holds {inputs.size} ticks, header says {head['ticks']}")
+        tunings = [(int(s["tick"]), Tuning(*map(float, s["tuning"]))) for s in segs]
+        if not tunings or tunings[0][0] != 0:
+            raise ValueError("replay has no tuning for its first tick")
+        return cls(int(head["seed"]), float(head["score"]), int(head["level"]), inputs, tunings)
+
+
+def store(data, directory=REPLAY_DIR):
+    """Save replay bytes under their content hash; storing twice is a no-op."""
+    path = Path(directory) / f"{hashlib.sha1(data).hexdigest()[:16]}.sfr"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return path
+
+
+@dataclass
+class Verdict:
+    path: str
+    ok: bool
+    reported: float
+    simulated: float
+    reason: str = ""
+
+
+def verify(replays):
+    """Re-simulate ``replays`` in one batch; a :class:`Verdict` per replay (``path`` empty)."""
+    n = len(replays)
+    if n == 0:
+        return []
+    ticks = np.array([r.ticks for r in replays])
+    inputs = np.zeros((n, int(ticks.max())), dtype=np.uint8)
+    for row, r in enumerate(replays):
+        inputs[row, :r.ticks] = r.inputs
+    table = np.array([[getattr(r.tunings[0][1], name) for name in PARAMS] for r in replays])
+    changes = {}
+    for row, r in enumerate(replays):
+        for tick, tuning in r.tunings[1:]:
+            changes.setdefault(tick, []).append((row, [getattr(tuning, name) for name in PARAMS]))
+
+    sim = Simulation(Tuning(*table.T), n, course=[r.seed for r in replays])
+    for t in range(inputs.shape[1]):
+        if t in changes:
+            for row, values in changes[t]:
+                table[row] = values
+            sim.tuning = Tuning(*table.T)
+        sim.step(inputs[:, t])
+        if not sim.alive.any():
+            break
+
+    out = []
+    for row, r in enumerate(replays):
+        score = float(sim.score[row])
+        if sim.alive[row]:
+            reason = "run still alive after its last input"
+        elif sim.frames[row] != r.ticks:
+            reason = f"game over at tick {sim.frames[row]} of {r.ticks}"
+        elif score != r.score:
+            reason = "score differs"
+        elif sim.level[row] != r.level:
+            reason = f"level {sim.level[row]}, reported {r.level}"
+        else:
+            reason = ""
+        out.append(Verdict("", not reason, r.score, score, reason))
+    return out
+
+
+def _verify_batch(paths):
+    replays, verdicts = [], {}
+    for path in paths:
+        try:
+            replays.append((path, Replay.from_bytes(Path(path).read_bytes())))
+        except (OSError, ValueError) as exc:
+            verdicts[path] = Verdict(path, False, float("nan"), float("nan"), str(exc))
+    for (path, _), v in zip(replays, verify([r for _, r in replays])):
+        v.path = path
+        verdicts[path] = v
+    return [verdicts[p] for p in paths]
+
+
+def replay_files(paths):
+    """Expand directories in ``paths`` to the ``*.sfr`` files inside them."""
+    out = []
+    for p in map(Path, paths):
+        out.extend(sorted(p.rglob("*.sfr")) if p.is_dir() else [p])
+    return [str(p) for p in out]
+
+
+def verify_files(paths, workers=None, batch=BATCH, progress=None):
+    """Verify replay files across a process pool; a :class:`Verdict` per path, in order.
+
+    Files are grouped by length before batching so short runs don't step
+    through the padding of long ones.  ``progress`` is called with the
+    fraction done after each batch.
+    """
+    paths = list(paths)
+    order = sorted(paths, key=lambda p: os.path.getsize(p) if os.path.exists(p) else 0)
+    batches = [order[i:i + batch] for i in range(0, len(order), batch)]
+    verdicts = {}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        for done, part in enumerate(pool.map(_verify_batch, batches), 1):
+            verdicts.update((v.path, v) for v in part)
+            if progress:
+                progress(done / len(batches))
+    return [verdicts[p] for p in paths]
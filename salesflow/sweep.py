@@ -0,0 +1,183 @@
+"""Parameter sweeps over the five ``App.py`` sliders.
+
+A sweep is a list of :class:`~salesflow.engine.Tuning` points (a grid or a
+random sample inside the slider ranges).  Points are packed into fixed-size
+chunks; each chunk runs as one :class:`~salesflow.engine.Simulation` whose rows
+carry their own tuning, and chunks are spread over a process pool.  Finished
+sweeps are memoized on disk under ``.salesflow_cache/`` so re-opening the same
+grid is a file read.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from . import constants as C
+from .engine import POLICIES, Simulation, Tuning
+
+PARAMS = tuple(C.SLIDERS)
+CHUNK_POINTS = 8
+SCORE_BINS = 24
+CACHE_DIR = Path(os.environ.get("SALESFLOW_CACHE", ".salesflow_cache"))
+# Bump when engine rules change so stale sweeps are not served from cache.
+ENGINE_VERSION = 6
+
+
+def grid(steps=3, **fixed):
+    """Evenly spaced grid over every slider range, ``steps`` values per axis.
+
+    Keyword arguments pin a parameter to one value (or a list of values).
+    """
+    axes = []
+    for name in PARAMS:
+        lo, hi, _default, _step = C.SLIDERS[name]
+        if name in fixed:
+            v = fixed[name]
+            axes.append(list(v) if isinstance(v, (list, tuple)) else [v])
+        else:
+            axes.append(list(np.round(np.linspace(lo, hi, steps), 4)))
+    return [Tuning(*map(float, values)) for values in itertools.product(*axes)]
+
+
+def random_sample(n, seed=None):
+    """``n`` points drawn uniformly inside the slider ranges."""
+    rng = np.random.default_rng(seed)
+    cols = [rng.uniform(C.SLIDERS[name][0], C.SLIDERS[name][1], n) for name in PARAMS]
+    return [Tuning(*map(float, values)) for values in zip(*cols)]
+
+
+def stack(tunings, runs):
+    """One :class:`Tuning` whose fields are per-row arrays, ``runs`` rows per point."""
+    table = np.array([[getattr(t, name) for name in PARAMS] for t in tunings])
+    return Tuning(*np.repeat(table, runs, axis=0).T)
+
+
+@dataclass
+class SweepResult:
+    points: np.ndarray        # (P, 5) slider values, columns in PARAMS order
+    score_mean: np.ndarray    # (P,)
+    score_pct: np.ndarray     # (P, 3) p10 / p50 / p90
+    game_over: np.ndarray     # (P,) fraction of runs that lost every life
+    lives_lost: np.ndarray    # (P,)
+    level: np.ndarray         # (P,)
+    score_hist: np.ndarray    # (P, SCORE_BINS) run counts
+    score_edges: np.ndarray   # (SCORE_BINS + 1,)
+
+    def table(self):
+        """Rows of plain dicts, one per point, for dataframes and JSON."""
+        rows = []
+        for i, values in enumerate(self.points):
+            row = dict(zip(PARAMS, map(float, values)))
+            row.update(
+                score_mean=float(self.score_mean[i]),
+                score_p10=float(self.score_pct[i, 0]),
+                score_p50=float(self.score_pct[i, 1]),
+                score_p90=float(self.score_pct[i, 2]),
+                game_over=float(self.game_over[i]),
+                lives_lost=float(self.lives_lost[i]),
+                level=float(self.level[i]),
+            )
+            rows.append(row)
+        return rows
+
+    def save(self, path):
+        np.savez_compressed(path, **self.__dict__)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(**{k: data[k] for k in data.files})
+
+
+def _run_chunk(job):
+    tunings, runs, frames, policy, seed = job
+    level_seed, input_seed = seed.spawn(2)
+    sim = Simulation(stack(tunings, runs), len(tunings) * runs, seed=level_seed)
+    res = sim.run(POLICIES[policy](), frames, rng=np.random.default_rng(input_seed))
+    shape = (len(tunings), runs)
+    return res.score.reshape(shape), res.lives_lost.reshape(shape), res.level.reshape(shape)
+
+
+def _cache_key(points, runs, frames, policy, seed):
+    blob = json.dumps([ENGINE_VERSION, np.round(points, 6).tolist(), runs, frames, policy, seed])
+    return hashlib.sha1(blob.encode()).hexdigest()[:16]
+
+
+def run_sweep(tunings, runs=200, frames=60 * 120, policy="reactive", seed=0,
+              workers=None, cache=True, progress=None):
+    """Simulate ``runs`` games per tuning across a process pool.
+
+    Results depend only on the arguments, never on ``workers``: every chunk of
+    ``CHUNK_POINTS`` points gets its own child seed.  ``progress`` is called
+    with the fraction done after each chunk.
+    """
+    points = np.array([[getattr(t, name) for name in PARAMS] for t in tunings], dtype=float)
+    path = CACHE_DIR / f"sweep-{_cache_key(points, runs, frames, policy, seed)}.npz"
+    if cache and path.exists():
+        return SweepResult.load(path)
+
+    chunks = [tunings[i:i + CHUNK_POINTS] for i in range(0, len(tunings), CHUNK_POINTS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    jobs = [(chunk, runs, frames, policy, s) for chunk, s in zip(chunks, seeds)]
+
+    parts = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        for part in pool.map(_run_chunk, jobs):
+            parts.append(part)
+            if progress:
+                progress(len(parts) / len(jobs))
+    score, lives, level = (np.concatenate(col) for col in zip(*parts))
+
+    edges = np.linspace(0, max(float(score.max()), 1.0), SCORE_BINS + 1)
+    hist = np.stack([np.histogram(row, bins=edges)[0] for row in score])
+    result = SweepResult(
+        points=points,
+        score_mean=score.mean(axis=1),
+        score_pct=np.percentile(score, [10, 50, 90], axis=1).T,
+        game_over=(lives >= C.START_LIVES).mean(axis=1),
+        lives_lost=lives.mean(axis=1),
+        level=level.mean(axis=1),
+        score_hist=hist,
+        score_edges=edges,
+    )
+    if cache:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        result.save(path)
+    return result
+
+
+def _axis(values, name, bins):
+    uniq = np.unique(values)
+    if uniq.size <= bins:
+        return uniq, np.searchsorted(uniq, values)
+    # Random samples: bucket into equal-width bins over the slider range.
+    lo, hi = C.SLIDERS[name][:2]
+    edges = np.linspace(lo, hi, bins + 1)
+    idx = np.clip(np.digitize(values, edges) - 1, 0, bins - 1)
+    return (edges[:-1] + edges[1:]) / 2, idx
+
+
+def marginal(result, metric, x, y, bins=8):
+    """Average ``metric`` over every axis except ``x`` and ``y``.
+
+    Returns ``(xs, ys, values)`` with ``values[j, i]`` at ``(xs[i], ys[j])``;
+    this is the 2-D difficulty map shown on the sweep page.  Percentile
+    metrics use their median column.
+    """
+    values = getattr(result, metric)
+    if values.ndim > 1:
+        values = values[:, 1]
+    xs, xi = _axis(result.points[:, PARAMS.index(x)], x, bins)
+    ys, yi = _axis(result.points[:, PARAMS.index(y)], y, bins)
+    total = np.zeros((ys.size, xs.size))
+    count = np.zeros((ys.size, xs.size))
+    np.add.at(total, (yi, xi), values)
+    np.add.at(count, (yi, xi), 1)
+    with np.errstate(invalid="ignore"):
+        return xs, ys, total / count
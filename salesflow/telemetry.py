@@ -0,0 +1,212 @@
+"""Gameplay telemetry from the game iframe, appended in bulk to SQLite.
+
+``telemetry.js`` packs events into batches of float64 rows
+``(run, tick, kind, a, b, x)`` and the component hands each batch here once.
+A batch becomes one ``executemany`` in one transaction against a database
+in WAL mode, so readers never block the writer, and with
+``synchronous=NORMAL`` a commit does not wait on an fsync.  What ``a`` and
+``b`` hold depends on ``kind``:
+
+    pickup  technique id, beat accuracy (0..1)
+    hit     lives left, flow
+    close   prospect type id, bonus points
+    level   new level, score
+    start   course seed, 0
+    end     level reached, final score
+
+``tick`` counts simulation ticks from the start of the run and ``x`` is the
+player's position.
+
+The same transaction folds the batch into materialized aggregates keyed by
+trainee and day: runs and scores, technique pickups, beat-accuracy
+histogram, and prospects met and closed per type.  Both prospect counts
+land when a run's ``end`` event does: closes wait in ``run_closes`` until
+then, so a run that never ends (or whose end batch is lost) counts toward
+neither and closed never exceeds met.  Trainer queries
+(:mod:`salesflow.analytics`) read only these small tables, never the raw
+events.  Each append bumps ``meta.version``, which query caches key on.
+A run's trainee and day are fixed when its ``start`` event lands.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from itertools import groupby
+from pathlib import Path
+
+import numpy as np
+
+from . import constants as C
+from . import levels
+
+KINDS = ("pickup", "hit", "close", "level", "start", "end")
+PICKUP, HIT, CLOSE, LEVEL, START, END = range(len(KINDS))
+ACCURACY_BINS = 10
+COLUMNS = ("run", "tick", "kind", "a", "b", "x")
+DB_PATH = Path(os.environ.get("SALESFLOW_TELEMETRY", "telemetry.sqlite"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    session  TEXT    NOT NULL,
+    received REAL    NOT NULL,
+    run      INTEGER NOT NULL,
+    tick     INTEGER NOT NULL,
+    kind     INTEGER NOT NULL,
+    a        REAL,
+    b        REAL,
+    x        REAL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    session TEXT NOT NULL, run INTEGER NOT NULL, trainee TEXT NOT NULL, day TEXT NOT NULL,
+    seed INTEGER, score REAL, level INTEGER, x REAL,
+    PRIMARY KEY (session, run)
+);
+CREATE TABLE IF NOT EXISTS run_closes (
+    session TEXT NOT NULL, run INTEGER NOT NULL, type INTEGER NOT NULL, closed INTEGER NOT NULL,
+    PRIMARY KEY (session, run, type)
+);
+CREATE TABLE IF NOT EXISTS agg_daily (
+    trainee TEXT, day TEXT, runs INTEGER, score_sum REAL, score_max REAL, level_sum INTEGER,
+    PRIMARY KEY (trainee, day)
+);
+CREATE TABLE IF NOT EXISTS agg_technique (
+    trainee TEXT, day TEXT, technique INTEGER, pickups INTEGER,
+    PRIMARY KEY (trainee, day, technique)
+);
+CREATE TABLE IF NOT EXISTS agg_accuracy (
+    trainee TEXT, day TEXT, bin INTEGER, pickups INTEGER,
+    PRIMARY KEY (trainee, day, bin)
+);
+CREATE TABLE IF NOT EXISTS agg_prospect (
+    trainee TEXT, day TEXT, type INTEGER, met INTEGER, closed INTEGER,
+    PRIMARY KEY (trainee, day, type)
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+INSERT OR IGNORE INTO meta VALUES ('version', 0);
+"""
+AGGREGATES = ("agg_daily", "agg_technique", "agg_accuracy", "agg_prospect")
+
+
+def decode(data):
+    """``(n, 6)`` float64 rows of one packed batch."""
+    return np.frombuffer(data, dtype="<f8").reshape(-1, len(COLUMNS))
+
+
+class Store:
+    """One SQLite database in WAL mode; safe to share across session threads."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+
+    def append(self, session, rows, trainee="", received=None):
+        """Insert ``rows`` (as from :func:`decode`) for ``session`` and fold them
+        into the aggregates, in one transaction.  Runs started in this batch
+        are credited to ``trainee``; ``received`` defaults to now.
+        """
+        rows = np.asarray(rows)
+        if rows.size == 0:
+            return 0
+        received = time.time() if received is None else received
+        records = [(session, received, int(r), int(t), int(k), a, b, x)
+                   for r, t, k, a, b, x in rows.tolist()]
+        with self.lock, self.conn:
+            self.conn.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?)", records)
+            self._aggregate(session, received, records, trainee)
+        return len(records)
+
+    def version(self):
+        """Bumped by every append; equal versions mean equal aggregates."""
+        with self.lock:
+            return self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+    def rebuild(self):
+        """Recompute every aggregate from the raw events, batch by batch."""
+        with self.lock, self.conn:
+            for table in (*AGGREGATES, "run_closes"):
+                self.conn.execute(f"DELETE FROM {table}")
+            cur = self.conn.execute(
+                "SELECT session, received, run, tick, kind, a, b, x FROM events ORDER BY rowid")
+            while True:
+                records = cur.fetchmany(50_000)
+                if not records:
+                    break
+                for (session, received), batch in groupby(records, key=lambda r: r[:2]):
+                    self._aggregate(session, received, list(batch), "")
+
+    def _aggregate(self, session, received, records, trainee):
+        c = self.conn
+        day = time.strftime("%Y-%m-%d", time.localtime(received))
+        c.executemany(
+            "INSERT OR IGNORE INTO runs (session, run, trainee, day, seed) VALUES (?, ?, ?, ?, ?)",
+            [(session, r[2], trainee, day, int(r[5])) for r in records if r[4] == START])
+        runs = {}
+        for run in {r[2] for r in records}:
+            row = c.execute("SELECT trainee, day, seed FROM runs WHERE session = ? AND run = ?",
+                            (session, run)).fetchone()
+            runs[run] = row or (trainee, day, None)
+
+        techniques, accuracy, closed, met, daily, ended = (Counter(), Counter(), Counter(),
+                                                          Counter(), [], [])
+        # Closes of runs that have not ended yet, by (run, prospect type).
+        pending = Counter()
+        for _session, _received, run, _tick, kind, a, b, x in records:
+            who, d, seed = runs[run]
+            if kind == PICKUP:
+                techniques[who, d, int(a)] += 1
+                accuracy[who, d, min(int(b * ACCURACY_BINS), ACCURACY_BINS - 1)] += 1
+            elif kind == CLOSE:
+                pending[run, int(a)] += 1
+            elif kind == END:
+                daily.append((who, d, b, b, int(a)))
+                ended.append((b, int(a), x, session, run))
+                if seed is not None:
+                    for t, n in enumerate(levels.prospects_reached(seed, x)):
+                        met[who, d, t] += int(n)
+                earlier = c.execute("SELECT type, closed FROM run_closes WHERE session = ? AND run = ?",
+                                    (session, run)).fetchall()
+                for t, n in earlier:
+                    closed[who, d, t] += n
+                for t in range(len(C.PROSPECT_TYPES)):
+                    closed[who, d, t] += pending.pop((run, t), 0)
+                c.execute("DELETE FROM run_closes WHERE session = ? AND run = ?", (session, run))
+
+        c.executemany(
+            "INSERT INTO run_closes VALUES (?, ?, ?, ?) ON CONFLICT (session, run, type)"
+            " DO UPDATE SET closed = closed + excluded.closed",
+            [(session, run, t, n) for (run, t), n in pending.items()])
+        c.executemany("UPDATE runs SET score = ?, level = ?, x = ? WHERE session = ? AND run = ?",
+                      ended)
+        c.executemany(
+            "INSERT INTO agg_daily VALUES (?, ?, 1, ?, ?, ?) ON CONFLICT (trainee, day) DO UPDATE"
+            " SET runs = runs + 1, score_sum = score_sum + excluded.score_sum,"
+            " score_max = max(score_max, excluded.score_max),"
+            " level_sum = level_sum + excluded.level_sum", daily)
+        for table, column, counts in (("agg_technique", "technique", techniques),
+                                      ("agg_accuracy", "bin", accuracy)):
+            c.executemany(
+                f"INSERT INTO {table} VALUES (?, ?, ?, ?) ON CONFLICT (trainee, day, {column})"
+                " DO UPDATE SET pickups = pickups + excluded.pickups",
+                [(*key, n) for key, n in counts.items()])
+        c.executemany(
+            "INSERT INTO agg_prospect VALUES (?, ?, ?, ?, ?) ON CONFLICT (trainee, day, type)"
+            " DO UPDATE SET met = met + excluded.met, closed = closed + excluded.closed",
+            [(*key, met[key], closed[key]) for key in met.keys() | closed.keys()])
+        c.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+
+    def close(self):
+        self.conn.close()
+
+
+@lru_cache(maxsize=None)
+def store(path=DB_PATH):
+    """The process-wide :class:`Store` for ``path``."""
+    return Store(path)
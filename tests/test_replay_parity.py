@@ -0,0 +1,78 @@
+"""Runs recorded by the browser's core.js verify in the Python engine."""
+
+import base64
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from salesflow import levels, replay
+
+ROOT = Path(__file__).resolve().parent.parent
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+
+# Plays one run of core.js headless, as bench/alloc.check.js does: strafe
+# right in bursts and jump at whatever obstacle is just ahead.  Optionally
+# moves the sliders at one tick.  Prints the game-over value.
+RECORDER = """
+const fs = require('fs'), path = require('path');
+const [root, file, seed, tuning, tick, changed] = process.argv.slice(2);
+const { MockContext, MockCanvas } = require(path.join(root, 'bench', 'mock-context.js'));
+globalThis.OffscreenCanvas = MockCanvas;
+const FRONTEND = path.join(root, 'salesflow', 'frontend');
+for (const f of ['particles.js', 'render.js', 'replay.js', 'telemetry.js', 'profiler.js', 'rhythm.js', 'quality.js'])
+  require(path.join(FRONTEND, f));
+const Core = require(path.join(FRONTEND, 'core.js'));
+let over = null;
+const core = Core.createGame(new MockContext(), { gameOver(v) { over = v; } });
+core.loadCourse(+seed, new Uint8Array(fs.readFileSync(file)));
+core.applyConfig(JSON.parse(tuning));
+core.start();
+for (let t = 0; core.state === 'playing' && t < 60 * 600; t++) {
+  if (t === +tick) core.applyConfig(JSON.parse(changed));
+  const g = core.game, p = g.player;
+  let bits = (t >> 6) % 3 === 1 ? Core.RIGHT : 0;
+  for (const sl of g.ring)
+    for (let i = 0; i < sl.nObs; i++) {
+      const ahead = sl.ox[i] - (p.x + p.w);
+      if (ahead > -20 && ahead < 120 && sl.oy[i] < p.y + 65) bits |= Core.JUMP;
+    }
+  core.setInput(bits);
+  core.update();
+}
+over.replay = Buffer.from(over.replay).toString('base64');
+process.stdout.write(JSON.stringify(over));
+"""
+
+
+def record(tmp_path, seed, tuning=None, tick=-1, changed=None):
+    course = tmp_path / f"course-{seed}.bin"
+    course.write_bytes(levels.course(seed, 0, 128))
+    script = tmp_path / "record.js"
+    script.write_text(RECORDER)
+    out = subprocess.run(["node", str(script), str(ROOT), str(course), str(seed),
+                          json.dumps(tuning or {}), str(tick), json.dumps(changed or {})],
+                         capture_output=True, text=True, check=True, timeout=120)
+    return json.loads(out.stdout)
+
+
+@pytest.mark.parametrize("seed, tuning, tick, changed", [
+    (3, None, -1, None),
+    (7, {"base_speed": 3.7, "gravity": 0.61}, -1, None),
+    (42, None, 200, {"jump_force": -13.3, "base_speed": 3.1}),
+])
+def test_recorded_run_verifies(tmp_path, seed, tuning, tick, changed):
+    over = record(tmp_path, seed, tuning, tick, changed)
+    run = replay.Replay.from_bytes(base64.b64decode(over["replay"]))
+    assert (run.seed, run.score, run.level) == (seed, over["score"], over["level"])
+    # Past the first level, with pickups on the way (collectible distances).
+    assert run.level > 1 and over["combo"] > 0
+    if changed:
+        assert len(run.tunings) == 2 and run.tunings[1][0] == tick
+
+    verdict, = replay.verify([run])
+    assert verdict.ok, verdict.reason
+    assert verdict.simulated == over["score"]
@@ -0,0 +1,52 @@
+"""Telemetry survives a remount of the game iframe."""
+
+import base64
+
+import numpy as np
+import pytest
+
+pytest.importorskip("streamlit")
+
+from salesflow import component, telemetry  # noqa: E402
+
+
+def batch(seq, *events):
+    rows = np.array(events, dtype="<f8").reshape(-1, len(telemetry.COLUMNS))
+    return {"seq": seq, "data": base64.b64encode(rows.tobytes()).decode()}
+
+
+def start(run, seed=1):
+    return (run, 0, telemetry.START, seed, 0, seed)
+
+
+def end(run, score):
+    return (run, 600, telemetry.END, 2, score, 3000)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    s = telemetry.Store(tmp_path / "telemetry.sqlite")
+    monkeypatch.setattr(component.telemetry, "store", lambda: s)
+    monkeypatch.setattr(component.st, "session_state", {})
+    yield s
+    s.close()
+
+
+def test_remount_keeps_every_batch(store):
+    first = {"stream": "a" * 32, "telemetry": [batch(1, start(0)), batch(2, end(0, 500))]}
+    assert component._store_telemetry(first, "ana", "game") == ("a" * 32, 2)
+    # Rerun before the new iframe has set its value: nothing is stored twice.
+    assert component._store_telemetry(first, "ana", "game") == ("a" * 32, 2)
+
+    # The remounted iframe numbers batches and runs from 1 and 0 again.
+    second = {"stream": "b" * 32, "telemetry": [batch(1, start(0, seed=7), end(0, 900))]}
+    assert component._store_telemetry(second, "ana", "game") == ("b" * 32, 1)
+
+    events, = store.conn.execute("SELECT count(*) FROM events").fetchone()
+    assert events == 4
+    runs = store.conn.execute("SELECT session, seed, score FROM runs ORDER BY session").fetchall()
+    assert runs == [("a" * 32, 1, 500.0), ("b" * 32, 7, 900.0)]
+
+
+def test_value_without_stream_acknowledges_nothing(store):
+    assert component._store_telemetry({}, "", "game") == (None, 0)